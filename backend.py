@@ -0,0 +1,26 @@
+import os
+import sys
+
+# vector.py and matrix.py pick their classes when they are imported:
+#   "python" - the pure Python classes, which run anywhere
+#   "numpy"  - subclasses that keep their components in NumPy arrays (numpy_vector.py and numpy_matrix.py)
+# Set the VECTOR_BACKEND environment variable, or call select() before vector or matrix is imported.
+ENVIRONMENT_VARIABLE = "VECTOR_BACKEND"
+NAMES = ("python", "numpy")
+
+name = os.environ.get(ENVIRONMENT_VARIABLE, "python").lower()
+if name not in NAMES:
+    raise ValueError(ENVIRONMENT_VARIABLE + " must be one of " + ", ".join(NAMES) + ".")
+
+
+def select(new_name):
+    """
+    Picks the backend that vector and matrix will use
+    :param new_name: "python" or "numpy"
+    """
+    global name
+    if new_name not in NAMES:
+        raise ValueError("The backend must be one of " + ", ".join(NAMES) + ".")
+    if new_name != name and ("vector" in sys.modules or "matrix" in sys.modules):
+        raise RuntimeError("The backend has to be selected before vector or matrix is imported.")
+    name = new_name
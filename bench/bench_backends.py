@@ -0,0 +1,68 @@
+# Times the operations the game uses under the pure Python and NumPy backends (see backend.py).
+# The backend is picked when vector and matrix are imported, so each one is timed in its own process.
+# Run from anywhere: python bench/bench_backends.py [calls per measurement]
+
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = ("python", "numpy")
+
+SETUP = """
+a = v.Vector2(3.0, 4.0)
+b = v.Vector2(-1.5, 2.0)
+m = matrix.Matrix(v.Vector2(1.0, 2.0), v.Vector2(3.0, 4.0))
+polygon = matrix.Matrix(*[v.Vector2(float(i), float(i * i % 7)) for i in range(10)])
+rotation = matrix.rotate(30)
+placement = matrix.affine_rotate(30) * matrix.affine_translate(400, 300)
+square = matrix.Matrix(v.Vector3(4.0, 7.0, 2.0), v.Vector3(3.0, 6.0, 1.0), v.Vector3(2.0, 5.0, 3.0))
+"""
+OPERATIONS = [("vector add", "a + b"),
+              ("vector add_scaled", "a.add_scaled(b, 0.016)"),
+              ("vector mag", "a._mag = None; a.mag"),
+              ("vector normalize", "a._mag = None; a.normalize"),
+              ("direction_to_Vector2", "v.direction_to_Vector2(70, b)"),
+              ("2x2 matrix multiply", "m * m"),
+              ("10 points * rotate", "polygon * rotation"),
+              ("10 points * Affine2D", "polygon * placement"),
+              ("3x3 determinant", "square.det()"),
+              ("3x3 inverse", "matrix.inverse(square)")]
+
+
+def measure(number):
+    """
+    Times every operation with the backend this process imported
+    :param number: How many times to run each operation per measurement
+    :return: The fastest of five measurements of each operation, in microseconds per call
+    """
+    sys.path.insert(0, ROOT)
+    import matrix
+    import vector as v
+    names = {"v": v, "matrix": matrix}
+    return [min(timeit.repeat(statement, SETUP, repeat=5, number=number, globals=names)) / number * 1000000
+            for name, statement in OPERATIONS]
+
+
+def main(number):
+    times = {}
+    for name in BACKENDS:
+        environment = dict(os.environ, VECTOR_BACKEND=name)
+        output = subprocess.run([sys.executable, __file__, str(number), "--measure"], env=environment,
+                                capture_output=True, text=True, check=True).stdout
+        times[name] = json.loads(output)
+    print(f"{'us per call':<24}" + "".join(f"{name:>10}" for name in BACKENDS) + f"{'numpy/python':>14}")
+    for i in range(len(OPERATIONS)):
+        python_time = times["python"][i]
+        numpy_time = times["numpy"][i]
+        print(f"{OPERATIONS[i][0]:<24}{python_time:>10.3f}{numpy_time:>10.3f}{numpy_time / python_time:>13.2f}x")
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    if "--measure" in sys.argv:
+        print(json.dumps(measure(calls)))
+    else:
+        main(calls)
@@ -0,0 +1,98 @@
+# Times the game's update with each enemy broadphase (see broadphase.py) across enemy counts, and prints how many
+# candidate pairs each one handed to the collision tests.
+# Frames are updated, not drawn, so no window, images, or sounds are needed.
+# Run from anywhere: python bench/bench_broadphase.py [frames] [enemy counts...] [--store]
+
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import broadphase
+import classes
+import level_manager
+import vector as v
+
+SHOTS = 20  # Shots in flight every frame, fired from the player in random directions
+
+
+class Silent:
+    """
+    Stands in for pygame.mixer.Sound
+    """
+    def __init__(self, *args):
+        pass
+
+    def play(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+
+def blank_image(path):
+    """
+    Stands in for pygame.image.load
+    :param path: Ignored
+    :return: An empty 20x20 surface
+    """
+    return pygame.Surface((20, 20), pygame.SRCALPHA)
+
+
+def run(kind, enemies, frames, use_store):
+    """
+    Plays a game with a broadphase, keeping SHOTS shots in the air
+    :param kind: One of broadphase.NAMES
+    :param enemies: How many enemies to spawn
+    :param frames: How many frames to time
+    :param use_store: True to update the enemies with the entity store (see level_manager)
+    :return: The milliseconds per frame and the broadphase
+    """
+    random.seed(3)  # Every broadphase plays the same game
+    win = pygame.display.set_mode((800, 700))
+    game = level_manager.level_manager(win, 100, use_store, kind)
+    game.state = "Game"
+    game.player.score = 10 ** 9     # Never runs out
+    for _ in range(enemies):
+        game.spawn_new_object("Enemy")
+    total = 0.0
+    for _ in range(frames):
+        while len(game.player.shot_list) < SHOTS:
+            angle = random.uniform(0, 2 * math.pi)
+            game.player.shot_list.append(classes.shot_pool.acquire(v.Vector2(400, 400),
+                                                                   v.Vector2(math.cos(angle), math.sin(angle)),
+                                                                   win, game.images["Shot"]))
+        start = time.perf_counter()
+        game.update(1 / 60)
+        total += time.perf_counter() - start
+    return total / frames * 1000, game.enemy_broadphase
+
+
+def main(frames, counts, use_store):
+    pygame.init()
+    pygame.mixer.Sound = Silent
+    pygame.image.load = blank_image
+    print(f"{'ms per frame':<14}" + "".join(f"{kind:>10}" for kind in broadphase.NAMES))
+    reports = []
+    for count in counts:
+        row = f"{str(count) + ' enemies':<14}"
+        for kind in broadphase.NAMES:
+            ms, found = run(kind, count, frames, use_store)
+            row += f"{ms:>10.2f}"
+            reports.append(f"{count} enemies, {found.report()}")
+        print(row)
+    print()
+    for report in reports:
+        print(report)
+
+
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if argument != "--store"]
+    main(int(arguments[0]) if arguments else 200, [int(count) for count in arguments[1:]] or [50, 200, 1000, 3000],
+         "--store" in sys.argv)
@@ -0,0 +1,554 @@
+from abc import ABC, abstractmethod
+import bisect
+import math
+import os
+from operator import itemgetter
+import pygame
+
+# A broadphase files objects by box and hands back the ones that might touch a given box, so the exact collision
+# tests only run on those. Every broadphase has the same methods (see Broadphase) and is built by create:
+#   "grid"     - SpatialHash, a uniform grid of cells. Good all round when the objects are about the same size.
+#   "sweep"    - SweepAndPrune, boxes kept sorted by their left edge. Objects barely move between frames, so the sort
+#                is almost free. Good for many small objects.
+#   "quadtree" - LooseQuadtree, every object in one node sized to it. Good when object sizes vary a lot.
+#   "rects"    - RectList, every box as a pygame.Rect, tested in C with Rect.collidelistall. Good for a few hundred
+#                objects or fewer.
+# Set the BROADPHASE environment variable, or pass a name to level_manager, to pick one at startup.
+ENVIRONMENT_VARIABLE = "BROADPHASE"
+NAMES = ("grid", "sweep", "quadtree", "rects")
+
+name = os.environ.get(ENVIRONMENT_VARIABLE, "grid").lower()
+if name not in NAMES:
+    raise ValueError(ENVIRONMENT_VARIABLE + " must be one of " + ", ".join(NAMES) + ".")
+
+
+def create(kind, left, top, right, bottom):
+    """
+    Builds a broadphase
+    :param kind: One of NAMES
+    :param left: Smallest x value of the area the objects are mostly in (objects outside it are still found)
+    :param top: Smallest y value
+    :param right: Largest x value
+    :param bottom: Largest y value
+    :return: The new broadphase
+    """
+    if kind == "grid":
+        return SpatialHash(left, top, right, bottom)
+    elif kind == "sweep":
+        return SweepAndPrune(left, top, right, bottom)
+    elif kind == "quadtree":
+        return LooseQuadtree(left, top, right, bottom)
+    elif kind == "rects":
+        return RectList(left, top, right, bottom)
+    raise ValueError("The broadphase must be one of " + ", ".join(NAMES) + ".")
+
+
+class Broadphase(ABC):
+    """
+    Keeps track of the objects in a broadphase, in the order they were inserted, and counts how well it is doing.
+    Subclasses file the objects by box, through add, discard, move, empty, and find.
+    Boxes are (left, top, right, bottom) tuples, and two boxes touch if they overlap or share an edge. A broadphase
+    may hand back objects that don't touch the query, but never leaves one out that does.
+    """
+    kind = None
+
+    def __init__(self):
+        self.order = {}     # Each object's insertion number
+        self.count = 0
+        # Counters for comparing broadphases
+        self.queries = 0
+        self.pairs = 0      # Candidates handed out by query
+        self.hits = 0       # Candidates that really collided, counted by whoever tests them
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, obj):
+        return obj in self.order
+
+    def insert(self, obj, box):
+        """
+        Adds an object
+        :param obj: An object that isn't in the broadphase
+        :param box: Its (left, top, right, bottom)
+        """
+        self.count += 1
+        self.order[obj] = self.count
+        self.add(obj, box)
+
+    def remove(self, obj):
+        """
+        Takes an object out
+        :param obj: An object in the broadphase
+        """
+        del self.order[obj]
+        self.discard(obj)
+
+    def clear(self):
+        """
+        Removes every object. The counters are kept.
+        """
+        self.order.clear()
+        self.empty()
+
+    def query(self, box):
+        """
+        Finds every object that might touch a box
+        :param box: The (left, top, right, bottom) to look in
+        :return: A list of the candidates, in the order they were inserted, so code that takes the first hit gets the
+        same answer as a loop over every object
+        """
+        candidates = sorted(self.find(box), key=self.order.__getitem__)
+        self.queries += 1
+        self.pairs += len(candidates)
+        return candidates
+
+    def reset_counters(self):
+        """
+        Sets queries, pairs, and hits back to zero
+        """
+        self.queries = 0
+        self.pairs = 0
+        self.hits = 0
+
+    def report(self):
+        """
+        :return: The counters as one line of text, for benchmarks
+        """
+        return f"{self.kind}: {self.queries} queries, {self.pairs} candidate pairs, {self.hits} hits"
+
+    @abstractmethod
+    def add(self, obj, box):
+        """
+        Files a new object under its box
+        """
+
+    @abstractmethod
+    def discard(self, obj):
+        """
+        Forgets an object
+        """
+
+    @abstractmethod
+    def move(self, obj, box):
+        """
+        Files an object under its new box
+        :param obj: An object in the broadphase
+        :param box: Its new (left, top, right, bottom)
+        :return: True if anything had to change, False otherwise
+        """
+
+    @abstractmethod
+    def empty(self):
+        """
+        Forgets every object
+        """
+
+    @abstractmethod
+    def find(self, box):
+        """
+        :param box: The (left, top, right, bottom) to look in
+        :return: An iterable of the objects that might touch the box, each once, in any order
+        """
+
+
+class SpatialHash(Broadphase):
+    """
+    A uniform grid of cells over the play area. Objects are filed under every cell their box touches, so a query
+    only has to look at the objects that share a cell with it instead of every object in the game.
+    Anything outside the area is filed under the nearest edge cells, so nothing is ever missed.
+    """
+    kind = "grid"
+
+    def __init__(self, left, top, right, bottom, cell_size=64):
+        """
+        :param left: Smallest x value of the area the grid covers
+        :param top: Smallest y value
+        :param right: Largest x value
+        :param bottom: Largest y value
+        :param cell_size: Width and height of each cell. Works best a little bigger than the objects it holds.
+        """
+        super().__init__()
+        self.left = left
+        self.top = top
+        self.cell_size = cell_size
+        self.scale = 1 / cell_size
+        self.columns = max(1, math.ceil((right - left) / cell_size))
+        self.rows = max(1, math.ceil((bottom - top) / cell_size))
+        self.cells = [set() for cell in range(self.columns * self.rows)]
+        self.spans = {}     # Each object's cells as (first column, first row, last column, last row)
+
+    def span(self, left, top, right, bottom):
+        """
+        Finds the cells a box touches
+        :param left: Smallest x value of the box
+        :param top: Smallest y value
+        :param right: Largest x value
+        :param bottom: Largest y value
+        :return: (first column, first row, last column, last row), clamped to the grid
+        """
+        # Any monotonic mapping from position to cell works, as long as inserts and queries share it. Truncating
+        # instead of flooring only changes negative values, which are clamped to the first cell anyway.
+        scale = self.scale
+        last_column = self.columns - 1
+        last_row = self.rows - 1
+        first_column = int((left - self.left) * scale)
+        first_row = int((top - self.top) * scale)
+        final_column = int((right - self.left) * scale)
+        final_row = int((bottom - self.top) * scale)
+        if first_column < 0:
+            first_column = 0
+        elif first_column > last_column:
+            first_column = last_column
+        if first_row < 0:
+            first_row = 0
+        elif first_row > last_row:
+            first_row = last_row
+        if final_column < 0:
+            final_column = 0
+        elif final_column > last_column:
+            final_column = last_column
+        if final_row < 0:
+            final_row = 0
+        elif final_row > last_row:
+            final_row = last_row
+        return first_column, first_row, final_column, final_row
+
+    def cells_in(self, span):
+        """
+        :param span: A span from the span method
+        :return: The cell sets inside it
+        """
+        first_column, first_row, last_column, last_row = span
+        cells = self.cells
+        columns = self.columns
+        return [cells[row * columns + column] for row in range(first_row, last_row + 1)
+                for column in range(first_column, last_column + 1)]
+
+    def add(self, obj, box):
+        span = self.span(*box)
+        for cell in self.cells_in(span):
+            cell.add(obj)
+        self.spans[obj] = span
+
+    def discard(self, obj):
+        for cell in self.cells_in(self.spans.pop(obj)):
+            cell.discard(obj)
+
+    def move(self, obj, box):
+        """
+        Files an object under the cells of its new box. Nothing changes unless it crossed into different cells.
+        :param obj: An object in the grid
+        :param box: Its new (left, top, right, bottom)
+        :return: True if the object changed cells, False otherwise
+        """
+        span = self.span(*box)
+        old_span = self.spans[obj]
+        if span == old_span:
+            return False
+        for cell in self.cells_in(old_span):
+            cell.discard(obj)
+        for cell in self.cells_in(span):
+            cell.add(obj)
+        self.spans[obj] = span
+        return True
+
+    def empty(self):
+        for cell in self.cells:
+            cell.clear()
+        self.spans.clear()
+
+    def find(self, box):
+        cells = self.cells_in(self.span(*box))
+        if len(cells) == 1:
+            return cells[0]
+        found = set()
+        for cell in cells:
+            found.update(cell)
+        return found
+
+
+class SweepAndPrune(Broadphase):
+    """
+    Keeps every box in a list sorted by its left edge. A query binary searches for the boxes whose left edge could
+    be inside its x range, then checks the rest of each of those boxes.
+    Objects only move a little between frames, so the list is still almost sorted when it is sorted again, and
+    Python's sort runs in about linear time on that.
+    """
+    kind = "sweep"
+
+    def __init__(self, left, top, right, bottom):
+        """
+        The area is only taken so every broadphase is created the same way, the list doesn't need it
+        """
+        super().__init__()
+        self.entries = []       # [left, top, right, bottom, object] lists, sorted by left edge unless unsorted is set
+        self.entry_of = {}
+        self.lefts = []         # The left edge of every entry, for the binary search
+        self.widest = 0         # No box is wider than this
+        self.unsorted = False
+
+    def add(self, obj, box):
+        entry = list(box)
+        entry.append(obj)
+        self.entries.append(entry)
+        self.entry_of[obj] = entry
+        self.widest = max(self.widest, box[2] - box[0])
+        self.unsorted = True
+
+    def discard(self, obj):
+        self.entry_of.pop(obj)[4] = None    # Dropped from the list the next time it is sorted
+        self.unsorted = True
+
+    def move(self, obj, box):
+        """
+        Updates an object's box. The list is only sorted again if a left edge changed.
+        :param obj: An object in the list
+        :param box: Its new (left, top, right, bottom)
+        :return: True if the object's box changed, False otherwise
+        """
+        entry = self.entry_of[obj]
+        if entry[0] == box[0] and entry[1] == box[1] and entry[2] == box[2] and entry[3] == box[3]:
+            return False
+        if entry[0] != box[0]:
+            self.unsorted = True
+        entry[0:4] = box
+        if box[2] - box[0] > self.widest:
+            self.widest = box[2] - box[0]
+        return True
+
+    def empty(self):
+        self.entries.clear()
+        self.entry_of.clear()
+        self.lefts.clear()
+        self.widest = 0
+        self.unsorted = False
+
+    def sort(self):
+        """
+        Sorts the list again after objects moved, were added, or were removed
+        """
+        entries = [entry for entry in self.entries if entry[4] is not None]
+        entries.sort(key=itemgetter(0))
+        self.entries = entries
+        self.lefts = [entry[0] for entry in entries]
+        self.widest = max([entry[2] - entry[0] for entry in entries], default=0)
+        self.unsorted = False
+
+    def find(self, box):
+        if self.unsorted:
+            self.sort()
+        left, top, right, bottom = box
+        # A box can only reach the query if its left edge is within widest of the query's left edge
+        first = bisect.bisect_left(self.lefts, left - self.widest)
+        last = bisect.bisect_right(self.lefts, right)
+        return [entry[4] for entry in self.entries[first:last]
+                if entry[2] >= left and entry[1] <= bottom and entry[3] >= top]
+
+
+class LooseQuadtree(Broadphase):
+    """
+    A quadtree over the play area where every node reaches half its size past its edges on every side. An object
+    goes in exactly one node: the smallest one at least as big as the object, under the object's center. Since the
+    nodes overlap, an object never has to be split between nodes or pushed up because it sits on an edge.
+    The nodes are addressed by level and position, so an object is placed without walking down the tree.
+    """
+    kind = "quadtree"
+
+    def __init__(self, left, top, right, bottom, depth=5):
+        """
+        :param left: Smallest x value of the area the tree covers
+        :param top: Smallest y value
+        :param right: Largest x value
+        :param bottom: Largest y value
+        :param depth: Number of levels below the root. The smallest nodes are the area's size / 2 ** depth.
+        """
+        super().__init__()
+        self.left = left
+        self.top = top
+        self.size = max(right - left, bottom - top, 1)
+        self.depth = depth
+        self.smallest = self.size / (1 << depth)
+        self.levels = [{} for level in range(depth + 1)]    # (column, row) -> set of objects, for each level
+        self.nodes = {}         # Each object's node as (level, column, row), or None if it is in outside
+        self.boxes = {}
+        self.outside = set()    # Objects centered outside the area, or too big for the root, checked by every query
+
+    def node(self, box):
+        """
+        Finds the node a box belongs in
+        :param box: The (left, top, right, bottom) of an object
+        :return: (level, column, row), or None if the box doesn't fit in the tree
+        """
+        left, top, right, bottom = box
+        extent = right - left
+        if bottom - top > extent:
+            extent = bottom - top
+        x = (left + right) * 0.5 - self.left
+        y = (top + bottom) * 0.5 - self.top
+        size = self.size
+        if extent > size or x < 0 or y < 0 or x >= size or y >= size:
+            return None
+        level = self.depth
+        node_size = self.smallest
+        while node_size < extent:
+            level -= 1
+            node_size *= 2
+        column = int(x / node_size)
+        row = int(y / node_size)
+        last = (1 << level) - 1     # Rounding can put a center right at the far edge into the next node over
+        if column > last:
+            column = last
+        if row > last:
+            row = last
+        return level, column, row
+
+    def add(self, obj, box):
+        node = self.node(box)
+        self.nodes[obj] = node
+        self.boxes[obj] = box
+        if node is None:
+            self.outside.add(obj)
+        else:
+            self.levels[node[0]].setdefault(node[1:], set()).add(obj)
+
+    def discard(self, obj):
+        del self.boxes[obj]
+        node = self.nodes.pop(obj)
+        if node is None:
+            self.outside.discard(obj)
+        else:
+            members = self.levels[node[0]][node[1:]]
+            members.discard(obj)
+            if not members:
+                del self.levels[node[0]][node[1:]]
+
+    def move(self, obj, box):
+        """
+        Moves an object to the node its new box belongs in
+        :param obj: An object in the tree
+        :param box: Its new (left, top, right, bottom)
+        :return: True if the object changed nodes, False otherwise
+        """
+        if self.node(box) == self.nodes[obj]:
+            self.boxes[obj] = box
+            return False
+        self.discard(obj)
+        self.add(obj, box)
+        return True
+
+    def empty(self):
+        for level in self.levels:
+            level.clear()
+        self.nodes.clear()
+        self.boxes.clear()
+        self.outside.clear()
+
+    def find(self, box):
+        # The loose nodes reach well past their objects, so the objects' own boxes are checked before handing them out
+        left, top, right, bottom = box
+        boxes = self.boxes
+        found = []
+        for obj in self.near(box):
+            other = boxes[obj]
+            if other[0] <= right and other[2] >= left and other[1] <= bottom and other[3] >= top:
+                found.append(obj)
+        return found
+
+    def near(self, box):
+        """
+        Finds the objects in every node whose loose bounds touch a box
+        :param box: The (left, top, right, bottom) to look in
+        :return: A list of the objects, each once
+        """
+        left = box[0] - self.left
+        top = box[1] - self.top
+        right = box[2] - self.left
+        bottom = box[3] - self.top
+        found = list(self.outside)
+        for level, nodes in enumerate(self.levels):
+            if not nodes:
+                continue
+            node_size = self.size / (1 << level)
+            last = (1 << level) - 1
+            # A node's objects reach at most half a node past it, so look one and a half nodes past the box
+            first_column = max(math.floor(left / node_size - 1.5), 0)
+            first_row = max(math.floor(top / node_size - 1.5), 0)
+            last_column = min(math.floor(right / node_size + 0.5), last)
+            last_row = min(math.floor(bottom / node_size + 0.5), last)
+            if first_column > last_column or first_row > last_row:
+                continue
+            if (last_column - first_column + 1) * (last_row - first_row + 1) > len(nodes):
+                for (column, row), members in nodes.items():
+                    if first_column <= column <= last_column and first_row <= row <= last_row:
+                        found.extend(members)
+            else:
+                for row in range(first_row, last_row + 1):
+                    for column in range(first_column, last_column + 1):
+                        members = nodes.get((column, row))
+                        if members:
+                            found.extend(members)
+        return found
+
+
+def rect_around(box):
+    """
+    Makes a pygame.Rect that collides with another made the same way whenever their boxes touch. Rect truncates to
+    integers and doesn't count shared edges, so the box is grown to the next whole number past each side.
+    :param box: A (left, top, right, bottom)
+    :return: (left, top, width, height) for the Rect
+    """
+    left = math.floor(box[0]) - 1
+    top = math.floor(box[1]) - 1
+    return left, top, math.ceil(box[2]) + 1 - left, math.ceil(box[3]) + 1 - top
+
+
+class RectList(Broadphase):
+    """
+    Keeps every box as a pygame.Rect in one list and hands the whole list to Rect.collidelistall, which tests it in
+    C. It checks every object on every query, but each check is so cheap that it wins when there aren't many.
+    """
+    kind = "rects"
+
+    def __init__(self, left, top, right, bottom):
+        """
+        The area is only taken so every broadphase is created the same way, the list doesn't need it
+        """
+        super().__init__()
+        self.rects = []
+        self.objects = []   # The object each Rect belongs to
+        self.index = {}     # Each object's position in rects and objects
+
+    def add(self, obj, box):
+        self.index[obj] = len(self.objects)
+        self.rects.append(pygame.Rect(rect_around(box)))
+        self.objects.append(obj)
+
+    def discard(self, obj):
+        # The last object takes the removed one's place. query sorts by insertion order, so the list order is free.
+        i = self.index.pop(obj)
+        last = self.objects.pop()
+        last_rect = self.rects.pop()
+        if last is not obj:
+            self.objects[i] = last
+            self.rects[i] = last_rect
+            self.index[last] = i
+
+    def move(self, obj, box):
+        """
+        Moves an object's Rect in place
+        :param obj: An object in the list
+        :param box: Its new (left, top, right, bottom)
+        :return: Always True
+        """
+        self.rects[self.index[obj]].update(rect_around(box))
+        return True
+
+    def empty(self):
+        self.rects.clear()
+        self.objects.clear()
+        self.index.clear()
+
+    def find(self, box):
+        objects = self.objects
+        return [objects[i] for i in pygame.Rect(rect_around(box)).collidelistall(self.rects)]
@@ -3,12 +3,16 @@ import pygame
 import vector as v
 import matrix as m
 import math
+from collections import OrderedDict
 
 
 class Basic:
     """
     Basic functions for creating any object with collision (inherited by circular objects)
     """
+    pooled = False  # True while the object is waiting in an ObjectPool
+    fat_aabb = None     # The bounding box grown by a margin, kept by update_fat_aabb
+
     def __init__(self, start_pos, radius):
         """
         Creates a basic object with a bounding box
@@ -24,16 +28,227 @@ class Basic:
         Creates an Axially Aligned Bounding Box for the object
         :return: The AABB
         """
-        point_x = self.center.x - self.radius
-        point_y = self.center.y - self.radius
+        return pygame.Rect(self.aabb_bounds())
+
+    def update_aabb(self):
+        """
+        Moves and resizes the object's AABB in place to fit its current center and shape, without making a new Rect
+        """
+        self.aabb.update(self.aabb_bounds())
+
+    def aabb_bounds(self):
+        """
+        Finds where the AABB goes
+        :return: The left, top, width, and height of the AABB (pygame.Rect truncates them to integers)
+        """
         size = self.radius * 2
-        bounding_box = pygame.Rect(point_x, point_y, size, size)
-        return bounding_box
+        return self.center.x - self.radius, self.center.y - self.radius, size, size
+
+    def update_fat_aabb(self, margin):
+        """
+        Keeps fat_aabb, a copy of the AABB grown by a margin on every side. It is only moved when the AABB leaves it,
+        so an index built on fat boxes only has to hear about the objects that did.
+        :param margin: How far the fat box reaches past the AABB on each side
+        :return: True if the fat box was moved (or made for the first time), False if the AABB is still inside it
+        """
+        aabb = self.aabb
+        fat = self.fat_aabb
+        if fat is None:
+            self.fat_aabb = aabb.inflate(margin * 2, margin * 2)
+        elif fat.contains(aabb):
+            return False
+        else:
+            fat.update(aabb.x - margin, aabb.y - margin, aabb.w + margin * 2, aabb.h + margin * 2)
+        return True
+
+
+class ShapeTemplate:
+    """
+    The vertices and measurements shared by every regular polygon with the same number of points and radius.
+    Vertices are relative to the shape's center, so a template can be placed anywhere by moving its center.
+    """
+    def __init__(self, num_points, radius):
+        """
+        :param num_points: The number of vertices
+        :param radius: Distance from the center of the shape to a vertex
+        """
+        self.key = (num_points, radius)
+        self.num_points = num_points
+        self.radius = radius
+        self.center_offset = (0.0, 0.0)     # How far a shape's center moves when it takes this template
+        point_list = []
+        for x, y in v.polygon_directions(num_points):
+            point_list.append(v.Vector2(radius * x, radius * y))
+        local_matrix = m.Matrix(*point_list)
+        if num_points == 4:
+            # I wanted normal looking squares so I rotated them
+            r_point = local_matrix.get_row(1)
+            T = m.affine_translate(-r_point.x, -r_point.y)
+            local_matrix *= m.TransformChain(T, m.affine_rotate(45), T.inverse())
+            # Rotation throws the center point off
+            half_side_length = ((radius * 2) / (2 ** 0.5)) / 2
+            self.radius = int(half_side_length)
+            new_center = local_matrix.get_row(1) + v.Vector(half_side_length, half_side_length)
+            local_matrix.add_scaled(new_center, -1)
+            self.center_offset = (new_center.x, new_center.y)
+        self.local_matrix = local_matrix.freeze()
+        points = local_matrix.row_tuples()
+        xs = [x for x, y in points]
+        ys = [y for x, y in points]
+        self.extents = (min(xs), min(ys), max(xs), max(ys))     # Bounds of the vertices: left, top, right, bottom
+        # What Polygon.aabb_bounds needs, as (left, top, right, 1 for squares / 0 for the rest). Only squares fit the
+        # box to their vertices, the rest use a square around their radius.
+        if num_points == 4:
+            self.aabb_offsets = (self.extents[0], self.extents[1], self.extents[2], 1)
+        else:
+            self.aabb_offsets = (-radius, -radius, radius, 0)
+        twice_area = 0
+        for i in range(num_points):
+            x1, y1 = points[i - 1]
+            x2, y2 = points[i]
+            twice_area += x1 * y2 - x2 * y1
+        self.area = abs(twice_area) / 2
+        # Edge i runs from vertex i to the next vertex. Normals are unit length and point out of the shape.
+        self.edge_lengths = []
+        self.edge_normals = []
+        outward = 1 if twice_area > 0 else -1
+        for i in range(num_points):
+            x1, y1 = points[i]
+            x2, y2 = points[(i + 1) % num_points]
+            edge_x = x2 - x1
+            edge_y = y2 - y1
+            length = math.sqrt(edge_x * edge_x + edge_y * edge_y)
+            self.edge_lengths.append(length)
+            self.edge_normals.append((outward * edge_y / length, -outward * edge_x / length))
+        # Distance from the center to the closest edge (radius of the inscribed circle)
+        self.apothem = min(nx * x + ny * y for (nx, ny), (x, y) in zip(self.edge_normals, points))
+
+
+_shape_templates = {}   # ShapeTemplates by (number of points, radius)
+
+
+def shape_template(num_points, radius):
+    """
+    Finds the template for a regular polygon, creating it the first time it is asked for
+    :param num_points: The number of vertices
+    :param radius: Distance from the center of the shape to a vertex
+    :return: The ShapeTemplate
+    """
+    key = (num_points, radius)
+    if key not in _shape_templates:
+        _shape_templates[key] = ShapeTemplate(num_points, radius)
+    return _shape_templates[key]
+
+
+class SpriteCache:
+    """
+    A bounded cache of pre-rendered surfaces. When it is full, the sprite that was used least recently is dropped.
+    """
+    def __init__(self, max_size=1024):
+        """
+        :param max_size: The most sprites kept at once
+        """
+        self.max_size = max_size
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def get(self, key, render):
+        """
+        Finds a sprite, rendering it if it isn't cached
+        :param key: A hashable description of the sprite
+        :param render: A function that takes no arguments and returns the sprite's surface
+        :return: The sprite
+        """
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return sprite
+        self.misses += 1
+        sprite = render()
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_size:
+            self.sprites.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def clear(self):
+        """
+        Drops every sprite and resets the counters
+        """
+        self.sprites.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+enemy_sprites = SpriteCache(1024)   # White enemy masks by shape and size (enemy shapes never rotate)
+
+
+class ObjectPool:
+    """
+    Keeps instances that have left the game so they can be reinitialized in place instead of built again.
+    The class has to have a reset method that takes the same arguments as __init__. reset replaces the center rather
+    than writing into it, since a released object's center can still be shared (a shot's center becomes the center of
+    the enemy it spawns).
+    """
+    def __init__(self, cls):
+        """
+        :param cls: The class of object to pool
+        """
+        self.cls = cls
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def __len__(self):
+        return len(self.free)
+
+    def acquire(self, *args):
+        """
+        Takes a released object and reinitializes it, or creates a new one if none are free
+        :param args: The arguments for the class's __init__
+        :return: The object
+        """
+        if self.free:
+            obj = self.free.pop()
+            obj.pooled = False
+            obj.reset(*args)
+            self.reused += 1
+        else:
+            obj = self.cls(*args)
+            self.created += 1
+        return obj
+
+    def release(self, obj):
+        """
+        Gives an object back to the pool. It must not be used again until it is acquired.
+        :param obj: An object of the pool's class that is no longer in the game
+        """
+        if obj.pooled:
+            raise ValueError("This object has already been released.")
+        obj.pooled = True
+        self.free.append(obj)
+
+    def release_all(self, objs):
+        """
+        Gives every object in a list back to the pool
+        :param objs: A list of objects of the pool's class
+        """
+        for obj in objs:
+            self.release(obj)
 
 
 class Polygon(Basic):
     """
-    Basic functions for creating any object whose shape is a regular polygon
+    Basic functions for creating any object whose shape is a regular polygon.
+    The vertices are kept relative to the center (local_matrix), so moving the shape only moves its center. The
+    world-space vertices (point_matrix) are built the first time they are needed after the center changes.
     """
     def __init__(self, center, num_points, radius):
         """
@@ -46,8 +261,46 @@ class Polygon(Basic):
         self.color = (255, 255, 255)
         self.area = None
         self.num_points = num_points
-        self.point_matrix = self.create_point_matrix()
-        super().__init__(center, radius)
+        self.template = None
+        self.local_matrix = None
+        self.world_matrix = None
+        self.world_center = None    # The (x, y) center that world_matrix was built for
+        self.center = center
+        self.reshape()
+        # Squares keep the center reshape moved them to, so their vertices land where create_point_matrix put them.
+        # The radius stays as given, as it always has for shapes built here.
+        super().__init__(self.center, radius)
+
+    @property
+    def point_matrix(self):
+        """
+        :return: A frozen matrix of the world-space vertices, rebuilt only when the center has moved
+        """
+        center = self.center
+        x = center.x
+        y = center.y
+        world_center = self.world_center
+        if world_center is None or world_center[0] != x or world_center[1] != y:
+            world = self.local_matrix.copy()
+            world.add_scaled(center, 1)
+            self.world_matrix = world.freeze()
+            self.world_center = (x, y)
+        return self.world_matrix
+
+    def reshape(self):
+        """
+        Gives the shape the template for its current number of points and radius, which holds its vertices, area,
+        bounds, and edge measurements. Squares are turned to sit flat, which moves their center and shrinks their
+        radius.
+        """
+        template = shape_template(self.num_points, self.radius)
+        if self.num_points == 4:
+            self.radius = template.radius
+            self.center = self.center + v.Vector2(*template.center_offset)
+        self.template = template
+        self.local_matrix = template.local_matrix
+        self.area = template.area
+        self.world_center = None
 
     def get_relative_point(self, radians):
         """
@@ -61,41 +314,25 @@ class Polygon(Basic):
 
     def create_point_matrix(self):
         """
-        Creates a matrix containing the point data of the shape
+        Reshapes the shape (see reshape) and creates a matrix containing its point data
         :return: The matrix that contains the point vectors of the shape
         """
-        point_list = []
-        for point_index in range(self.num_points):
-            angle_poly = math.radians((360 / self.num_points) * point_index)
-            next_point = self.get_relative_point(angle_poly)
-            point_list.append(next_point)
-        point_matrix = m.Matrix(*point_list)
-        if self.num_points == 4:
-            # I wanted normal looking squares so I rotated them
-            r_point = point_matrix.get_row(1)
-            point_matrix = m.hg(point_matrix)
-            T = m.translate(3, -r_point.x, -r_point.y)
-            R = m.Matrix(v.Vector(*m.rotate(45).get_row(0), 0), v.Vector(*m.rotate(45).get_row(1), 0), v.Vector(0, 0, 1))
-            point_matrix *= T * R * m.inverse(T) * m.project(2)
-            # Rotation throws the center point off
-            half_side_length = ((self.radius * 2) / (2 ** 0.5)) / 2
-            self.radius = int(half_side_length)
-            self.center = point_matrix.get_row(1) + v.Vector(half_side_length, half_side_length)
-        return point_matrix
+        self.reshape()
+        return self.point_matrix
 
-    def create_aabb(self):
+    def aabb_bounds(self):
         """
-        Creates an Axially Aligned Bounding Box that fits tightly around the shape
-        :return: Returns the bounding box
+        Finds where the AABB goes so that it fits tightly around the shape
+        :return: The left, top, width, and height of the AABB (pygame.Rect truncates them to integers)
         """
         if self.num_points != 4:
-            bounding_box = super().create_aabb()
-        else:
-            point_x = self.point_matrix.get_row(1).x
-            point_y = self.point_matrix.get_row(1).y
-            size = int(self.point_matrix.get_row(0).x) - int(point_x)
-            bounding_box = pygame.Rect(point_x, point_y, size, size)
-        return bounding_box
+            return super().aabb_bounds()
+        # Worked out from the template's bounds, so the world-space vertices aren't built just for the box
+        left, top, right, bottom = self.template.extents
+        point_x = self.center.x + left
+        point_y = self.center.y + top
+        size = int(self.center.x + right) - int(point_x)
+        return point_x, point_y, size, size
 
     def draw(self, surf, width=0):
         """
@@ -104,8 +341,8 @@ class Polygon(Basic):
         :param width: Width of the shape fill
         """
         point_coords = []
-        for point in self.point_matrix.rows:
-            point_coords.append(point.i)
+        for x, y in self.point_matrix.row_tuples():
+            point_coords.append((int(x), int(y)))
         pygame.draw.polygon(surf, self.color, point_coords, width)
         #pygame.draw.rect(surf, (255, 255, 0), self.aabb, 1)    # Bounding Box
         #pygame.draw.circle(surf, (0, 0, 255), self.center.i, 1)    # Center point
@@ -139,8 +376,8 @@ class Player(Basic):
         :param window: Window dimensions
         """
         self.shot_timer -= dt
-        self.center += self.movement * self.speed * dt
-        self.aabb = self.create_aabb()
+        self.center.add_scaled(self.movement, self.speed * dt)
+        self.update_aabb()
         if self.center.x - self.radius < 0:
             self.center.x = self.radius
         elif self.center.x + self.radius > window[0]:
@@ -177,9 +414,8 @@ class Player(Basic):
             # Left click or holding left click
             target_pos = v.Vector2(*mouse_pos)
             diff = target_pos - self.center
-            shot_angle = math.atan2(-diff.y, diff.x)
-            shot_pos = self.center + v.polar_to_Vector2(self.radius + 1, math.degrees(shot_angle))
-            new_shot = Shot(shot_pos, shot_angle, self.surf, shot_image)
+            shot_pos = self.center + v.direction_to_Vector2(self.radius + 1, diff)
+            new_shot = shot_pool.acquire(shot_pos, diff, self.surf, shot_image)
             self.shot_list.append(new_shot)
             self.shot_timer = 0.25
             shot_effect.play()
@@ -196,17 +432,23 @@ class Player(Basic):
 
 
 class Shot(Basic):
-    def __init__(self, start_pos, angle, surf, image):
+    def __init__(self, start_pos, direction, surf, image):
         """
         Creates a projectile object with constant velocity
         :param start_pos: Start position for center of the shape
-        :param angle: Angle to move in
+        :param direction: Vector2 pointing the way to move
         :param surf: Surface to draw to
         :param image: Object image
         """
+        self.reset(start_pos, direction, surf, image)
+
+    def reset(self, start_pos, direction, surf, image):
+        """
+        Reinitializes the projectile in place (used by shot_pool). Takes the same arguments as __init__.
+        """
         self.center = start_pos
         self.speed = 200
-        self.movement = v.polar_to_Vector2(self.speed, math.degrees(angle))
+        self.movement = v.direction_to_Vector2(self.speed, direction)
         self.color = (188, 80, 8)
         self.radius = 5
         self.surf = surf
@@ -218,8 +460,8 @@ class Shot(Basic):
         Moves the projectile and updates it's bounding box
         :param dt: Change in time
         """
-        self.center += self.movement * dt
-        self.aabb = self.create_aabb()
+        self.center.add_scaled(self.movement, dt)
+        self.update_aabb()
 
     def draw(self):
         """
@@ -236,45 +478,61 @@ class Enemy(Polygon):
         Creates a random enemy shape that tracks the player
         :param center: Center point of the shape
         """
+        self.reset(center)
+
+    def reset(self, center):
+        """
+        Reinitializes the enemy in place as a new random shape (used by enemy_pool). Takes the same arguments as
+        __init__.
+        :param center: Center point of the shape
+        """
         self.center = center
         self.speed = 70
         self.movement = v.Vector2(0, 0)
         self.accel_timer = 10
         self.seek_timer = 0
+        self.timers = ()    # The scheduler.Timers that run accel_timer and seek_timer in a level_manager
+        self.tinted = None  # The sprite last drawn, as (mask key, color, sprite)
         self.accel = 25
         self.radius = random.randint(15, 30)
         self.shape = random.randint(0, 8)
         if self.shape == 0:
             self.shape = "Circle"
             self.area = None    # Needs to have area attribute to change into polygon later
+            self.aabb = self.create_aabb()  # Only used for its fat box (see level_manager.fit_enemy_box)
         else:
             self.shape = "Polygon"
             self.num_points = random.randint(3, 10)
             super().__init__(center, self.num_points, self.radius)
         self.color = (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
 
-    def update(self, dt, buffer, window, player_pos):
+    def aabb_bounds(self):
         """
-        Increases the shape's speed every 10 seconds. Target's player's position every second. Moves the shape and
-        bounces the shape if it collides with the game boundaries.
+        Finds where the AABB goes, for either shape
+        :return: The left, top, width, and height of the AABB (pygame.Rect truncates them to integers)
+        """
+        if self.shape == "Circle":
+            return Basic.aabb_bounds(self)
+        return Polygon.aabb_bounds(self)
+
+    def move(self, dt, buffer, window):
+        """
+        Moves the shape and bounces the shape if it collides with the game boundaries
         :param dt: Change in time
         :param buffer: Space reserved for UI
         :param window: Window dimensions
-        :param player_pos: The position of the player
-        """
-        self.accel_timer -= dt
-        self.seek_timer -= dt
-        if self.accel_timer <= 0:
-            self.speed += self.accel
-            self.accel_timer = 10
-        if self.seek_timer <= 0:
-            # Adjusts targeting to the current player position every second,
-            self.seek_target(player_pos)
-            self.seek_timer = 1
-        self.center += self.movement * dt
+        """
+        self.center.add_scaled(self.movement, dt)
         if self.shape != "Circle":
-            self.poly_movement(dt)
-            self.aabb = self.create_aabb()
+            self.update_aabb()
+        self.bounce(buffer, window)
+
+    def bounce(self, buffer, window):
+        """
+        Bounces the shape if it collides with the game boundaries
+        :param buffer: Space reserved for UI
+        :param window: Window dimensions
+        """
         if self.center.x - self.radius < 0:
             self.center.x = self.radius
             self.movement = self.movement.perpendicular
@@ -288,35 +546,65 @@ class Enemy(Polygon):
             self.center.y = window[1] - self.radius
             self.movement = self.movement.perpendicular
 
-    def poly_movement(self, dt):
-        """
-        Moves a polygonal shape
-        :param dt: Change in time
-        """
-        self.point_matrix = m.hg(self.point_matrix)
-        frame_movement = self.movement * dt
-        translation = m.translate(3, *frame_movement)
-        self.point_matrix *= translation * m.project(2)
-
     def seek_target(self, target):
         """
         Adjusts an object's movement towards a target
         :param target: An object to move towards
         """
         diff = target - self.center
-        angle = math.atan2(-diff.y, diff.x)
-        self.movement = v.polar_to_Vector2(self.speed, math.degrees(angle))
+        self.movement = v.direction_to_Vector2(self.speed, diff)
 
     def draw(self, surf, width=0):
         """
-        Draws the object to a surface
+        Draws the object to a surface by blitting its sprite from enemy_sprites
         :param surf: The surface to draw to
         :param width: Width of the collision shape fill
         """
+        sprite, left, top = self.sprite()
+        surf.blit(sprite, (int(self.center.x) + left, int(self.center.y) + top))
+
+    def sprite(self):
+        """
+        Finds the shape's sprite, tinting a copy of its white mask from enemy_sprites the first time the shape, size, or
+        color is drawn. The cache holds one mask per shape and size, so it stays small however many colors are in play.
+        :return: The sprite and the offsets of its top left corner from the center, as (sprite, left, top)
+        """
         if self.shape == "Circle":
-            pygame.draw.circle(surf, self.color, self.center.i, self.radius)
+            key = ("Circle", 0, self.radius)
+            left = top = -self.radius
         else:
-            super().draw(surf)
+            key = ("Polygon",) + self.template.key
+            left = math.floor(self.template.extents[0])
+            top = math.floor(self.template.extents[1])
+        tinted = self.tinted
+        if tinted is None or tinted[0] != key or tinted[1] != self.color:
+            sprite = enemy_sprites.get(key, self.render_sprite).copy()
+            sprite.fill(self.color, special_flags=pygame.BLEND_RGB_MULT)    # White becomes the color, black stays black
+            sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)    # Enemy colors never use black (every channel is 100+)
+            tinted = self.tinted = (key, self.color, sprite)
+        return tinted[2], left, top
+
+    def render_sprite(self):
+        """
+        Draws the shape in white, filled and centered on the origin, to a surface of its own
+        :return: A surface to be tinted and blitted at the shape's center plus its left and top bounds
+        """
+        if self.shape == "Circle":
+            size = self.radius * 2 + 1
+            sprite = pygame.Surface((size, size))
+            pygame.draw.circle(sprite, (255, 255, 255), (self.radius, self.radius), self.radius)
+        else:
+            left, top, right, bottom = self.template.extents
+            left = math.floor(left)
+            top = math.floor(top)
+            sprite = pygame.Surface((math.ceil(right) - left + 1, math.ceil(bottom) - top + 1))
+            point_coords = []
+            for x, y in self.template.local_matrix.row_tuples():
+                point_coords.append((int(x - left), int(y - top)))
+            pygame.draw.polygon(sprite, (255, 255, 255), point_coords)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()   # Matches the display's pixel format for faster blits
+        return sprite
 
 
 class Pickup(Polygon):
@@ -326,6 +614,12 @@ class Pickup(Polygon):
         :param center: Center point of the triangle
         :param image_set: The set of images that the triangle can change to
         """
+        self.reset(center, image_set)
+
+    def reset(self, center, image_set):
+        """
+        Reinitializes the triangle in place (used by pickup_pool). Takes the same arguments as __init__.
+        """
         self.center = center
         self.images = image_set
         self.image = image_set[0]
@@ -337,26 +631,26 @@ class Pickup(Polygon):
         self.score = 0.5
         self.score_at_collection = None
         self.decay_timer = 5
+        self.timers = ()    # The scheduler.Timer that runs decay_timer in a level_manager
         self.collected = False
 
-    def update(self, dt):
+    def decay(self):
         """
-        Counts down it's internal timer. When the timer reaches 0, state changes accordingly.
-        :param dt: Delta time
+        Moves the triangle to its next state, for when its timer runs out. decay_timer is set to the new state's length.
         :return: True if the triangle is to disappear
         """
-        self.decay_timer -= dt
-        if self.decay_timer <= 0 and self.score == 0.5:
+        if self.score == 0.5:
             self.decay_timer = 5
             self.color = (255, 191, 0)
             self.score = 0.25
             self.image = self.images[1]
-        if self.decay_timer <= 0 and self.score == 0.25:
+        elif self.score == 0.25:
             self.decay_timer = 2
             self.score = 0
             self.image = self.images[2]
-        if self.decay_timer <= 0 and self.score == 0:
+        else:
             return True
+        return False
 
     def draw(self, surf, width=1):
         """
@@ -369,3 +663,11 @@ class Pickup(Polygon):
         surf.blit(self.image, (blit_pos.i))
         #super().draw(surf, width)  # Collision Triangle
 
+
+shot_pool = ObjectPool(Shot)
+enemy_pool = ObjectPool(Enemy)
+pickup_pool = ObjectPool(Pickup)
+
+for _num_points in range(3, 11):    # Every shape the game spawns
+    for _radius in range(15, 31):
+        shape_template(_num_points, _radius)
@@ -0,0 +1,137 @@
+import entity_store
+
+try:
+    import numpy as np
+except ImportError:     # The world is optional, the game runs without it
+    np = None
+
+
+# The enemies' components live in the dense arrays of an entity_store.EntityStore, one row per enemy:
+#   transform - centers          velocity - velocities, speeds
+#   collider  - radii, polygons, boxes
+# Their timers are run by level_manager's scheduler, which tells steering_system which enemies to point at the player.
+# The Enemy objects stay the public face of each entity. Their attributes read and write their row, so code that
+# works on one enemy at a time (collision tests, player_hit) still works unchanged. The systems below run over every
+# row at once.
+#
+# Shots and pickups stay plain objects. There are only ever a handful of them, and level_manager removes them from
+# their lists while iterating, which skips the next one for that frame. Batching them would change the game.
+
+
+class World:
+    """
+    Holds the enemies' components and runs the systems that update, collide, and draw them
+    """
+    def __init__(self):
+        self.enemies = entity_store.EntityStore()
+
+    def __len__(self):
+        return len(self.enemies)
+
+    def add(self, enemy):
+        """
+        Moves an enemy's components into the world
+        :param enemy: An Enemy that is not in a world yet
+        """
+        self.enemies.add(enemy)
+
+    def remove(self, enemy):
+        """
+        Takes an enemy out of the world and gives it back plain attributes
+        :param enemy: An Enemy in this world
+        """
+        self.enemies.remove(enemy)
+
+    def clear(self):
+        """
+        Removes every enemy from the world
+        """
+        self.enemies.clear()
+
+    def update(self, dt, left, top, right, bottom):
+        """
+        Runs the systems that move the enemies, in the same order as Enemy.move
+        :param dt: Change in time
+        :param left: Smallest x value an enemy can reach
+        :param top: Smallest y value
+        :param right: Largest x value
+        :param bottom: Largest y value
+        """
+        self.movement_system(dt)
+        self.collider_system()
+        self.bounds_system(left, top, right, bottom)
+
+    def steering_system(self, enemies, target):
+        """
+        Points enemies at a target, each at its own speed. Same result as calling Enemy.seek_target on each one.
+        :param enemies: The enemies whose seek timer ran out
+        :param target: The Vector2 to move towards
+        """
+        if enemies:
+            self.enemies.seek([enemy._store_row for enemy in enemies], target)
+
+    def movement_system(self, dt):
+        """
+        Moves every enemy by its movement vector
+        :param dt: Change in time
+        """
+        self.enemies.integrate(dt)
+
+    def collider_system(self):
+        """
+        Moves the bounding box of every polygon enemy in place, working out every box in one pass
+        """
+        store = self.enemies
+        rows = np.flatnonzero(store.polygons[:store.size])
+        entities = store.entities
+        for row, bounds in zip(rows.tolist(), store.aabb_bounds(rows)):
+            entities[row].aabb.update(bounds)
+
+    def bounds_system(self, left, top, right, bottom):
+        """
+        Bounces every enemy that touches the given bounds
+        :param left: Smallest x value
+        :param top: Smallest y value
+        :param right: Largest x value
+        :param bottom: Largest y value
+        """
+        self.enemies.bounce(left, top, right, bottom)
+
+    def collision_system(self, subject, polygon_test):
+        """
+        Finds every enemy that touches a circular object
+        :param subject: An object with a center, radius, and aabb (the player)
+        :param polygon_test: A function that takes (subject, enemy) and checks a polygon enemy exactly
+        (level_manager.aabb_test)
+        :return: A list of the enemies hit, in no particular order
+        """
+        store = self.enemies
+        n = store.size
+        polygons = store.polygons[:n]
+        # Circles are tested exactly. Polygons are only tested if their bounding square comes near the subject's: a
+        # polygon's bounding box reaches at most one pixel past its radius, and both boxes are truncated to integers.
+        circle_hits = ~polygons & store.near(subject.center, subject.radius)
+        reach = subject.radius + 3
+        dx = np.abs(store.centers[:n, 0] - subject.center.x)
+        dy = np.abs(store.centers[:n, 1] - subject.center.y)
+        candidates = polygons & (dx <= store.radii[:n] + reach) & (dy <= store.radii[:n] + reach)
+        hits = [store.entities[row] for row in np.flatnonzero(circle_hits)]
+        for row in np.flatnonzero(candidates):
+            enemy = store.entities[row]
+            if polygon_test(subject, enemy):
+                hits.append(enemy)
+        return hits
+
+    def render_system(self, surf, enemies):
+        """
+        Draws enemies with one batched blit
+        :param surf: The surface to draw to
+        :param enemies: The enemies to draw, in drawing order (later ones are drawn on top)
+        """
+        rows = [enemy._store_row for enemy in enemies]
+        corners = self.enemies.centers[rows].astype(int).tolist()  # astype truncates like int()
+        blits = []
+        for enemy, (x, y) in zip(enemies, corners):
+            sprite, left, top = enemy.sprite()
+            blits.append((sprite, (x + left, y + top)))
+        surf.blits(blits, False)
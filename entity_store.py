@@ -0,0 +1,351 @@
+import math
+import vector as v
+
+try:
+    import numpy as np
+except ImportError:     # The store is optional, the game runs without it
+    np = None
+
+
+available = np is not None
+
+
+class RowVector2(v.PythonVector2):
+    """
+    A Vector2 whose components live in one row of an EntityStore array instead of in the vector itself.
+    Builds on the pure Python Vector2 whichever backend is selected, since it replaces the _x and _y slots.
+    """
+    __slots__ = ("_array", "_row")
+
+    def __init__(self, array, row):
+        """
+        :param array: An (n, 2) NumPy array
+        :param row: The row of the array this vector reads and writes
+        """
+        self._array = array
+        self._row = row
+
+    @property
+    def _x(self):
+        return float(self._array[self._row, 0])
+
+    @_x.setter
+    def _x(self, a):
+        self._array[self._row, 0] = a
+
+    @property
+    def _y(self):
+        return float(self._array[self._row, 1])
+
+    @_y.setter
+    def _y(self, a):
+        self._array[self._row, 1] = a
+
+    @property
+    def mag(self):
+        """
+        Finds the length of the vector. Not cached, since the store can change the row without telling the vector.
+        :return: The 2-norm of the vector.
+        """
+        x = self._x
+        y = self._y
+        return math.sqrt(x * x + y * y)
+
+    def detach(self):
+        """
+        Moves the components into an array of their own, so the store is free to reuse the row
+        """
+        self._array = np.array([self._array[self._row]])
+        self._row = 0
+
+
+class VectorField:
+    """
+    Vector attribute of an entity. While the entity is in a store it is a RowVector2, and assigning a new vector copies
+    it into the row. Otherwise it is a plain attribute.
+    """
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, obj, value):
+        attributes = obj.__dict__
+        if "_store" in attributes:
+            row_vector = attributes[self.name]
+            row_vector[0] = value[0]
+            row_vector[1] = value[1]
+        else:
+            attributes[self.name] = value
+
+
+class MirroredField:
+    """
+    A plain attribute of an entity, such as its radius or speed. Reads keep the original value (and type). While the
+    entity is in a store, writes are mirrored into one of the store's arrays.
+    """
+    def __init__(self, array_name, encode=None):
+        """
+        :param array_name: The name of the store's array that holds a copy of the value
+        :param encode: A function that turns the value into what the array holds. The value itself is stored if None.
+        """
+        self.array_name = array_name
+        self.encode = encode
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, obj, value):
+        attributes = obj.__dict__
+        attributes[self.name] = value
+        store = attributes.get("_store")
+        if store is not None:
+            if self.encode is not None:
+                value = self.encode(value)
+            getattr(store, self.array_name)[attributes["_store_row"]] = value
+
+
+def aabb_offsets(template):
+    """
+    :param template: The classes.ShapeTemplate of an entity, or None for entities without one
+    :return: The template's aabb_offsets, or zeros
+    """
+    if template is None:
+        return 0, 0, 0, 0
+    return template.aabb_offsets
+
+
+def is_polygon(shape):
+    """
+    :param shape: The shape attribute of an entity ("Circle", "Polygon", or None for entities without one)
+    :return: True if the entity collides as a polygon
+    """
+    return shape == "Polygon"
+
+
+_storable_classes = set()
+
+
+def make_storable(cls):
+    """
+    Puts the fields an EntityStore keeps on an entity class, once. They act as plain attributes for entities that
+    aren't in a store, so the class and its instances stay as they were. Only attribute access slows down, which is why
+    this waits for the first entity of the class to be stored instead of being done where the class is defined.
+    :param cls: The entity class
+    """
+    if cls not in _storable_classes:
+        fields = {"center": VectorField(), "movement": VectorField(), "radius": MirroredField("radii"),
+                  "speed": MirroredField("speeds"), "shape": MirroredField("polygons", is_polygon),
+                  "template": MirroredField("boxes", aabb_offsets)}
+        for name, field in fields.items():
+            if name in cls.__dict__:
+                raise TypeError(f"{cls.__name__}.{name} is already defined on the class.")
+            field.__set_name__(cls, name)
+            setattr(cls, name, field)
+        _storable_classes.add(cls)
+
+
+class EntityStore:
+    """
+    Keeps the centers, velocities, radii, speeds, collider kinds and bounding box offsets of one kind of entity in
+    contiguous NumPy arrays, so steering, position integration, bounding boxes and boundary checks run as vectorized
+    passes instead of one method call per entity.
+    Entities added to the store become views over their row (see make_storable).
+    """
+    def __init__(self, capacity=64):
+        """
+        :param capacity: Starting number of rows. The arrays double in size when they fill up.
+        """
+        if np is None:
+            raise ImportError("EntityStore needs NumPy.")
+        self.size = 0
+        self.entities = []
+        self.centers = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.radii = np.zeros(capacity)
+        self.speeds = np.zeros(capacity)
+        self.polygons = np.zeros(capacity, dtype=bool)     # True for polygon colliders, False for circles
+        self.boxes = np.zeros((capacity, 4))   # The aabb_offsets of each entity's shape template
+
+    def __len__(self):
+        return self.size
+
+    def grow(self):
+        """
+        Doubles the capacity of every array and points the existing row vectors at the new arrays
+        """
+        capacity = len(self.radii) * 2
+        self.centers = np.resize(self.centers, (capacity, 2))
+        self.velocities = np.resize(self.velocities, (capacity, 2))
+        self.radii = np.resize(self.radii, capacity)
+        self.speeds = np.resize(self.speeds, capacity)
+        self.polygons = np.resize(self.polygons, capacity)
+        self.boxes = np.resize(self.boxes, (capacity, 4))
+        for entity in self.entities:
+            entity.__dict__["center"]._array = self.centers
+            entity.__dict__["movement"]._array = self.velocities
+
+    def add(self, entity):
+        """
+        Moves an entity's center, movement, radius, speed and shape into the store
+        :param entity: A Player, Shot, Enemy, or Pickup that is not in a store yet
+        """
+        if "_store" in entity.__dict__:
+            raise ValueError("This entity already belongs to a store.")
+        if self.size == len(self.radii):
+            self.grow()
+        row = self.size
+        attributes = entity.__dict__
+        self.centers[row] = (attributes["center"][0], attributes["center"][1])
+        self.velocities[row] = (attributes["movement"][0], attributes["movement"][1])
+        self.radii[row] = attributes["radius"]
+        self.speeds[row] = attributes.get("speed", 0)
+        self.polygons[row] = is_polygon(attributes.get("shape"))
+        self.boxes[row] = aabb_offsets(attributes.get("template"))
+        # The entity gets its own row vectors, so it stops sharing a center with whatever it was created from
+        attributes["center"] = RowVector2(self.centers, row)
+        attributes["movement"] = RowVector2(self.velocities, row)
+        attributes["_store"] = self
+        attributes["_store_row"] = row
+        make_storable(type(entity))
+        self.entities.append(entity)
+        self.size += 1
+
+    def remove(self, entity):
+        """
+        Takes an entity out of the store and gives it back plain attributes. The last row fills the gap.
+        :param entity: An entity in this store
+        """
+        if entity.__dict__.get("_store") is not self:
+            raise ValueError("This entity does not belong to this store.")
+        row = entity._store_row
+        attributes = entity.__dict__
+        attributes["center"].detach()
+        attributes["movement"].detach()
+        del attributes["_store"]
+        del attributes["_store_row"]
+
+        last = self.size - 1
+        if row != last:
+            moved = self.entities[last]
+            self.centers[row] = self.centers[last]
+            self.velocities[row] = self.velocities[last]
+            self.radii[row] = self.radii[last]
+            self.speeds[row] = self.speeds[last]
+            self.polygons[row] = self.polygons[last]
+            self.boxes[row] = self.boxes[last]
+            moved.__dict__["center"]._row = row
+            moved.__dict__["movement"]._row = row
+            moved.__dict__["_store_row"] = row
+            self.entities[row] = moved
+        self.entities.pop()
+        self.size -= 1
+
+    def clear(self):
+        """
+        Removes every entity from the store
+        """
+        while self.size:
+            self.remove(self.entities[self.size - 1])
+
+    def seek(self, rows, target):
+        """
+        Points the movement of some entities at a target, each at its own speed. Gives the same vectors as
+        v.direction_to_Vector2(speed, target - center), one entity at a time.
+        :param rows: The rows to steer
+        :param target: The Vector2 to move towards
+        """
+        dx = target.x - self.centers[rows, 0]
+        dy = target.y - self.centers[rows, 1]
+        length = np.sqrt(dx * dx + dy * dy)
+        speed = self.speeds[rows]
+        moving = length != 0
+        safe_length = np.where(moving, length, 1)
+        x = np.where(moving, speed * dx / safe_length, speed)
+        y = np.where(moving, speed * dy / safe_length, 0.0)
+        x[np.abs(x) <= 0.000000001] = 0.0     # Floating point zero fix
+        y[np.abs(y) <= 0.000000001] = 0.0
+        self.velocities[rows, 0] = x
+        self.velocities[rows, 1] = y
+
+    def near(self, center, reach):
+        """
+        Finds the entities whose circle (center and radius) comes within a distance of a point
+        :param center: A Vector2
+        :param reach: How far past each entity's radius to look
+        :return: A boolean array with one entry per row, True if that entity is within reach
+        """
+        n = self.size
+        dx = self.centers[:n, 0] - center.x
+        dy = self.centers[:n, 1] - center.y
+        distance = self.radii[:n] + reach
+        return dx * dx + dy * dy <= distance * distance
+
+    def aabb_bounds(self, rows):
+        """
+        Finds where the bounding boxes of some polygon entities go. Same values as Polygon.aabb_bounds, truncated to
+        integers like pygame.Rect does.
+        :param rows: The rows to find boxes for
+        :return: A list with a [left, top, width, height] list for each row
+        """
+        x = self.centers[rows, 0]
+        y = self.centers[rows, 1]
+        left, top, right, square = self.boxes[rows].T
+        point_x = x + left
+        point_y = y + top
+        size = np.where(square != 0, np.trunc(x + right) - np.trunc(point_x), right * 2)
+        return np.stack((np.trunc(point_x), np.trunc(point_y), size, size), axis=1).astype(int).tolist()
+
+    def integrate(self, dt):
+        """
+        Moves every entity by its movement vector
+        :param dt: Change in time
+        """
+        n = self.size
+        self.centers[:n] += self.velocities[:n] * dt
+
+    def bounce(self, left, top, right, bottom):
+        """
+        Keeps every entity inside the given bounds. An entity that touches a bound is pushed back inside and its
+        movement is turned perpendicular, once per bound touched (the same rules as Enemy.bounce).
+        :param left: Smallest x value
+        :param top: Smallest y value
+        :param right: Largest x value
+        :param bottom: Largest y value
+        """
+        n = self.size
+        x = self.centers[:n, 0]
+        y = self.centers[:n, 1]
+        r = self.radii[:n]
+        low_x = x - r < left
+        high_x = ~low_x & (x + r > right)
+        low_y = y - r < top
+        high_y = ~low_y & (y + r > bottom)
+        x[low_x] = left + r[low_x]
+        x[high_x] = right - r[high_x]
+        y[low_y] = top + r[low_y]
+        y[high_y] = bottom - r[high_y]
+        turns = (low_x | high_x).astype(np.int8) + (low_y | high_y)
+        once = turns == 1
+        twice = turns == 2
+        velocity_x = self.velocities[:n, 0].copy()
+        velocity_y = self.velocities[:n, 1].copy()
+        # One perpendicular turn is (-y, x), two in a row flip the vector around
+        self.velocities[:n, 0][once] = -velocity_y[once]
+        self.velocities[:n, 1][once] = velocity_x[once]
+        self.velocities[:n, 0][twice] = -velocity_x[twice]
+        self.velocities[:n, 1][twice] = -velocity_y[twice]
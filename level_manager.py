@@ -3,22 +3,40 @@ import random
 import pygame
 import classes
 import vector as v
-import matrix as m
+import ecs
+import scheduler
+import broadphase
+from functools import partial
 
 
 class level_manager:
-    def __init__(self, win, ui_space):
+    fat_margin = 8  # How far past its AABB the box an enemy is filed under in enemy_broadphase reaches
+
+    def __init__(self, win, ui_space, use_store=False, broadphase_name=None):
         """
         Creates an object that holds all game variables and controls everything that happens in game.
         :param win: The window that the game is to be played in
         :param ui_space: Amount of space reserved for UI
+        :param use_store: If True, the enemies' components are kept in an ecs.World, whose systems move, collide,
+        and draw every enemy in batched passes (needs NumPy)
+        :param broadphase_name: Which broadphase finds the enemies near shots and the player, one of broadphase.NAMES.
+        Defaults to the BROADPHASE environment variable, or "grid".
         """
         self.win = win
         self.win_dim = (win.get_width(), win.get_height())
         self.buffer = ui_space
-        self.enemies = [classes.Enemy(v.Vector2(500, 200))]
-        self.enemy_spawn_timer = 30
-        self.pickup_spawn_timer = random.uniform(0.5, 2)
+        self.world = None
+        if use_store:
+            self.world = ecs.World()
+        # Finds the enemies near a shot or the player. Covers the area enemies bounce around in.
+        self.enemy_broadphase = broadphase.create(broadphase_name or broadphase.name, 0, ui_space // 2,
+                                                  self.win_dim[0], self.win_dim[1])
+        self.start_timers()
+        self.enemies = []
+        self.seeking = []   # Enemies whose seek timer ran out this frame
+        self.add_enemy(classes.enemy_pool.acquire(v.Vector2(500, 200)))
+        self.enemy_spawn_timer = self.level_timers.schedule(30, self.enemy_spawn_ended, 0)
+        self.pickup_spawn_timer = self.level_timers.schedule(random.uniform(0.5, 2), self.pickup_spawn_ended, 1)
         self.triangle_points_collected = 0
         self.pickups = []
         self.state = "Title"
@@ -60,9 +78,17 @@ class level_manager:
         Resets all game variables to play again.
         """
         starting_position = v.Vector(self.win_dim[0] // 2, self.win_dim[1] // 2)
-        self.enemies = [classes.Enemy(v.Vector2(500, 200))]
-        self.enemy_spawn_timer = 30
-        self.pickup_spawn_timer = random.uniform(0.5, 2)
+        if self.world is not None:
+            self.world.clear()
+        self.enemy_broadphase.clear()
+        classes.enemy_pool.release_all(self.enemies)
+        classes.pickup_pool.release_all(self.pickups)
+        classes.shot_pool.release_all(self.player.shot_list)
+        self.start_timers()
+        self.enemies = []
+        self.add_enemy(classes.enemy_pool.acquire(v.Vector2(500, 200)))
+        self.enemy_spawn_timer = self.level_timers.schedule(30, self.enemy_spawn_ended, 0)
+        self.pickup_spawn_timer = self.level_timers.schedule(random.uniform(0.5, 2), self.pickup_spawn_ended, 1)
         self.triangle_points_collected = 0
         self.pickups = []
         self.player = classes.Player(starting_position, self.win, self.images["Player"])
@@ -71,6 +97,147 @@ class level_manager:
         self.tts = 0
         self.sfx["Title"].play()
 
+    def start_timers(self):
+        """
+        Creates the schedulers that run every countdown in the game. Each one moves forward at the point in
+        update where its timers used to be counted down, so they run out on the same frames.
+        """
+        self.level_timers = scheduler.Scheduler()   # Enemy and pickup spawning
+        self.enemy_timers = scheduler.Scheduler()   # Each enemy's speed up and seek timers
+        self.pickup_timers = scheduler.Scheduler()  # Each pickup's decay timer
+
+    def add_enemy(self, enemy):
+        """
+        Adds an enemy to the game and starts its timers
+        :param enemy: The new Enemy
+        """
+        self.enemies.append(enemy)
+        enemy.fat_aabb = None   # A pooled enemy still has the fat box from its last life
+        self.fit_enemy_box(enemy)
+        self.enemy_broadphase.insert(enemy, self.enemy_box(enemy))
+        if self.world is not None:
+            self.world.add(enemy)
+        enemy.timers = (self.enemy_timers.schedule(enemy.accel_timer, partial(self.enemy_accel_ended, enemy), 0),
+                        self.enemy_timers.schedule(enemy.seek_timer, partial(self.enemy_seek_ended, enemy), 1))
+
+    def remove_enemy(self, enemy):
+        """
+        Removes an enemy from the game, stops its timers, and gives it back to classes.enemy_pool
+        :param enemy: The Enemy to remove
+        """
+        self.enemies.remove(enemy)
+        self.enemy_broadphase.remove(enemy)
+        if self.world is not None:
+            self.world.remove(enemy)
+        for timer in enemy.timers:
+            self.enemy_timers.cancel(timer)
+        classes.enemy_pool.release(enemy)
+
+    def add_pickup(self, pickup):
+        """
+        Adds a pickup to the game and starts its decay timer
+        :param pickup: The new Pickup
+        """
+        self.pickups.append(pickup)
+        pickup.timers = (self.pickup_timers.schedule(pickup.decay_timer, None),)
+
+    def remove_shot(self, shot):
+        """
+        Removes one of the player's shots from the game and gives it back to classes.shot_pool
+        :param shot: The Shot to remove
+        """
+        self.player.shot_list.remove(shot)
+        classes.shot_pool.release(shot)
+
+    def remove_pickup(self, pickup):
+        """
+        Removes a pickup from the game, stops its decay timer, and gives it back to classes.pickup_pool
+        :param pickup: The Pickup to remove
+        """
+        self.pickups.remove(pickup)
+        for timer in pickup.timers:
+            self.pickup_timers.cancel(timer)
+        classes.pickup_pool.release(pickup)
+
+    def enemy_spawn_ended(self, timer):
+        """
+        Spawns an enemy every 30 seconds
+        :param timer: enemy_spawn_timer
+        """
+        self.spawn_new_object("Enemy")
+        self.sfx["Enemy Spawn"].play()
+        self.level_timers.restart(timer, 30)
+
+    def pickup_spawn_ended(self, timer):
+        """
+        Spawns a pickup, then waits a random time before the next one
+        :param timer: pickup_spawn_timer
+        """
+        pickup = self.spawn_new_object("Pickup")
+        # Its AABB doesn't update every frame, its position will just be set once here
+        pickup.update_aabb()
+        self.level_timers.restart(timer, random.uniform(0.5, 2))
+
+    def enemy_accel_ended(self, enemy, timer):
+        """
+        Speeds an enemy up every 10 seconds
+        :param enemy: The Enemy
+        :param timer: Its speed up timer
+        """
+        enemy.speed += enemy.accel
+        self.enemy_timers.restart(timer, 10)
+
+    def enemy_seek_ended(self, enemy, timer):
+        """
+        Marks an enemy to be pointed at the player this frame, every second
+        :param enemy: The Enemy
+        :param timer: Its seek timer
+        """
+        self.seeking.append(enemy)
+        self.enemy_timers.restart(timer, 1)
+
+    def enemy_box(self, enemy):
+        """
+        Finds the box enemy_broadphase files an enemy under: its fat AABB, which only moves once the enemy's AABB leaves
+        it. Polygons are only hit if their AABB is, and circles are only hit inside the square around them, which their
+        AABB holds to within the pixel it is truncated by. So with a margin of at least 1, nothing outside the fat box
+        can be hit.
+        :param enemy: The Enemy
+        :return: The box as (left, top, right, bottom)
+        """
+        fat = enemy.fat_aabb
+        return fat.left, fat.top, fat.right, fat.bottom
+
+    def fit_enemy_box(self, enemy):
+        """
+        Brings an enemy's fat AABB up to date with where the enemy is now
+        :param enemy: The Enemy
+        :return: True if the fat box moved, so enemy_broadphase has to be told
+        """
+        if enemy.shape == "Circle":
+            enemy.update_aabb()     # Nothing else looks at a circle's AABB, so it is only kept up to date here
+        return enemy.update_fat_aabb(self.fat_margin)
+
+    def collision_box(self, obj):
+        """
+        Finds a box around everything the collision tests look at for a shot or the player: its circle and its AABB
+        :param obj: The Shot or Player
+        :return: The box as (left, top, right, bottom)
+        """
+        aabb = obj.aabb
+        x = obj.center.x
+        y = obj.center.y
+        return (min(aabb.left, x - obj.radius), min(aabb.top, y - obj.radius),
+                max(aabb.right, x + obj.radius), max(aabb.bottom, y + obj.radius))
+
+    def update_enemy_broadphase(self):
+        """
+        Tells enemy_broadphase about every enemy that has moved out of its fat box
+        """
+        for e in self.enemies:
+            if self.fit_enemy_box(e):
+                self.enemy_broadphase.move(e, self.enemy_box(e))
+
     def circle_collision(self, v1, v2, r1, r2):
         """
         Detects collision between two circles
@@ -80,67 +247,58 @@ class level_manager:
         :param r2: Radius of the second circle
         :return: True if collision, False otherwise
         """
-        if (v1 - v2).mag <= r1 + r2:
+        if v.within_distance(v1, v2, r1 + r2):
             return True
         else:
             return False
 
-    def triangle_area(self, p1, p2, p3, circle=None):
-        """
-        Returns the area of a triangle given three points
-        :param p1: The first point in the triangle
-        :param p2: The second point in the triangle
-        :param p3: The third point in the triangle (pass circle center here for circle collision)
-        :param circle: If a circle object is passed, check for sector area
-        :return: The area of the triangle
-        """
-        # Get the distance between each point for the side lengths, then apply Heron's Formula
-        vec1 = p1 - p2
-        vec2 = p2 - p3
-        vec3 = p1 - p3
-        a = vec1.mag
-        b = vec2.mag
-        c = vec3.mag
-        s = (a + b + c) / 2
-        area = (s * (s - a) * (s - b) * (s - c)) ** 0.5
-        if circle:
-            # p3 is circle center. Find the angle between p1-p3 and p2-p3 to calculate the area of the circle sector
-            angle = self.angle_between_vectors(vec2, vec3)
-            sector_area = (angle / 360) * math.pi * (circle.radius ** 2)
-            return area, sector_area
-        return area
-
-    def angle_between_vectors(self, v1, v2):
-        """
-        Returns the angle between two vectors
-        :param v1: First vector
-        :param v2: Second vector
-        :return: The angle between them (in degrees)
-        """
-        dot = v.dot(v1, v2)
-        c_angle = dot / (v1.mag * v2.mag)
-        angle = math.acos(c_angle)
-        return math.degrees(angle)
-
-    def circle_poly_collision(self, circle, shape, og_area):
+    def circle_poly_collision(self, circle, polygon):
         """
         Detects collision between a circle and a polygon
         :param circle: The circle object being checked
-        :param shape: A Matrix containing the points of the polygon
-        :param og_area: Area of the polygon
+        :param polygon: The Polygon. Its area, edge lengths, edge normals, and apothem are read from its template.
         :return: True if a collision occurs, False otherwise
         """
-        # Splits the shape into triangles focused on the vector point and calculates the combined area of each
+        template = polygon.template
+        center_x = circle.center.x
+        center_y = circle.center.y
+        # A circle centered inside the polygon always passes the area test below, so look for that first: inside
+        # the inscribed circle, or behind every edge
+        offset_x = center_x - polygon.center.x
+        offset_y = center_y - polygon.center.y
+        if offset_x * offset_x + offset_y * offset_y < template.apothem * template.apothem:
+            return True
+        points = polygon.point_matrix.row_tuples()
+        for (normal_x, normal_y), (x, y) in zip(template.edge_normals, points):
+            if normal_x * (center_x - x) + normal_y * (center_y - y) > 0:
+                break
+        else:
+            return True
+        # Vectors and distances from the circle's center to each point
+        offsets = []
+        distances = []
+        for x, y in points:
+            offset_x = x - center_x
+            offset_y = y - center_y
+            offsets.append((offset_x, offset_y))
+            distances.append(math.sqrt(offset_x * offset_x + offset_y * offset_y))
+        # Splits the shape into triangles focused on the circle's center and calculates the combined area of each
+        # with Heron's Formula, along with the circle sector each triangle covers
         test_area = 0
         sector_area = 0
-        for point_index in range(shape.num_rows):
+        num_points = len(points)
+        for point_index in range(num_points):
             second_point = point_index + 1
-            if second_point > shape.num_rows - 1:
+            if second_point > num_points - 1:
                 second_point = 0
-            area_add, sector_add = self.triangle_area(shape.get_row(point_index), shape.get_row(second_point),
-                                                 circle.center, circle)
-            test_area += area_add
-            sector_area += sector_add
+            a = template.edge_lengths[point_index]
+            b = distances[second_point]
+            c = distances[point_index]
+            s = (a + b + c) / 2
+            test_area += (s * (s - a) * (s - b) * (s - c)) ** 0.5
+            (x1, y1), (x2, y2) = offsets[second_point], offsets[point_index]
+            angle = math.degrees(math.acos((x1 * x2 + y1 * y2) / (b * c)))
+            sector_area += (angle / 360) * math.pi * (circle.radius ** 2)
         # Now that we have the combined area of each triangle and the full circle sector between the triangles, we
         # can subtract the sector area from the test area. That way, we're checking the area between the shape and edge
         # of the circle rather than the shape and the center of the circle.
@@ -148,15 +306,14 @@ class level_manager:
         # Area calculations seem to have a very small inaccuracy, so the function will return true if the combined area
         # is between a range of values extremely close to the original area, rather than exactly equal to the original.
         float_check = 0.00000001
-        if test_area - float_check <= og_area + float_check:
+        if test_area - float_check <= polygon.area + float_check:
             return True
-        else:
-            # This area test doesn't work if the circle is colliding with a point in the shape,
-            # so next the function checks collision with each point
-            for point_index in range(shape.num_rows):
-                result = self.circle_collision(circle.center, shape.get_row(point_index), circle.radius, 0)
-                if result:
-                    return True
+        # This area test doesn't work if the circle is colliding with a point in the shape,
+        # so next the function checks collision with each point
+        radius = circle.radius
+        for offset_x, offset_y in offsets:
+            if offset_x * offset_x + offset_y * offset_y <= radius * radius:
+                return True
         # If we get here, neither test has passed and the function returns False
         return False
 
@@ -169,17 +326,10 @@ class level_manager:
         """
         collision = False
         if subject.aabb.colliderect(other.aabb):
-            if other.num_points == 3:
-                if other.area is None:  # Only calculate the shape's area once then store it to the shape
-                    other.area = self.triangle_area(*other.point_matrix.rows)
-                collision = self.circle_poly_collision(subject, other.point_matrix, other.area)
-            elif other.num_points == 4:
+            if other.num_points == 4:
                 collision = True
             else:
-                if other.area is None:
-                    sample_tri = m.Matrix(other.center, other.point_matrix.get_row(0), other.point_matrix.get_row(1))
-                    other.area = self.triangle_area(*sample_tri.rows) * other.num_points
-                collision = self.circle_poly_collision(subject, other.point_matrix, other.area)
+                collision = self.circle_poly_collision(subject, other)
         return collision
 
     def choose_new_position(self, obj):
@@ -195,7 +345,7 @@ class level_manager:
             new_pos = v.Vector2(random.randint(obj.radius, self.win_dim[0] - obj.radius),
                                 random.randint(self.buffer + obj.radius, self.win_dim[1] - obj.radius))
             # Check collision with player
-            if obj.__class__.__name__ == "Enemy":
+            if isinstance(obj, classes.Enemy):
                 if self.circle_collision(new_pos, self.player.center, obj.radius, self.player.radius + 100):
                     new_pos = v.Vector2(random.randint(obj.radius, self.win_dim[0] - obj.radius),
                                         random.randint(self.buffer + obj.radius, self.win_dim[1] - obj.radius))
@@ -210,22 +360,24 @@ class level_manager:
                     pos_found = True
         return new_pos
 
-    def spawn_new_object(self, kind, object_list):
+    def spawn_new_object(self, kind):
         """
         Spawns a new object on screen
-        :param kind: The kind of object to spawn
-        :param object_list: The list of objects to add this one to
-        :return: The updated list
+        :param kind: The kind of object to spawn, "Enemy" or "Pickup"
+        :return: The new object
         """
         if kind == "Enemy":
-            obj = classes.Enemy(v.Vector2(0, 0))
+            obj = classes.enemy_pool.acquire(v.Vector2(0, 0))
         else:
-            obj = classes.Pickup(v.Vector2(0, 0), self.images["Triangles"])
+            obj = classes.pickup_pool.acquire(v.Vector2(0, 0), self.images["Triangles"])
         obj.center = self.choose_new_position(obj)
         if obj.shape == "Polygon":
-            obj.point_matrix = obj.create_point_matrix()
-        object_list.append(obj)
-        return object_list
+            obj.reshape()
+        if kind == "Enemy":
+            self.add_enemy(obj)
+        else:
+            self.add_pickup(obj)
+        return obj
 
     def clear_collected_triangles(self):
         """
@@ -234,7 +386,7 @@ class level_manager:
         for pickup in range(len(self.pickups) - 1, -1, -1):
             if self.pickups[pickup].collected:
                 self.triangle_points_collected = 0
-                self.pickups.remove(self.pickups[pickup])
+                self.remove_pickup(self.pickups[pickup])
 
     def player_hit(self, enemy):
         """
@@ -250,9 +402,12 @@ class level_manager:
             # Set a new polygonal shape or change a circle into one
             enemy.shape = "Polygon"
             enemy.num_points = random.randint(3, 10)
-            enemy.point_matrix = enemy.create_point_matrix()
+            enemy.reshape()
             enemy.aabb = enemy.create_aabb()
         enemy.color = (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
+        enemy.fat_aabb = None   # Fitted again from scratch, since the enemy may have shrunk
+        self.fit_enemy_box(enemy)
+        self.enemy_broadphase.move(enemy, self.enemy_box(enemy))
 
     def enemy_hit(self, shot, enemy):
         """
@@ -261,11 +416,11 @@ class level_manager:
         :param enemy: The enemy that was hit
         """
         self.sfx["Enemy Hit"].play()
-        self.player.shot_list.remove(shot)
-        self.enemies.remove(enemy)
+        self.remove_shot(shot)
+        self.remove_enemy(enemy)
         self.player.score += 1
         self.tes += 1
-        self.enemies = self.spawn_new_object("Enemy", self.enemies)
+        self.spawn_new_object("Enemy")
 
     def update(self, dt):
         """
@@ -275,27 +430,20 @@ class level_manager:
         # Updates pause in other states
         if self.state == "Game":
             # Timers
-            self.enemy_spawn_timer -= dt
-            self.pickup_spawn_timer -= dt
+            self.level_timers.run(dt)
             self.tts += dt
-            if self.enemy_spawn_timer <= 0:
-                self.enemies = self.spawn_new_object("Enemy", self.enemies)
-                self.sfx["Enemy Spawn"].play()
-                self.enemy_spawn_timer = 30
-            if self.pickup_spawn_timer <= 0:
-                self.pickups = self.spawn_new_object("Pickup", self.pickups)
-                # Its AABB doesn't update every frame, its position will just be set once here
-                self.pickups[len(self.pickups) - 1].aabb = self.pickups[len(self.pickups) - 1].create_aabb()
-                self.pickup_spawn_timer = random.uniform(0.5, 2)
             self.player.update(dt, self.buffer, self.win_dim)
             # Projectile Updates
             for s in self.player.shot_list:
                 s.update(dt)
-                for e in self.enemies:
+                # Only the enemies near the shot are tested, in the same order as self.enemies
+                for e in self.enemy_broadphase.query(self.collision_box(s)):
                     if e.shape == "Circle" and self.circle_collision(s.center, e.center, s.radius, e.radius):
+                        self.enemy_broadphase.hits += 1
                         self.enemy_hit(s, e)
                         break
                     elif e.shape == "Polygon" and self.aabb_test(s, e):
+                        self.enemy_broadphase.hits += 1
                         self.enemy_hit(s, e)
                         break
                 if s.radius < s.center.x < self.win_dim[0] - s.radius and self.buffer // 2 + s.radius < s.center.y < \
@@ -304,7 +452,7 @@ class level_manager:
                     pass
                 else:
                     # Add a new enemy where the bullet exited the screen
-                    e = classes.Enemy(s.center)
+                    e = classes.enemy_pool.acquire(s.center)
                     self.sfx["Enemy Spawn"].play()
                     # Adjust the spawn position depending on the side that is hit
                     if s.center.x < s.radius:
@@ -316,27 +464,45 @@ class level_manager:
                     else:
                         e.center.y -= e.radius
                     if e.shape == "Polygon":
-                        e.point_matrix = e.create_point_matrix()
-                    self.enemies.append(e)
+                        e.reshape()
+                    self.add_enemy(e)
                     self.player.score -= 1
                     # This shot will be deleted if it passes outside the window
-                    self.player.shot_list.remove(s)
+                    self.remove_shot(s)
             # Enemy Updates
-            for e in self.enemies:
-                e.update(dt, self.buffer, self.win_dim, self.player.center)
-                if e.shape == "Circle":
-                    if self.circle_collision(e.center, self.player.center, e.radius, self.player.radius):
-                        self.player_hit(e)
-                else:
-                    if self.aabb_test(self.player, e):
+            self.enemy_timers.run(dt)
+            if self.world is not None:
+                self.update_world(dt)
+            else:
+                for e in self.seeking:
+                    e.seek_target(self.player.center)
+                for e in self.enemies:
+                    e.move(dt, self.buffer, self.win_dim)
+                self.update_enemy_broadphase()
+                # Hitting an enemy only changes that enemy, so testing after every enemy has moved gives the same hits
+                for e in self.enemy_broadphase.query(self.collision_box(self.player)):
+                    if e.shape == "Circle":
+                        hit = self.circle_collision(e.center, self.player.center, e.radius, self.player.radius)
+                    else:
+                        hit = self.aabb_test(self.player, e)
+                    if hit:
+                        self.enemy_broadphase.hits += 1
                         self.player_hit(e)
+            self.seeking.clear()
             # Triangle Pickup Updates
+            self.pickup_timers.advance(dt)
+            visited = set()
             for p in self.pickups:
-                result = p.update(dt)
+                visited.add(p)
+                result = False
+                if p.timers[0].due:
+                    result = p.decay()
+                    if not result:
+                        self.pickup_timers.restart(p.timers[0], p.decay_timer)
                 if result:
                     if p.collected:
                         self.triangle_points_collected -= p.score_at_collection
-                    self.pickups.remove(p)
+                    self.remove_pickup(p)
                 elif not p.collected and self.aabb_test(self.player, p):
                     if p.score == 0:
                         self.sfx["Bad Triangle"].play()
@@ -348,6 +514,10 @@ class level_manager:
                         self.triangle_points_collected += p.score
                         p.score_at_collection = p.score
                         p.collected = True
+            for p in self.pickups:
+                if p not in visited:
+                    # Removing a pickup inside the loop above skips the next one, which then doesn't count down
+                    self.pickup_timers.hold(p.timers[0])
             if self.triangle_points_collected >= 1:
                 self.player.score += 1
                 self.clear_collected_triangles()
@@ -356,6 +526,21 @@ class level_manager:
                 self.state = "Game Over"
                 self.sfx["Game Over"].play()
 
+    def update_world(self, dt):
+        """
+        Steers and moves every enemy with the world's systems, then hits the player with every enemy that touches
+        them. Same result as calling Enemy.seek_target and Enemy.move on each enemy and checking it against the player.
+        :param dt: Change in time
+        """
+        self.world.steering_system(self.seeking, self.player.center)
+        self.world.update(dt, 0, self.buffer // 2, self.win_dim[0], self.win_dim[1])
+        self.update_enemy_broadphase()   # For next frame's shots
+        hits = self.world.collision_system(self.player, self.aabb_test)
+        if len(hits) > 1:
+            hits.sort(key=self.enemies.index)   # player_hit picks random positions, so keep the per-enemy order
+        for e in hits:
+            self.player_hit(e)
+
     def input(self):
         """
         Handles all input
@@ -410,17 +595,21 @@ class level_manager:
                     pygame.draw.line(self.win, p.color, p.center.i, self.player.center.i)
                 p.draw(self.win)
             self.player.draw()
-            for e in self.enemies:
-                e.draw(self.win)
+            if self.world is not None:
+                self.world.render_system(self.win, self.enemies)
+            else:
+                for e in self.enemies:
+                    e.draw(self.win)
             temp = self.normal.render("Score: " + str(self.player.score), False, (255, 255, 0))
             self.win.blit(temp, (self.win_dim[0] // 2 - temp.get_width() // 2, 10))
             temp = self.normal.render("Triangle Points Stashed: " + str(self.triangle_points_collected), False, (255, 255, 0))
             self.win.blit(temp, (self.win_dim[0] * 0.69, 10))
-            if self.enemy_spawn_timer > 10:
-                temp = self.normal.render("Next Enemy in: " + str(int(self.enemy_spawn_timer)), False, (255, 255, 0))
+            enemy_spawn_time = self.level_timers.estimate(self.enemy_spawn_timer)
+            if enemy_spawn_time > 10:
+                temp = self.normal.render("Next Enemy in: " + str(int(enemy_spawn_time)), False, (255, 255, 0))
             else:
                 # Decimals on a timer create a sense of urgency
-                temp = self.normal.render("Next Enemy in: " + str(round(self.enemy_spawn_timer, 2)), False, (255, 255, 0))
+                temp = self.normal.render("Next Enemy in: " + str(round(enemy_spawn_time, 2)), False, (255, 255, 0))
             self.win.blit(temp, (self.win_dim[0] * 0.05, 10))
         elif self.state == "Title" or self.state == "Resume" or self.state == "Game Over":
             self.draw_title_screen()
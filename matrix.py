@@ -4,38 +4,60 @@
 
 import vector
 import math
+import functools
+import backend
 
 
 class Matrix:
+    # Entries are kept in one flat, row-major list of floats (self.data) instead of a list of row Vectors, so
+    # multiplying does not need to build a Vector per row and column. The transposed entries are cached in
+    # self.t_data the first time a column is needed and thrown away whenever an entry changes.
+    # A frozen matrix (see freeze) raises a ValueError from every method that would change it.
+    frozen = False
 
     def __init__(self, *args):
         self.num_cols = len(args[0])
-        self.rows = []
+        self.data = []
         for i in args:
             if isinstance(i, vector.Vector) and len(i) == self.num_cols:
-                v = i.copy()    # Copy each vector so Matrix rows are independent from pre-existing Vector objects
-                self.rows.append(v)
+                self.data.extend(i)     # Copying the components keeps the Matrix independent from the Vectors
             else:
                 raise TypeError("All arguments must be vectors of the same dimension.")
-        self.num_rows = len(self.rows)
+        self.num_rows = len(args)
+        self.t_data = None
 
     def copy(self):
         """
         Creates a new Matrix instance and populates it with the properties of the instance calling the function
-        :return: A deep copy of the Matrix.
+        :return: A deep copy of the Matrix (never frozen).
         """
-        new_matrix_rows = self.rows[:]
-        new_matrix = Matrix(*new_matrix_rows)
-        return new_matrix
+        return _from_data(self.num_rows, self.num_cols, self.data[:])
+
+    def freeze(self):
+        """
+        Makes the matrix read-only, so an instance that is shared (such as a cached identity matrix) can't be changed
+        by mistake
+        :return: This matrix
+        """
+        self.frozen = True
+        return self
+
+    @property
+    def rows(self):
+        """
+        :return: A list of the rows of the matrix in Vector form (changing them does not change the matrix)
+        """
+        return [self.get_row(row) for row in range(self.num_rows)]
 
     def __str__(self):
         string = ""
+        rows = self.rows
         maxes = []
         for col in range(self.num_cols):
             # Find the longest number in each column
             maximum = 0
             max_val = 0
-            for row in self.rows:
+            for row in rows:
                 if len(str(row[col])) > maximum:
                     maximum = len(str(row[col]))
                     max_val = row[col]
@@ -44,31 +66,31 @@ class Matrix:
             if row == 0:
                 string += "/ "
                 for value in range(self.num_cols):   # Value INDEX
-                    if self.rows[row][value] == maxes[value]:
+                    if rows[row][value] == maxes[value]:
                         # If the value being added to the matrix has the longest number of the column,
                         # only one space after is necessary for alignment
-                        string += str(self.rows[row][value]) + " "
+                        string += str(rows[row][value]) + " "
                     else:
                         # If not, the spaces required for column alignment are equal to the difference in length
                         # between the longest value of the column and the value
                         # Add one space in case the number is not the max but the same length as it
-                        string += str(self.rows[row][value]) + " " * (len(str(maxes[value])) - len(str(self.rows[row][value])) + 1)
+                        string += str(rows[row][value]) + " " * (len(str(maxes[value])) - len(str(rows[row][value])) + 1)
                 string += "\\\n"
-            elif row == len(self.rows) - 1:
+            elif row == len(rows) - 1:
                 string += "\\ "
                 for value in range(self.num_cols):
-                    if self.rows[row][value] == maxes[value]:
-                        string += str(self.rows[row][value]) + " "
+                    if rows[row][value] == maxes[value]:
+                        string += str(rows[row][value]) + " "
                     else:
-                        string += str(self.rows[row][value]) + " " * (len(str(maxes[value])) - len(str(self.rows[row][value])) + 1)
+                        string += str(rows[row][value]) + " " * (len(str(maxes[value])) - len(str(rows[row][value])) + 1)
                 string += "/"
             else:
                 string += "| "
                 for value in range(self.num_cols):
-                    if self.rows[row][value] == maxes[value]:
-                        string += str(self.rows[row][value]) + " "
+                    if rows[row][value] == maxes[value]:
+                        string += str(rows[row][value]) + " "
                     else:
-                        string += str(self.rows[row][value]) + " " * (len(str(maxes[value])) - len(str(self.rows[row][value])) + 1)
+                        string += str(rows[row][value]) + " " * (len(str(maxes[value])) - len(str(rows[row][value])) + 1)
                 string += "|\n"
         return string
 
@@ -79,7 +101,7 @@ class Matrix:
         """
         if isinstance(location, tuple) and len(location) == 2:
             if isinstance(location[0], int) and isinstance(location[1], int):
-                return self.rows[location[0]][location[1]]
+                return self.data[self.index(location[0], location[1])]
             else:
                 raise TypeError("Matrix entries can only be accessed with integer indices.")
         else:
@@ -91,23 +113,63 @@ class Matrix:
         :param value: A new value to replace the previous entry
         :return: No return. Changes the value at the index to the given value.
         """
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
         if isinstance(location[0], int) and isinstance(location[1], int):
             if isinstance(value, (int, float)):
                 if abs(value) < 1 and abs(value) - 0.0000000001 < 0:    # Gets rid of -0.0's
                     value = 0
-                self.rows[location[0]][location[1]] = float(value)
+                self.data[self.index(location[0], location[1])] = float(value)
+                self.t_data = None
             else:
                 raise TypeError("Entries can only be set to an integer or float value.")
         else:
             raise TypeError("Matrix entries can only be accessed with integer indices.")
 
+    def index(self, row, column):
+        """
+        Finds where an entry is kept in the flat data list
+        :param row: The row index (negative indices count from the end)
+        :param column: The column index (negative indices count from the end)
+        :return: The index into self.data
+        """
+        if row < 0:
+            row += self.num_rows
+        if column < 0:
+            column += self.num_cols
+        if 0 <= row < self.num_rows and 0 <= column < self.num_cols:
+            return row * self.num_cols + column
+        else:
+            raise IndexError("Matrix index out of range.")
+
     def get_row(self, row):
         """
         Returns one complete row of the matrix in Vector form
         :param row: The index of the row
         :return: The specified row in Vector form
         """
-        return self.rows[row]
+        start = self.index(row, 0)
+        return vector.Vector(*self.data[start:start + self.num_cols])
+
+    def row_tuples(self):
+        """
+        Returns every row of the matrix as a tuple of floats, without building any Vectors
+        :return: A list of tuples
+        """
+        data = self.data
+        cols = self.num_cols
+        return [tuple(data[start:start + cols]) for start in range(0, len(data), cols)]
+
+    def transposed_data(self):
+        """
+        Finds the entries of the transpose in flat, row-major order. The result is cached until an entry changes.
+        :return: A list of floats (do not modify it)
+        """
+        if self.t_data is None:
+            data = self.data
+            cols = self.num_cols
+            self.t_data = [data[row * cols + column] for column in range(cols) for row in range(self.num_rows)]
+        return self.t_data
 
     def get_column(self, column):
         """
@@ -115,11 +177,8 @@ class Matrix:
         :param column: The index of the column
         :return: The specified column in Vector form
         """
-        col_data = []
-        for row in self.rows:
-            col_data.append(row[column])
-        col = vector.Vector(*col_data)
-        return col
+        start = self.index(0, column) * self.num_rows
+        return vector.Vector(*self.transposed_data()[start:start + self.num_rows])
 
     def set_row(self, index, v):
         """
@@ -128,10 +187,13 @@ class Matrix:
         :param v: The vector to replace the row
         :return: Nothing returned
         """
-        v = v.copy()
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
         if isinstance(index, int) and isinstance(v, vector.Vector):
             if v.dim == self.num_cols:  # Vector has to have same number of columns as other rows
-                self.rows[index] = v
+                start = self.index(index, 0)
+                self.data[start:start + self.num_cols] = list(v)
+                self.t_data = None
             else:
                 raise TypeError("The new vector cannot have a different dimension from the one it is replacing.")
         else:
@@ -144,10 +206,11 @@ class Matrix:
         :param v: The vector to replace the column
         :return: Nothing returned
         """
-        v = v.copy()
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
         if isinstance(index, int) and isinstance(v, vector.Vector):
             if v.dim == self.num_rows:  # The number of rows = the number of values in the column
-                for i in range(self.num_cols):
+                for i in range(self.num_rows):
                     self[(i, index)] = v[i]
             else:
                 raise TypeError("The new vector cannot have a different dimension from the one it is replacing.")
@@ -160,13 +223,10 @@ class Matrix:
         :param other: The matrix to the right of the operator
         :return The sum of the two matrices
         """
-        if isinstance(other, Matrix):
-            new_matrix = self.copy()
+        if isinstance(other, PythonMatrix):
             if other.num_rows == self.num_rows and other.num_cols == self.num_cols:
-                for row in range(self.num_rows):
-                    v = self.get_row(row) + other.get_row(row)
-                    new_matrix.set_row(row, v)
-                return new_matrix
+                new_data = [a + b for a, b in zip(self.data, other.data)]
+                return _from_data(self.num_rows, self.num_cols, new_data)
             else:
                 raise ValueError("The two matrices must have the same dimensions to be added.")
         else:
@@ -183,39 +243,30 @@ class Matrix:
 
     def __mul__(self, other):
         """
-        Multiply a matrix and matrix or matrix and scalar
+        Multiply a matrix and matrix or matrix and scalar. A matrix with two columns times an Affine2D is taken as a set
+        of points to transform; use to_affine to compose a 2x2 linear transform with an Affine2D instead.
         :param other: The matrix or scalar to the right of the operator
         :return: The product of the matrix and the other
         """
         if isinstance(other, (int, float)):
-            new_matrix = self.copy()
-            for row in range(self.num_rows):
-                v = self.rows[row] * other
-                new_matrix.set_row(row, v)
-            return new_matrix
-        elif isinstance(other, Matrix):
-            new_matrix_rows = []
+            return _from_data(self.num_rows, self.num_cols, [a * other for a in self.data])
+        elif isinstance(other, PythonMatrix):
             if self.num_cols == other.num_rows:
-                for row in range(self.num_rows):
-                    new_row = []
-                    for column in range(other.num_cols):
-                        new_row.append(vector.dot(self.rows[row], other.get_column(column)))
-                    row_vector = vector.Vector(*new_row)
-                    new_matrix_rows.append(row_vector)
-                new_matrix = Matrix(*new_matrix_rows)
-                return new_matrix
+                return _from_data(self.num_rows, other.num_cols, _multiply(self, other))
             else:
                 raise ValueError("The right matrix must have the same number of rows as the left has columns for them to be multiplied.")
         elif isinstance(other, vector.Vector):
             # Turn the vector into a column vector within a Matrix object, then multiply as usual
-            vm_rows = []
-            for row in range(other.dim):
-                new_row = vector.Vector(other[row])
-                vm_rows.append(new_row)
-            vm = Matrix(*vm_rows)
+            vm = _from_data(other.dim, 1, list(other))
             return self * vm
+        elif isinstance(other, Affine2D):
+            if self.num_cols == 2:
+                return other.apply_to_points(self)
+            return self * other.to_matrix()
+        elif isinstance(other, TransformChain):
+            return other.apply(self)
         else:
-            raise TypeError("Matrices can only be multiplied by scalars, vectors, or matrices.")
+            raise TypeError("Matrices can only be multiplied by scalars, vectors, matrices, or transforms.")
 
     def __rmul__(self, other):
         """
@@ -237,92 +288,356 @@ class Matrix:
         """
         return self * -1
 
+    def __iadd__(self, other):
+        """
+        Adds another matrix to this one without creating a new matrix
+        :param other: The matrix to the right of the operator
+        :return: This matrix, now holding the sum
+        """
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
+        if isinstance(other, PythonMatrix):
+            if other.num_rows == self.num_rows and other.num_cols == self.num_cols:
+                data = self.data
+                other_data = other.data
+                for i in range(len(data)):
+                    data[i] += other_data[i]
+                self.t_data = None
+                return self
+            else:
+                raise ValueError("The two matrices must have the same dimensions to be added.")
+        else:
+            raise TypeError("Only a matrix can be added to another matrix.")
+
+    def __isub__(self, other):
+        """
+        Subtracts another matrix from this one without creating a new matrix
+        :param other: The matrix to the right of the operator
+        :return: This matrix, now holding the difference
+        """
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
+        if isinstance(other, PythonMatrix):
+            if other.num_rows == self.num_rows and other.num_cols == self.num_cols:
+                data = self.data
+                other_data = other.data
+                for i in range(len(data)):
+                    data[i] -= other_data[i]
+                self.t_data = None
+                return self
+            else:
+                raise ValueError("The two matrices must have the same dimensions to be subtracted.")
+        else:
+            raise TypeError("Only a matrix can be subtracted from another matrix.")
+
+    def __imul__(self, other):
+        """
+        Multiplies this matrix by a scalar or matrix, storing the result in this matrix
+        :param other: The matrix or scalar to the right of the operator
+        :return: This matrix, now holding the product
+        """
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
+        if isinstance(other, (int, float)):
+            data = self.data
+            for i in range(len(data)):
+                data[i] *= other
+            self.t_data = None
+            return self
+        elif isinstance(other, PythonMatrix):
+            if self.num_cols == other.num_rows:
+                self.data = _multiply(self, other)
+                self.num_cols = other.num_cols
+                self.t_data = None
+                return self
+            else:
+                raise ValueError("The right matrix must have the same number of rows as the left has columns for them to be multiplied.")
+        else:
+            return NotImplemented
+
+    def add_scaled(self, v, scale):
+        """
+        Adds a scaled vector to every row of the matrix in place (translates a matrix of points)
+        :param v: A vector with the same dimension as the rows
+        :param scale: A scalar to multiply v by
+        :return: This matrix
+        """
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
+        if isinstance(v, vector.Vector) and v.dim == self.num_cols:
+            data = self.data
+            cols = self.num_cols
+            for column in range(cols):
+                offset = v[column] * scale
+                for i in range(column, len(data), cols):
+                    data[i] += offset
+            self.t_data = None
+            return self
+        else:
+            raise TypeError("The vector must have the same dimension as the rows of the matrix.")
+
     def __eq__(self, other):
         """
         Checks whether two matrices are identical
         :param other: The other matrix
         :return: True or False
         """
-        equal = False
-        if isinstance(other, Matrix):
-            if self.num_rows == other.num_rows and self.num_cols == other.num_cols:
-                for row in range(self.num_rows):
-                    for column in range(other.num_cols):
-                        if self[(row, column)] == other[(row, column)]:
-                            equal = True
-                        else:
-                            equal = False
-                            return equal
-                return equal
-            else:
-                return equal
+        if isinstance(other, PythonMatrix):
+            return self.num_rows == other.num_rows and self.num_cols == other.num_cols and self.data == other.data
         else:
-            return equal
+            return False
 
     def det(self):
         """
-        Finds the determinant of the matrix if it is 2x2, 3x3, or 4x4
+        Finds the determinant of a square matrix. 2x2 matrices use the closed form, larger ones an LU decomposition.
         :return: The determinant of the matrix
         """
-        if self.num_rows == 2 and self.num_cols == 2:
-            determinant = self[(0, 0)] * self[(1, 1)] - self[(0, 1)] * self[(1, 0)]
+        if self.num_rows != self.num_cols:
+            raise TypeError("Can only find determinants of square matrices.")
+        if self.num_rows == 2:
+            determinant = self.data[0] * self.data[3] - self.data[1] * self.data[2]
             return determinant
-        elif self.num_rows == 3 and self.num_cols == 3:
-            submatrix_1 = Matrix(vector.Vector(self[(1, 1)], self[(1, 2)]), vector.Vector(self[(2, 1)], self[(2, 2)]))
-            submatrix_2 = Matrix(vector.Vector(self[(1, 0)], self[(1, 2)]), vector.Vector(self[(2, 0)], self[(2, 2)]))
-            submatrix_3 = Matrix(vector.Vector(self[(1, 0)], self[(1, 1)]), vector.Vector(self[(2, 0)], self[(2, 1)]))
-            determinant = self[(0, 0)] * submatrix_1.det() - self[(0, 1)] * submatrix_2.det() + self[(0, 2)] * submatrix_3.det()
-            return determinant
-        elif self.num_rows == 4 and self.num_cols == 4:
-            submatrix_1 = Matrix(vector.Vector(self[(1, 1)], self[(1, 2)], self[(1, 3)]), vector.Vector(self[(2, 1)], self[(2, 2)], self[(2, 3)]), vector.Vector(self[(3, 1)], self[(3, 2)], self[(3, 3)]))
-            submatrix_2 = Matrix(vector.Vector(self[(1, 0)], self[(1, 2)], self[(1, 3)]), vector.Vector(self[(2, 0)], self[(2, 2)], self[(2, 3)]), vector.Vector(self[(3, 0)], self[(3, 2)], self[(3, 3)]))
-            submatrix_3 = Matrix(vector.Vector(self[(1, 0)], self[(1, 1)], self[(1, 3)]), vector.Vector(self[(2, 0)], self[(2, 1)], self[(2, 3)]), vector.Vector(self[(3, 0)], self[(3, 1)], self[(3, 3)]))
-            submatrix_4 = Matrix(vector.Vector(self[(1, 0)], self[(1, 1)], self[(1, 2)]), vector.Vector(self[(2, 0)], self[(2, 1)], self[(2, 2)]), vector.Vector(self[(3, 0)], self[(3, 1)], self[(3, 2)]))
-            determinant = self[(0, 0)] * submatrix_1.det() - self[(0, 1)] * submatrix_2.det() + self[(0, 2)] * submatrix_3.det() - self[(0, 3)] * submatrix_4.det()
-            return determinant
-        else:
-            raise TypeError("Can only find determinants of 2x2, 3x3, and 4x4 matrices.")
+        return lu_decompose(self).det()
 
     def transpose(self):
         """
         Finds the transpose of the matrix
         :return: The transpose of the matrix
         """
-        if self.num_rows == self.num_cols:
-            t = self.copy()
-            # Swap columns and rows
-            for row in range(self.num_rows):
-                t.rows[row] = self.get_column(row)
-        else:
-            # Create a new matrix with adjusted dimensions and fill the rows with the columns of the original
-            t_rows = []
-            for col in range(self.num_cols):
-                t_rows.append(self.get_column(col))
-            t = Matrix(*t_rows)
+        t = _from_data(self.num_cols, self.num_rows, self.transposed_data()[:])
+        t.t_data = self.data[:]     # The transpose of the transpose is this matrix
         return t
 
 
+# The pure Python class keeps this name whichever backend is selected. The NumPy Matrix is a subclass of it, so the
+# type checks in this module test against PythonMatrix: Matrix itself is rebound to the NumPy class below, which would
+# turn away pure Python matrices.
+PythonMatrix = Matrix
+
+
+def _from_data(num_rows, num_cols, data):
+    """
+    Builds a Matrix straight from a flat, row-major list of floats, without checking or copying it
+    :param num_rows: The number of rows
+    :param num_cols: The number of columns
+    :param data: num_rows * num_cols floats. The new Matrix takes ownership of the list.
+    :return: The new Matrix
+    """
+    new_matrix = Matrix.__new__(Matrix)
+    new_matrix.num_rows = num_rows
+    new_matrix.num_cols = num_cols
+    new_matrix.data = data
+    new_matrix.t_data = None
+    return new_matrix
+
+
+class LUDecomposition:
+    """
+    The LU decomposition (with partial pivoting) of a square matrix, PA = LU. L has ones on its diagonal, so L and
+    U are kept together in one flat, row-major list. Decompose a matrix once and reuse the result to find its
+    determinant, its inverse, or to solve several systems with it.
+    """
+
+    def __init__(self, size, lu, perm, sign, singular):
+        """
+        Use lu_decompose to create one
+        :param size: The number of rows (and columns) of the decomposed matrix
+        :param lu: L below the diagonal and U on and above it, as a flat, row-major list
+        :param perm: perm[i] is the row of the original matrix that ended up in row i
+        :param sign: 1 or -1, depending on whether an even or odd number of rows were swapped
+        :param singular: True if a pivot was zero
+        """
+        self.size = size
+        self.lu = lu
+        self.perm = perm
+        self.sign = sign
+        self.singular = singular
+
+    def det(self):
+        """
+        :return: The determinant of the decomposed matrix
+        """
+        if self.singular:
+            return 0
+        determinant = self.sign
+        n = self.size
+        for i in range(n):
+            determinant *= self.lu[i * n + i]
+        return determinant
+
+    def solve_column(self, b):
+        """
+        Solves Ax = b for one right-hand side by forward and back substitution
+        :param b: A sequence of self.size numbers
+        :return: x as a list of floats
+        """
+        if self.singular:
+            raise ValueError("This matrix has no inverse, so the system has no single solution.")
+        n = self.size
+        lu = self.lu
+        x = [b[p] for p in self.perm]
+        for i in range(n):
+            row = i * n
+            total = x[i]
+            for k in range(i):
+                total -= lu[row + k] * x[k]
+            x[i] = total
+        for i in range(n - 1, -1, -1):
+            row = i * n
+            total = x[i]
+            for k in range(i + 1, n):
+                total -= lu[row + k] * x[k]
+            x[i] = total / lu[row + i]
+        return x
+
+    def solve(self, b):
+        """
+        Solves Ax = b
+        :param b: A Vector, or a Matrix with one right-hand side per column
+        :return: x, as a Vector or Matrix to match b
+        """
+        n = self.size
+        if isinstance(b, vector.Vector):
+            if b.dim != n:
+                raise ValueError("The vector must have as many components as the matrix has rows.")
+            return vector.Vector(*self.solve_column(b))
+        elif isinstance(b, PythonMatrix):
+            if b.num_rows != n:
+                raise ValueError("The right-hand matrix must have as many rows as the matrix has.")
+            columns = b.transposed_data()
+            x_columns = []
+            for j in range(0, len(columns), n):
+                x_columns.extend(self.solve_column(columns[j:j + n]))
+            return _from_data(b.num_cols, n, x_columns).transpose()
+        else:
+            raise TypeError("Can only solve for Vector or Matrix right-hand sides.")
+
+    def inverse(self):
+        """
+        :return: The inverse of the decomposed matrix
+        """
+        n = self.size
+        x_columns = []
+        for j in range(n):
+            e = [0.0] * n
+            e[j] = 1.0
+            x_columns.extend(self.solve_column(e))
+        return _from_data(n, n, x_columns).transpose()
+
+
+def lu_decompose(matrix):
+    """
+    Finds the LU decomposition of a square matrix with Doolittle's method and partial pivoting, in O(n^3)
+    :param matrix: A square Matrix
+    :return: An LUDecomposition. A singular matrix still decomposes, but can't be inverted or solved with.
+    """
+    if not isinstance(matrix, PythonMatrix) or matrix.num_rows != matrix.num_cols:
+        raise TypeError("Can only decompose square Matrix objects.")
+    n = matrix.num_rows
+    lu = [float(a) for a in matrix.data]
+    perm = list(range(n))
+    sign = 1
+    singular = False
+    for col in range(n):
+        # Swap the row with the largest entry in this column up to the diagonal
+        pivot_row = col
+        largest = abs(lu[col * n + col])
+        for row in range(col + 1, n):
+            if abs(lu[row * n + col]) > largest:
+                largest = abs(lu[row * n + col])
+                pivot_row = row
+        if largest == 0:
+            singular = True
+            continue
+        if pivot_row != col:
+            a = col * n
+            b = pivot_row * n
+            lu[a:a + n], lu[b:b + n] = lu[b:b + n], lu[a:a + n]
+            perm[col], perm[pivot_row] = perm[pivot_row], perm[col]
+            sign = -sign
+        pivot = lu[col * n + col]
+        for row in range(col + 1, n):
+            r = row * n
+            factor = lu[r + col] / pivot
+            lu[r + col] = factor
+            if factor != 0:
+                c = col * n
+                for k in range(col + 1, n):
+                    lu[r + k] -= factor * lu[c + k]
+    return LUDecomposition(n, lu, perm, sign, singular)
+
+
+def _multiply(a, b):
+    """
+    Multiplies two matrices whose dimensions are known to line up
+    :param a: The left Matrix (n x k)
+    :param b: The right Matrix (k x c)
+    :return: The entries of the n x c product as a flat, row-major list
+    """
+    a_data = a.data
+    size = len(a_data)
+    product = []
+    if a.num_cols == 3 and b.num_cols == 3:
+        # Point matrices in homogenous coordinates times 2D transforms, and transforms composed with each other
+        b00, b01, b02, b10, b11, b12, b20, b21, b22 = b.data
+        for i in range(0, size, 3):
+            a0 = a_data[i]
+            a1 = a_data[i + 1]
+            a2 = a_data[i + 2]
+            product.append(a0 * b00 + a1 * b10 + a2 * b20)
+            product.append(a0 * b01 + a1 * b11 + a2 * b21)
+            product.append(a0 * b02 + a1 * b12 + a2 * b22)
+    elif a.num_cols == 3 and b.num_cols == 2:
+        # Anything in homogenous coordinates times project(2)
+        b00, b01, b10, b11, b20, b21 = b.data
+        for i in range(0, size, 3):
+            a0 = a_data[i]
+            a1 = a_data[i + 1]
+            a2 = a_data[i + 2]
+            product.append(a0 * b00 + a1 * b10 + a2 * b20)
+            product.append(a0 * b01 + a1 * b11 + a2 * b21)
+    else:
+        k = a.num_cols
+        columns = b.transposed_data()
+        for i in range(0, size, k):
+            for j in range(0, len(columns), k):
+                sum = 0
+                for t in range(k):
+                    sum += a_data[i + t] * columns[j + t]
+                product.append(sum)
+    return product
+
+
 def identity(dim):
     """
-    Creates an identity matrix
+    Creates an identity matrix. The result is cached and shared, so it is frozen; copy it to change it.
     :param dim: The number of rows and columns in the identity matrix
     :return: The desired identity matrix
     """
     if isinstance(dim, int) and dim > 0:
-        i_rows = []
-        for row in range(dim):
-            v_data = []
-            for a in range(dim):
-                v_data.append(0)    # Create a zero vector of the appropriate dimension
-            v = vector.Vector(*v_data)
-            v[row] = 1  # The value in the vector that corresponds to the row index should be 1
-            i_rows.append(v)
-        i = Matrix(*i_rows)
-        return i
+        return _cached_identity(dim)
     else:
         raise TypeError("Enter the number of rows in the desired identity matrix. Must be integer and >0.")
 
 
+@functools.lru_cache(maxsize=16)
+def _cached_identity(dim):
+    """
+    Builds the frozen identity matrix that identity(dim) hands out
+    :param dim: The number of rows and columns in the identity matrix
+    :return: The desired identity matrix, frozen
+    """
+    i_rows = []
+    for row in range(dim):
+        v_data = []
+        for a in range(dim):
+            v_data.append(0)    # Create a zero vector of the appropriate dimension
+        v = vector.Vector(*v_data)
+        v[row] = 1  # The value in the vector that corresponds to the row index should be 1
+        i_rows.append(v)
+    return Matrix(*i_rows).freeze()
+
+
 def all_zeroes(rows, columns):
     """
     Creates a matrix of all zeroes
@@ -369,7 +684,7 @@ def trace(matrix):
     :param matrix: A square matrix
     :return: The trace of the matrix
     """
-    if isinstance(matrix, Matrix):
+    if isinstance(matrix, PythonMatrix):
         if matrix.num_rows == matrix.num_cols:
             sum = 0
             for row in range(matrix.num_rows):
@@ -383,123 +698,125 @@ def trace(matrix):
 
 def inverse(matrix):
     """
-    Finds the inverse of a matrix
+    Finds the inverse of a square matrix. Affine transforms in homogenous coordinates (last column all zeroes and a
+    one, like those from translate) are inverted in closed form, 2x2 matrices with the adjugate, and anything else
+    with an LU decomposition.
     :param matrix: A matrix
     :return: The inverse of the original matrix
     """
-    if isinstance(matrix, Matrix) and matrix.num_rows == matrix.num_cols and 2 <= matrix.num_rows <= 4:
-        if matrix.det() != 0:
-            inv = matrix.copy()
-            if matrix.num_rows == 2:
-                inv[(0, 0)] = matrix[(1, 1)]
-                inv[(0, 1)] *= -1
-                inv[(1, 0)] *= -1
-                inv[(1, 1)] = matrix[(0, 0)]
-                for row in range(matrix.num_rows):
-                    inv.rows[row] = inv.rows[row] * (1 / matrix.det())
-                return inv
-            elif matrix.num_rows == 3:
-                for row in range(3):
-                    # Find the row and column of each entry in each minor matrix
-                    if row == 0:
-                        target_row = 1
-                        second_row = 2
-                    elif row == 1:
-                        target_row = 0
-                        second_row = 2
-                    else:
-                        target_row = 0
-                        second_row = 1
-                    for col in range(3):
-                        if col == 0:
-                            target_col = 1
-                            second_col = 2
-                        elif col == 1:
-                            target_col = 0
-                            second_col = 2
-                        else:
-                            target_col = 0
-                            second_col = 1
-                        # Construct the minor matrices, find their determinants,
-                        # and make those the corresponding entry in the matrix
-                        minor = Matrix(vector.Vector(matrix[(target_row, target_col)], matrix[(target_row, second_col)]), vector.Vector(matrix[(second_row, target_col)], matrix[(second_row, second_col)]))
-                        determinant = minor.det()
-                        inv[(row, col)] = determinant
-                # Create a matrix of cofactors
-                for row in range(inv.num_rows):
-                    for col in range(inv.num_cols):
-                        inv[(row, col)] *= (-1) ** (row + 1 + (1 + col))
-                inv = inv.transpose()   # Transpose the matrix
-                inv *= 1 / matrix.det()     # Divide each term by the determinant of the original matrix
-                return inv
-            else:   # 4x4 inverse
-                for row in range(4):
-                    # Find the row and column of each entry in each minor matrix
-                    if row == 0:
-                        target_row = 1
-                    else:
-                        target_row = 0
-                    if row == 1:
-                        second_row = target_row + 2
-                    else:
-                        second_row = target_row + 1
-                    if row == 2:
-                        third_row = second_row + 2
-                    else:
-                        third_row = second_row + 1
-                    for col in range(4):
-                        if col == 0:
-                            target_col = 1
-                        else:
-                            target_col = 0
-                        if col == 1:
-                            second_col = target_col + 2
-                        else:
-                            second_col = target_col + 1
-                        if col == 2:
-                            third_col = second_col + 2
-                        else:
-                            third_col = second_col + 1
-                        # Construct the minor matrices, find their determinants,
-                        # and make those the corresponding entry in the matrix
-                        r1 = vector.Vector(matrix[(target_row, target_col)], matrix[(target_row, second_col)],
-                                           matrix[(target_row, third_col)])
-                        r2 = vector.Vector(matrix[(second_row, target_col)], matrix[(second_row, second_col)],
-                                           matrix[(second_row, third_col)])
-                        r3 = vector.Vector(matrix[(third_row, target_col)], matrix[(third_row, second_col)],
-                                           matrix[(third_row, third_col)])
-                        minor = Matrix(r1, r2, r3)
-                        determinant = minor.det()
-                        inv[(row, col)] = determinant
-                # Create a matrix of cofactors
-                for row in range(inv.num_rows):
-                    for col in range(inv.num_cols):
-                        inv[(row, col)] *= (-1) ** (row + 1 + (1 + col))
-                inv = inv.transpose()   # Transpose the matrix
-                inv *= 1 / matrix.det()     # Divide each term by the determinant of the original matrix
-                return inv
-        else:
+    if isinstance(matrix, PythonMatrix) and matrix.num_rows == matrix.num_cols:
+        n = matrix.num_rows
+        data = matrix.data
+        if n == 1:
+            if data[0] == 0:
+                raise ValueError("This matrix has no inverse.")
+            return _from_data(1, 1, [1 / data[0]])
+        elif n == 2:
+            determinant = matrix.det()
+            if determinant == 0:
+                raise ValueError("This matrix has no inverse.")
+            return _from_data(2, 2, [data[3], -data[1], -data[2], data[0]]) * (1 / determinant)
+        elif is_affine(matrix):
+            return _affine_inverse(matrix)
+        decomposition = lu_decompose(matrix)
+        if decomposition.singular:
             raise ValueError("This matrix has no inverse.")
+        return decomposition.inverse()
     else:
-        raise TypeError("This function can only find the inverse of 2x2, 3x3, or 4x4 matrices.")
+        raise TypeError("This function can only find the inverse of square matrices.")
+
+
+def is_affine(matrix):
+    """
+    Checks whether a square matrix is an affine transform in homogenous coordinates: a linear part in the top left,
+    the translation in the last row, and (0, ..., 0, 1) as the last column
+    :param matrix: A square Matrix
+    :return: True or False
+    """
+    n = matrix.num_rows
+    data = matrix.data
+    if n < 2 or data[-1] != 1:
+        return False
+    for row in range(n - 1):
+        if data[row * n + n - 1] != 0:
+            return False
+    return True
+
+
+def _affine_inverse(matrix):
+    """
+    Inverts an affine transform (see is_affine). If y = xA + t then x = yA^-1 - tA^-1, so only the linear part
+    needs a real inverse.
+    :param matrix: A square, affine Matrix larger than 2x2
+    :return: The inverse of the matrix
+    """
+    n = matrix.num_rows
+    m = n - 1
+    data = matrix.data
+    if m == 2:
+        a, b, zero_1, c, d, zero_2, tx, ty, one = data
+        determinant = a * d - b * c
+        if determinant == 0:
+            raise ValueError("This matrix has no inverse.")
+        a, b, c, d = d / determinant, 0.0 - b / determinant, 0.0 - c / determinant, a / determinant
+        return _from_data(3, 3, [a, b, 0.0, c, d, 0.0, -(tx * a + ty * c), -(tx * b + ty * d), 1.0])
+    linear_data = []
+    for row in range(m):
+        linear_data.extend(data[row * n:row * n + m])
+    decomposition = lu_decompose(_from_data(m, m, linear_data))
+    if decomposition.singular:
+        raise ValueError("This matrix has no inverse.")
+    linear_inverse = decomposition.inverse().data
+    translation = data[m * n:m * n + m]
+    inv_data = []
+    for row in range(m):
+        inv_data.extend(linear_inverse[row * m:row * m + m])
+        inv_data.append(0.0)
+    for col in range(m):
+        total = 0
+        for k in range(m):
+            total += translation[k] * linear_inverse[k * m + col]
+        inv_data.append(-total)
+    inv_data.append(1.0)
+    return _from_data(n, n, inv_data)
+
+
+def solve(matrix, b):
+    """
+    Solves the linear system (matrix)x = b
+    :param matrix: A square, invertible Matrix
+    :param b: A Vector, or a Matrix with one right-hand side per column
+    :return: x, as a Vector or Matrix to match b
+    """
+    return lu_decompose(matrix).solve(b)
 
 
 def rotate(angle):
     """
     Creates a 2D rotation matrix based on the provided angle. Counter-clockwise direction.
+    The result is cached and shared, so it is frozen; copy it to change it.
     :param angle: The angle of rotation in degrees
     :return: A rotation matrix
     """
     if isinstance(angle, (int, float)):
-        rad_angle = math.radians(angle)
-        v1 = vector.Vector(math.cos(rad_angle), math.sin(rad_angle) * -1)
-        v2 = vector.Vector(math.sin(rad_angle), math.cos(rad_angle))
-        r = Matrix(v1, v2)
-        return r
+        return _cached_rotate(angle)
     else:
         raise TypeError("Must enter an angle in degrees.")
 
 
+@functools.lru_cache(maxsize=128)
+def _cached_rotate(angle):
+    """
+    Builds the frozen rotation matrix that rotate(angle) hands out
+    :param angle: The angle of rotation in degrees
+    :return: A rotation matrix, frozen
+    """
+    rad_angle = math.radians(angle)
+    v1 = vector.Vector(math.cos(rad_angle), math.sin(rad_angle) * -1)
+    v2 = vector.Vector(math.sin(rad_angle), math.cos(rad_angle))
+    return Matrix(v1, v2).freeze()
+
+
 def hg(object):
     """
     Converts either a Vector or Matrix into homogenous coordinates
@@ -508,12 +825,12 @@ def hg(object):
     """
     if isinstance(object, vector.Vector):
         h = vector.Vector(*object.data, 1)
-    elif isinstance(object, Matrix):
-        h_rows = []
-        for row in range(len(object.rows)):
-            h_row = vector.Vector(*object.get_row(row).data, 1)
-            h_rows.append(h_row)
-        h = Matrix(*h_rows)
+    elif isinstance(object, PythonMatrix):
+        h_data = []
+        for row in object.row_tuples():
+            h_data.extend(row)
+            h_data.append(1.0)
+        h = _from_data(object.num_rows, object.num_cols + 1, h_data)
     else:
         raise TypeError("Only Vectors or Matrices can be converted to homogenous coordinates.")
     return h
@@ -536,7 +853,7 @@ def translate(dimension, *args):
     else:
         raise TypeError("Dimension for translation must be an integer and >0.")
     if keep_going:
-        tr = identity(dimension)
+        tr = identity(dimension).copy()
         for i in range(len(args)):
             tr[(dimension - 1, i)] = args[i]    # Bottom row index is equal to dimension - 1
         return tr
@@ -544,20 +861,293 @@ def translate(dimension, *args):
 
 def project(dimension):
     """
-    Create a matrix to project another matrix
+    Create a matrix to project another matrix. The result is cached and shared, so it is frozen; copy it to change it.
     :param dimension: The desired dimension to project onto
     :return: The projection matrix
     """
     if isinstance(dimension, int) and dimension > 1:
-        p_rows = []
-        temp_i = identity(dimension)    # Part of the projection matrix is an identity matrix.
-        for row in temp_i.rows:
-            p_rows.append(row)
-        last_row_data = []  # The last row is all zeroes.
-        for columns in range(dimension):
-            last_row_data.append(0)
-        last_row = vector.Vector(*last_row_data)
-        p_rows.append(last_row)
-        p = Matrix(*p_rows)
-        return p
+        return _cached_project(dimension)
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_project(dimension):
+    """
+    Builds the frozen projection matrix that project(dimension) hands out
+    :param dimension: The desired dimension to project onto
+    :return: The projection matrix, frozen
+    """
+    p_rows = []
+    temp_i = identity(dimension)    # Part of the projection matrix is an identity matrix.
+    for row in temp_i.rows:
+        p_rows.append(row)
+    last_row_data = []  # The last row is all zeroes.
+    for columns in range(dimension):
+        last_row_data.append(0)
+    last_row = vector.Vector(*last_row_data)
+    p_rows.append(last_row)
+    return Matrix(*p_rows).freeze()
+
+
+def cache_stats():
+    """
+    Reports how well the cached factories (identity, project, rotate) are doing
+    :return: A dictionary of {factory name: {"hits", "misses", "maxsize", "currsize"}}
+    """
+    stats = {}
+    for name, cached in (("identity", _cached_identity), ("project", _cached_project), ("rotate", _cached_rotate)):
+        stats[name] = cached.cache_info()._asdict()
+    return stats
+
+
+def clear_caches():
+    """
+    Empties the caches of the cached factories and resets their statistics
+    """
+    _cached_identity.cache_clear()
+    _cached_project.cache_clear()
+    _cached_rotate.cache_clear()
+
+
+class Affine2D:
+    """
+    A 2D affine transform stored as six floats. Points are treated as row vectors, like the rest of this module:
+    (x, y) -> (x * a + y * c + tx, x * b + y * d + ty), which is the same as multiplying the homogenous point by
+    the 3x3 matrix
+        / a  b  0 \\
+        | c  d  0 |
+        \\ tx ty 1 /
+    """
+
+    def __init__(self, a=1.0, b=0.0, c=0.0, d=1.0, tx=0.0, ty=0.0):
+        """
+        Creates an affine transform. The defaults give the identity transform.
+        """
+        for value in (a, b, c, d, tx, ty):
+            if not isinstance(value, (int, float)):
+                raise TypeError("Affine transforms can only hold integer or float values.")
+        self.a = float(a)
+        self.b = float(b)
+        self.c = float(c)
+        self.d = float(d)
+        self.tx = float(tx)
+        self.ty = float(ty)
+
+    def __str__(self):
+        return str(self.to_matrix())
+
+    def __eq__(self, other):
+        """
+        Checks whether two transforms are identical
+        :param other: The other transform
+        :return: True or False
+        """
+        if isinstance(other, Affine2D):
+            return (self.a == other.a and self.b == other.b and self.c == other.c and self.d == other.d and
+                    self.tx == other.tx and self.ty == other.ty)
+        else:
+            return False
+
+    def __mul__(self, other):
+        """
+        Composes two transforms. As with matrices, (A * B) applies A first and then B.
+        :param other: An Affine2D, a 2x2 linear transform Matrix (such as from rotate), or a 3x3 Matrix
+        :return: The composed Affine2D, or a Matrix if other was a 3x3 Matrix
+        """
+        if isinstance(other, Affine2D):
+            return Affine2D(self.a * other.a + self.b * other.c,
+                            self.a * other.b + self.b * other.d,
+                            self.c * other.a + self.d * other.c,
+                            self.c * other.b + self.d * other.d,
+                            self.tx * other.a + self.ty * other.c + other.tx,
+                            self.tx * other.b + self.ty * other.d + other.ty)
+        elif isinstance(other, PythonMatrix):
+            if other.num_rows == 2 and other.num_cols == 2:
+                return self * to_affine(other)
+            return self.to_matrix() * other
+        elif isinstance(other, TransformChain):
+            return TransformChain(self, *other.steps)
+        else:
+            raise TypeError("Affine transforms can only be multiplied by other transforms or matrices.")
+
+    def inverse(self):
+        """
+        Finds the inverse transform in closed form
+        :return: The inverse Affine2D
+        """
+        determinant = self.a * self.d - self.b * self.c
+        if determinant == 0:
+            raise ValueError("This transform has no inverse.")
+        a = self.d / determinant
+        b = -self.b / determinant
+        c = -self.c / determinant
+        d = self.a / determinant
+        return Affine2D(a, b, c, d, -(self.tx * a + self.ty * c), -(self.tx * b + self.ty * d))
+
+    def apply(self, point):
+        """
+        Transforms one point
+        :param point: A Vector2
+        :return: The transformed point as a new Vector2
+        """
+        x = point[0]
+        y = point[1]
+        return vector.Vector2(x * self.a + y * self.c + self.tx, x * self.b + y * self.d + self.ty)
+
+    def apply_to_points(self, points):
+        """
+        Transforms a whole set of points in one pass, without converting to homogenous coordinates
+        :param points: An Nx2 Matrix, or a list of Vector2s
+        :return: An Nx2 Matrix, or a list of Vector2s, matching what was passed in
+        """
+        a, b, c, d, tx, ty = self.a, self.b, self.c, self.d, self.tx, self.ty
+        if isinstance(points, PythonMatrix):
+            if points.num_cols != 2:
+                raise ValueError("Only a matrix of 2D points (two columns) can be transformed.")
+            data = points.data
+            new_data = []
+            for i in range(0, len(data), 2):
+                x = data[i]
+                y = data[i + 1]
+                new_data.append(x * a + y * c + tx)
+                new_data.append(x * b + y * d + ty)
+            return _from_data(points.num_rows, 2, new_data)
+        else:
+            return [vector.Vector2(p[0] * a + p[1] * c + tx, p[0] * b + p[1] * d + ty) for p in points]
+
+    def to_matrix(self):
+        """
+        :return: The 3x3 homogenous Matrix for this transform
+        """
+        return _from_data(3, 3, [self.a, self.b, 0.0, self.c, self.d, 0.0, self.tx, self.ty, 1.0])
+
+
+def to_affine(matrix):
+    """
+    Converts a transformation Matrix into an Affine2D
+    :param matrix: A 2x2 linear transform (such as from rotate), or a 3x3 homogenous transform (such as from translate)
+    :return: The matching Affine2D
+    """
+    if isinstance(matrix, PythonMatrix):
+        if matrix.num_rows == 2 and matrix.num_cols == 2:
+            return Affine2D(*matrix.data)
+        elif matrix.num_rows == 3 and matrix.num_cols == 3:
+            a, b, zero_1, c, d, zero_2, tx, ty, one = matrix.data
+            if zero_1 == 0 and zero_2 == 0 and one == 1:
+                return Affine2D(a, b, c, d, tx, ty)
+            else:
+                raise ValueError("The last column of the matrix must be (0, 0, 1) to be an affine transform.")
+    raise TypeError("Only 2x2 and 3x3 matrices can be converted to affine transforms.")
+
+
+def affine_translate(x, y):
+    """
+    Creates an affine transform that moves points
+    :param x: Movement along the x-axis
+    :param y: Movement along the y-axis
+    :return: The translation as an Affine2D
+    """
+    return Affine2D(tx=x, ty=y)
+
+
+def affine_rotate(angle):
+    """
+    Creates an affine transform with the same rotation as rotate(angle)
+    :param angle: The angle of rotation in degrees
+    :return: The rotation as an Affine2D
+    """
+    if isinstance(angle, (int, float)):
+        rad_angle = math.radians(angle)
+        return Affine2D(math.cos(rad_angle), math.sin(rad_angle) * -1, math.sin(rad_angle), math.cos(rad_angle))
+    else:
+        raise TypeError("Must enter an angle in degrees.")
+
+
+class TransformChain:
+    """
+    A sequence of transforms (Matrix or Affine2D objects) that is only multiplied out when it is used. The chain is
+    folded into one transform the first time it is needed, and the folded result is kept, so applying the chain to
+    a set of points costs one multiply however many steps it has. Multiplying a folded chain by another step starts
+    the new chain from the folded result instead of folding every step again.
+    As with matrices, (A * B) applies A first and then B, and the steps are folded in that order.
+    """
+
+    def __init__(self, *steps):
+        """
+        :param steps: The transforms in the order they are applied. A TransformChain counts as its own steps.
+        """
+        if not steps:
+            raise ValueError("A transform chain needs at least one step.")
+        flat_steps = []
+        for step in steps:
+            if isinstance(step, TransformChain):
+                flat_steps.extend(step.steps)
+            elif isinstance(step, (PythonMatrix, Affine2D)):
+                flat_steps.append(step)
+            else:
+                raise TypeError("Transform chains can only hold matrices and affine transforms.")
+        self.steps = tuple(flat_steps)
+        self.result = None
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __str__(self):
+        return str(self.to_matrix())
+
+    def __mul__(self, other):
+        """
+        Adds more steps to the end of the chain without multiplying anything yet
+        :param other: A Matrix, Affine2D, or TransformChain
+        :return: The longer chain
+        """
+        if isinstance(other, (PythonMatrix, Affine2D, TransformChain)):
+            if self.result is not None:
+                return TransformChain(self.result, other)
+            return TransformChain(self, other)
+        else:
+            raise TypeError("Transform chains can only be multiplied by matrices, affine transforms, or other chains.")
+
+    def fold(self):
+        """
+        Multiplies the steps together, the first time it is called
+        :return: The whole chain as one Affine2D (if every step is one) or one Matrix
+        """
+        if self.result is None:
+            steps = self.steps
+            if any(isinstance(step, Affine2D) for step in steps):
+                # Multiplying a 2x2 Matrix by an Affine2D treats the matrix as two points, so 2x2 linear transforms
+                # are turned into Affine2Ds before they meet one
+                steps = [to_affine(step) if isinstance(step, PythonMatrix) and step.num_rows == 2 and step.num_cols == 2
+                         else step for step in steps]
+            result = steps[0]
+            for step in steps[1:]:
+                result = result * step
+            self.result = result
+        return self.result
+
+    def apply(self, points):
+        """
+        Transforms a set of points with the folded chain
+        :param points: A Matrix with one point per row, or a list of Vector2s if the chain folds to an Affine2D
+        :return: The transformed points, the same as multiplying them by every step in turn
+        """
+        result = self.fold()
+        if isinstance(points, PythonMatrix):
+            return points * result
+        elif isinstance(result, Affine2D):
+            return result.apply_to_points(points)
+        else:
+            raise TypeError("Only a Matrix of points can be transformed by a chain that contains matrices.")
+
+    def to_matrix(self):
+        """
+        :return: The folded chain as a Matrix
+        """
+        result = self.fold()
+        if isinstance(result, Affine2D):
+            return result.to_matrix()
+        return result.copy()
+
 
+if backend.name == "numpy":
+    from numpy_matrix import Matrix, _from_data
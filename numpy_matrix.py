@@ -0,0 +1,267 @@
+import numpy as np
+import vector
+import matrix
+
+
+# When backend.name is "numpy", matrix.py replaces Matrix and _from_data with the versions below. The entries are
+# kept in a 2D NumPy array (self.array) instead of a flat list. data still reads (and replaces) the entries as a flat,
+# row-major list, so the module functions in matrix.py work unchanged; every method that changes the entries in
+# place is overridden here.
+
+
+class Matrix(matrix.Matrix):
+
+    def __init__(self, *args):
+        num_cols = len(args[0])
+        for i in args:
+            if not isinstance(i, vector.Vector) or len(i) != num_cols:
+                raise TypeError("All arguments must be vectors of the same dimension.")
+        self.array = np.array([list(i) for i in args], dtype=float)
+        self.num_rows = len(args)
+        self.num_cols = num_cols
+        self.t_data = None
+
+    @property
+    def data(self):
+        """
+        :return: The entries as a flat, row-major list (changing the list does not change the matrix)
+        """
+        return self.array.ravel().tolist()
+
+    @data.setter
+    def data(self, new_data):
+        self.array = np.array(new_data, dtype=float).reshape(self.num_rows, self.num_cols)
+
+    def copy(self):
+        """
+        Creates a new Matrix instance and populates it with the properties of the instance calling the function
+        :return: A deep copy of the Matrix (never frozen).
+        """
+        return _from_array(self.array.copy())
+
+    def __getitem__(self, location):
+        """
+        :param location: A row and a column index in the Matrix
+        :return: The specified entry in the Matrix
+        """
+        if isinstance(location, tuple) and len(location) == 2:
+            if isinstance(location[0], int) and isinstance(location[1], int):
+                self.index(location[0], location[1])    # Raises an IndexError when out of range
+                return float(self.array[location])
+            else:
+                raise TypeError("Matrix entries can only be accessed with integer indices.")
+        else:
+            raise TypeError("Matrix entries are accessed with a tuple of integer indices in the form of (row, column).")
+
+    def __setitem__(self, location, value):
+        """
+        :param location: A row and a column index in the Matrix
+        :param value: A new value to replace the previous entry
+        :return: No return. Changes the value at the index to the given value.
+        """
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
+        if isinstance(location[0], int) and isinstance(location[1], int):
+            if isinstance(value, (int, float)):
+                if abs(value) < 1 and abs(value) - 0.0000000001 < 0:    # Gets rid of -0.0's
+                    value = 0
+                self.index(location[0], location[1])
+                self.array[location[0], location[1]] = value
+            else:
+                raise TypeError("Entries can only be set to an integer or float value.")
+        else:
+            raise TypeError("Matrix entries can only be accessed with integer indices.")
+
+    def get_row(self, row):
+        """
+        Returns one complete row of the matrix in Vector form
+        :param row: The index of the row
+        :return: The specified row in Vector form
+        """
+        self.index(row, 0)
+        return vector.Vector(*self.array[row].tolist())
+
+    def row_tuples(self):
+        """
+        Returns every row of the matrix as a tuple of floats, without building any Vectors
+        :return: A list of tuples
+        """
+        return [tuple(row) for row in self.array.tolist()]
+
+    def transposed_data(self):
+        """
+        Finds the entries of the transpose in flat, row-major order
+        :return: A list of floats
+        """
+        return self.array.T.ravel().tolist()
+
+    def set_row(self, index, v):
+        """
+        Set a row in the matrix to a new row vector
+        :param index: The index of the row
+        :param v: The vector to replace the row
+        :return: Nothing returned
+        """
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
+        if isinstance(index, int) and isinstance(v, vector.Vector):
+            if v.dim == self.num_cols:  # Vector has to have same number of columns as other rows
+                self.index(index, 0)
+                self.array[index] = list(v)
+            else:
+                raise TypeError("The new vector cannot have a different dimension from the one it is replacing.")
+        else:
+            raise TypeError("Rows are set by (index, vector), with vector being a Vector object.")
+
+    def __add__(self, other):
+        """
+        Add two matrices
+        :param other: The matrix to the right of the operator
+        :return The sum of the two matrices
+        """
+        if isinstance(other, Matrix) and other.array.shape == self.array.shape:
+            return _from_array(self.array + other.array)
+        return super().__add__(other)
+
+    def __mul__(self, other):
+        """
+        Multiply a matrix and matrix or matrix and scalar
+        :param other: The matrix or scalar to the right of the operator
+        :return: The product of the matrix and the other
+        """
+        if isinstance(other, (int, float)):
+            return _from_array(self.array * other)
+        elif isinstance(other, Matrix) and self.num_cols == other.num_rows:
+            return _from_array(self.array @ other.array)
+        elif isinstance(other, matrix.Affine2D) and self.num_cols == 2:
+            return _from_array(self.array @ _linear_part(other) + (other.tx, other.ty))
+        return super().__mul__(other)
+
+    def __eq__(self, other):
+        """
+        Checks whether two matrices are identical
+        :param other: The other matrix
+        :return: True or False
+        """
+        if isinstance(other, Matrix):
+            return self.array.shape == other.array.shape and bool((self.array == other.array).all())
+        return super().__eq__(other)
+
+    def __iadd__(self, other):
+        """
+        Adds another matrix to this one without creating a new matrix
+        :param other: The matrix to the right of the operator
+        :return: This matrix, now holding the sum
+        """
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
+        if isinstance(other, matrix.PythonMatrix):
+            if other.num_rows == self.num_rows and other.num_cols == self.num_cols:
+                self.array += _entries(other)
+                return self
+            else:
+                raise ValueError("The two matrices must have the same dimensions to be added.")
+        else:
+            raise TypeError("Only a matrix can be added to another matrix.")
+
+    def __isub__(self, other):
+        """
+        Subtracts another matrix from this one without creating a new matrix
+        :param other: The matrix to the right of the operator
+        :return: This matrix, now holding the difference
+        """
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
+        if isinstance(other, matrix.PythonMatrix):
+            if other.num_rows == self.num_rows and other.num_cols == self.num_cols:
+                self.array -= _entries(other)
+                return self
+            else:
+                raise ValueError("The two matrices must have the same dimensions to be subtracted.")
+        else:
+            raise TypeError("Only a matrix can be subtracted from another matrix.")
+
+    def __imul__(self, other):
+        """
+        Multiplies this matrix by a scalar or matrix, storing the result in this matrix
+        :param other: The matrix or scalar to the right of the operator
+        :return: This matrix, now holding the product
+        """
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
+        if isinstance(other, (int, float)):
+            self.array *= other
+            return self
+        elif isinstance(other, matrix.PythonMatrix):
+            if self.num_cols == other.num_rows:
+                self.array = self.array @ _entries(other)
+                self.num_cols = other.num_cols
+                return self
+            else:
+                raise ValueError("The right matrix must have the same number of rows as the left has columns for them to be multiplied.")
+        else:
+            return NotImplemented
+
+    def add_scaled(self, v, scale):
+        """
+        Adds a scaled vector to every row of the matrix in place (translates a matrix of points)
+        :param v: A vector with the same dimension as the rows
+        :param scale: A scalar to multiply v by
+        :return: This matrix
+        """
+        if self.frozen:
+            raise ValueError("This matrix is frozen and cannot be changed. Change a copy instead.")
+        if isinstance(v, vector.Vector) and v.dim == self.num_cols:
+            self.array += np.array(list(v)) * scale
+            return self
+        else:
+            raise TypeError("The vector must have the same dimension as the rows of the matrix.")
+
+    def transpose(self):
+        """
+        Finds the transpose of the matrix
+        :return: The transpose of the matrix
+        """
+        return _from_array(self.array.T.copy())
+
+
+def _entries(other):
+    """
+    :param other: A Matrix of either backend
+    :return: Its entries as a 2D array (the matrix's own array for a NumPy Matrix)
+    """
+    if isinstance(other, Matrix):
+        return other.array
+    return np.array(other.data, dtype=float).reshape(other.num_rows, other.num_cols)
+
+
+def _linear_part(transform):
+    """
+    :param transform: An Affine2D
+    :return: The 2x2 linear part of the transform as an array
+    """
+    return np.array(((transform.a, transform.b), (transform.c, transform.d)))
+
+
+def _from_array(entries):
+    """
+    Builds a Matrix around a 2D array without copying or checking it
+    :param entries: A float64 array of shape (rows, columns). The new Matrix takes ownership of it.
+    :return: The new Matrix
+    """
+    new_matrix = Matrix.__new__(Matrix)
+    new_matrix.num_rows, new_matrix.num_cols = entries.shape
+    new_matrix.array = entries
+    new_matrix.t_data = None
+    return new_matrix
+
+
+def _from_data(num_rows, num_cols, data):
+    """
+    Builds a Matrix straight from a flat, row-major list of floats, without checking it
+    :param num_rows: The number of rows
+    :param num_cols: The number of columns
+    :param data: num_rows * num_cols floats
+    :return: The new Matrix
+    """
+    return _from_array(np.array(data, dtype=float).reshape(num_rows, num_cols))
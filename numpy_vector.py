@@ -0,0 +1,258 @@
+import numpy as np
+import vector
+
+
+# When backend.name is "numpy", vector.py replaces Vector2, Vector3, and _new_vector2 with the versions below.
+# They subclass the pure Python classes, so every method that isn't overridden here still works: it reads the
+# components through _x and _y (Vector2) or data (Vector3), which are backed by a NumPy array.
+
+
+class Vector2(vector.Vector2):
+    __slots__ = ("array",)
+
+    def __init__(self, a, b):
+        """
+        :param a: x component of the vector
+        :param b: y component of the vector
+        :return: A vector instance that is both Vector and Vector2
+        """
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+            self.array = np.array((a, b), dtype=float)
+            self._mag = None
+        else:
+            raise TypeError("Only integer or float values are accepted.")
+
+    @property
+    def _x(self):
+        return float(self.array[0])
+
+    @_x.setter
+    def _x(self, a):
+        self.array[0] = a
+
+    @property
+    def _y(self):
+        return float(self.array[1])
+
+    @_y.setter
+    def _y(self, a):
+        self.array[1] = a
+
+    @property
+    def data(self):
+        """
+        :return: A list of the vector's components (changing the list does not change the vector)
+        """
+        return self.array.tolist()
+
+    def __iter__(self):
+        """
+        :return: An iterator over the x and y components
+        """
+        return iter(self.array.tolist())
+
+    def copy(self):
+        """
+        Creates a new Vector2 with the same components
+        :return: A deep copy of the Vector.
+        """
+        return _from_array(self.array.copy())
+
+    def __mul__(self, other):
+        """
+        Multiplication between a vector on the left and a scalar on the right
+        :param other: A scalar
+        :return: A vector with the newly multiplied values
+        """
+        if isinstance(other, (int, float)):
+            return _from_array(self.array * other)
+        else:
+            return NotImplemented
+
+    def __add__(self, other):
+        """
+        Adds two vectors
+        :param other: Another vector
+        :return: A vector that is the sum of both
+        """
+        if isinstance(other, Vector2):
+            return _from_array(self.array + other.array)
+        return super().__add__(other)
+
+    def __sub__(self, other):
+        """
+        Subtracts two vectors
+        :param other: Another vector
+        :return: A vector that is the difference of both
+        """
+        if isinstance(other, Vector2):
+            return _from_array(self.array - other.array)
+        return super().__sub__(other)
+
+    def __neg__(self):
+        """
+        Negates the vector
+        :return: The opposite vector of this instance
+        """
+        return _from_array(-self.array)
+
+    def __iadd__(self, other):
+        """
+        Adds another vector to this one without creating a new vector
+        :param other: Another vector
+        :return: This vector, now holding the sum
+        """
+        if isinstance(other, Vector2):
+            self.array += other.array
+            self._mag = None
+            return self
+        return super().__iadd__(other)
+
+    def __isub__(self, other):
+        """
+        Subtracts another vector from this one without creating a new vector
+        :param other: Another vector
+        :return: This vector, now holding the difference
+        """
+        if isinstance(other, Vector2):
+            self.array -= other.array
+            self._mag = None
+            return self
+        return super().__isub__(other)
+
+    def __imul__(self, other):
+        """
+        Multiplies this vector by a scalar without creating a new vector
+        :param other: A scalar
+        :return: This vector, now holding the product
+        """
+        if isinstance(other, (int, float)):
+            self.array *= other
+            self._mag = None
+            return self
+        else:
+            return NotImplemented
+
+    def add_scaled(self, other, scale):
+        """
+        Adds a scaled vector to this one in place. Same result as self += other * scale, without the temporary vector
+        :param other: Another vector
+        :param scale: A scalar to multiply other by
+        :return: This vector, now holding the sum
+        """
+        if isinstance(other, Vector2) and isinstance(scale, (int, float)):
+            self.array += other.array * scale
+            self._mag = None
+            return self
+        return super().add_scaled(other, scale)
+
+
+def _from_array(components):
+    """
+    Builds a Vector2 around an array without copying or checking it
+    :param components: A float64 array of shape (2,). The new vector takes ownership of it.
+    :return: A new Vector2
+    """
+    new_vector = object.__new__(Vector2)
+    new_vector.array = components
+    new_vector._mag = None
+    return new_vector
+
+
+def _new_vector2(x, y):
+    """
+    Builds a Vector2 from components that are already known to be floats, skipping validation
+    :param x: x component of the vector
+    :param y: y component of the vector
+    :return: A new Vector2
+    """
+    return _from_array(np.array((x, y)))
+
+
+class Vector3(vector.Vector3):
+    # data is a float64 array of shape (3,) instead of a list
+    __slots__ = ()
+
+    def __init__(self, a, b, c):
+        """
+        :param a: x component of the vector
+        :param b: y component of the vector
+        :param c: z component of the vector
+        :return: A vector instance that is both Vector and Vector3
+        """
+        for value in (a, b, c):
+            if not isinstance(value, (int, float)):
+                raise TypeError("Only integer or float values are accepted.")
+        self.data = np.array((a, b, c), dtype=float)
+        self.dim = 3
+
+    def copy(self):
+        """
+        Creates a new Vector3 with the same components
+        :return: A deep copy of the Vector.
+        """
+        return _from_array3(self.data.copy())
+
+    def __mul__(self, other):
+        """
+        Multiplication between a vector on the left and a scalar on the right
+        :param other: A scalar
+        :return: A vector with the newly multiplied values
+        """
+        if isinstance(other, (int, float)):
+            return _from_array3(self.data * other)
+        else:
+            return NotImplemented
+
+    def __add__(self, other):
+        """
+        Adds two vectors
+        :param other: Another vector
+        :return: A vector that is the sum of both
+        """
+        if isinstance(other, Vector3):
+            return _from_array3(self.data + other.data)
+        return super().__add__(other)
+
+    def __sub__(self, other):
+        """
+        Subtracts two vectors
+        :param other: Another vector
+        :return: A vector that is the difference of the two
+        """
+        if isinstance(other, Vector3):
+            return _from_array3(self.data - other.data)
+        return super().__sub__(other)
+
+
+def _from_array3(components):
+    """
+    Builds a Vector3 around an array without copying or checking it
+    :param components: A float64 array of shape (3,). The new vector takes ownership of it.
+    :return: A new Vector3
+    """
+    new_vector = object.__new__(Vector3)
+    new_vector.data = components
+    new_vector.dim = 3
+    return new_vector
+
+
+def arena_factories(arena):
+    """
+    Builds versions of _from_array and _from_array3 that take their vectors from an arena
+    :param arena: The vector.VectorArena that is being entered
+    :return: The replacements, by name
+    """
+    def from_array(components):
+        new_vector = arena.take(Vector2)
+        new_vector.array = components
+        new_vector._mag = None
+        return new_vector
+
+    def from_array3(components):
+        new_vector = arena.take(Vector3)
+        new_vector.data = components
+        new_vector.dim = 3
+        return new_vector
+
+    return {"_from_array": from_array, "_from_array3": from_array3}
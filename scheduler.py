@@ -0,0 +1,217 @@
+import heapq
+import sys
+
+
+class Timer:
+    """
+    A countdown registered with a Scheduler. Create timers with Scheduler.schedule.
+    """
+    __slots__ = ("callback", "priority", "value", "previous", "frame", "entry", "due")
+
+    def __init__(self, callback, priority):
+        """
+        :param callback: A function that takes the timer. Called by Scheduler.run when the timer runs out.
+        :param priority: Timers that run out on the same frame fire in order of priority, lowest first
+        """
+        self.callback = callback
+        self.priority = priority
+        self.value = 0.0
+        self.previous = 0.0     # value before the last frame it counted, so hold can take that frame back
+        self.frame = 0      # The frame that value has been counted down to
+        self.entry = None   # The timer's entry in the scheduler's heap, None when it isn't waiting
+        self.due = False    # True from the frame it runs out until it is restarted or cancelled
+
+
+class Scheduler:
+    """
+    Keeps countdown timers in a heap ordered by when they run out, so each frame only looks at the timers that are
+    about to fire instead of counting every timer down.
+    A timer runs out on exactly the frame that "timer -= dt; if timer <= 0" would have fired. The heap is keyed by an
+    estimate, the timer's value less the time that has passed since it was counted (the difference of two running
+    totals of the frame times). Only when the estimate is within a rounding tolerance of zero is the timer checked
+    exactly, by subtracting the frame times it hasn't counted yet one at a time, in order.
+    """
+    # Every addition or subtraction rounds by at most half of epsilon times its result, so after n frames neither the
+    # running totals nor a countdown can be out by more than n * epsilon times the biggest time involved. The timers
+    # checked in a frame have no more than the current time left on them, so advance allows margin * frame * time
+    # (at least margin * frame), which leaves room to spare.
+    margin = 4 * sys.float_info.epsilon
+    trim_size = 4096        # The fewest frame times kept before trim runs
+
+    def __init__(self):
+        self.frame = 0
+        self.time = 0.0
+        self.steps = []     # The dt of every frame after first_frame
+        self.times = [0.0]  # The running total of the frame times at the end of every frame from first_frame on
+        self.first_frame = 0
+        self.trim_at = self.trim_size
+        self.heap = []
+        self.fired = []     # Timers that ran out since the last trim
+        self.count = 0      # Breaks ties in the heap and keeps firing order stable
+        self.waiting = 0    # Timers in the heap that haven't been cancelled
+
+    def __len__(self):
+        return self.waiting
+
+    def schedule(self, delay, callback, priority=0):
+        """
+        Starts a new timer. It counts down from the next frame on.
+        :param delay: Time until the timer runs out
+        :param callback: A function that takes the timer, called by run when it runs out
+        :param priority: Timers that run out on the same frame fire in order of priority, lowest first
+        :return: The Timer
+        """
+        timer = Timer(callback, priority)
+        self.restart(timer, delay)
+        return timer
+
+    def restart(self, timer, delay):
+        """
+        Sets a timer to a new delay, the same as assigning it in "timer -= dt; if timer <= 0"
+        :param timer: A Timer from this scheduler
+        :param delay: Time until the timer runs out, counted from the next frame
+        """
+        self.cancel(timer)
+        timer.value = delay
+        timer.frame = self.frame
+        self.push(timer, self.time + delay)
+
+    def cancel(self, timer):
+        """
+        Stops a timer. It won't fire unless it is restarted.
+        :param timer: A Timer from this scheduler
+        """
+        if timer.entry is not None:
+            timer.entry[3] = None   # Left in the heap and skipped when it comes up
+            timer.entry = None
+            self.waiting -= 1
+        timer.due = False
+
+    def push(self, timer, deadline):
+        """
+        Adds a timer to the heap
+        :param timer: A Timer that isn't in the heap
+        :param deadline: The estimated time it runs out
+        """
+        self.count += 1
+        self.waiting += 1
+        timer.entry = [deadline, timer.priority, self.count, timer]
+        heapq.heappush(self.heap, timer.entry)
+
+    def remaining(self, timer):
+        """
+        Counts a timer down to the current frame
+        :param timer: A Timer from this scheduler
+        :return: The time left on the timer, exactly as a countdown would have it
+        """
+        return self.count_down(timer, self.frame)
+
+    def count_down(self, timer, frame):
+        """
+        Subtracts the dt of every frame a timer hasn't counted yet, up to and including a frame
+        :param timer: A Timer from this scheduler
+        :param frame: The frame to count down to
+        :return: The time left on the timer at the end of that frame
+        """
+        start = timer.frame - self.first_frame
+        end = frame - self.first_frame
+        if end > start:
+            value = timer.value
+            for step in self.steps[start:end - 1]:
+                value -= step
+            timer.previous = value
+            timer.value = value - self.steps[end - 1]
+        timer.frame = frame
+        return timer.value
+
+    def estimate(self, timer):
+        """
+        Estimates the time left on a timer from the running totals, without counting it down
+        :param timer: A Timer from this scheduler
+        :return: The time left at the end of the current frame, within rounding of the exact countdown
+        """
+        return timer.value - (self.time - self.times[timer.frame - self.first_frame])
+
+    def hold(self, timer):
+        """
+        Takes the current frame's dt back off a timer, as if its countdown had been skipped this frame. The game used
+        to remove pickups from the list it was looping over, which skipped the next pickup's "timer -= dt" on that
+        frame; holding that pickup's timer keeps the same frames. A timer already counted to this frame goes back to
+        previous, its value before this frame's dt. Any other timer is counted to the last frame and marked as counted
+        to this one. A timer that ran out this frame hasn't any more, and waits in the heap again.
+        :param timer: A Timer from this scheduler that was started before this frame
+        """
+        if timer.frame == self.frame:
+            timer.value = timer.previous
+        else:
+            self.count_down(timer, self.frame - 1)
+            timer.frame = self.frame
+        if timer.due:
+            timer.due = False
+            self.push(timer, self.time + timer.value)
+
+    def advance(self, dt):
+        """
+        Moves time forward one frame
+        :param dt: Change in time
+        :return: The timers that ran out this frame, in firing order. They stay stopped until restarted.
+        """
+        if len(self.steps) > self.trim_at:
+            self.trim()
+        self.frame += 1
+        self.time += dt
+        self.steps.append(dt)
+        self.times.append(self.time)
+        due = []
+        close = []  # Timers that came up but still have time left, some of it only a sliver
+        heap = self.heap
+        time = self.time
+        margin = self.margin * self.frame * max(1.0, time)
+        while heap and heap[0][0] <= time + margin:
+            timer = heapq.heappop(heap)[3]
+            if timer is None:
+                continue
+            timer.entry = None
+            self.waiting -= 1
+            left = self.estimate(timer)
+            if left > margin or (left >= -margin and self.remaining(timer) > 0):
+                close.append(timer)
+            else:
+                timer.due = True
+                due.append(timer)
+        for timer in close:
+            self.push(timer, time + self.estimate(timer))
+        self.fired.extend(due)
+        due.sort(key=lambda timer: timer.priority)
+        return due
+
+    def run(self, dt):
+        """
+        Moves time forward one frame and calls the callback of every timer that ran out, in firing order
+        :param dt: Change in time
+        """
+        for timer in self.advance(dt):
+            timer.callback(timer)
+
+    def trim(self):
+        """
+        Forgets the frame times that every timer has already counted, and drops cancelled timers from the heap. The
+        frame times kept may double before the next trim, so its cost is spread over at least as many frames as it
+        keeps.
+        """
+        self.fired = [timer for timer in self.fired if timer.due]
+        for timer in self.fired:
+            self.count_down(timer, self.frame)  # Timers that ran out and weren't restarted can still be held
+        oldest = self.frame
+        entries = []
+        for entry in self.heap:
+            if entry[3] is not None:
+                entries.append(entry)
+                if entry[3].frame < oldest:
+                    oldest = entry[3].frame
+        heapq.heapify(entries)
+        self.heap = entries
+        del self.steps[:oldest - self.first_frame]
+        del self.times[:oldest - self.first_frame]
+        self.first_frame = oldest
+        self.trim_at = max(self.trim_size, 2 * len(self.steps))
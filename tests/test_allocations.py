@@ -0,0 +1,110 @@
+import random
+import pygame
+import pytest
+import backend
+import classes
+import matrix
+import vector as v
+
+pytestmark = pytest.mark.skipif(backend.name != "python", reason="Counts the pure Python Vector2 and Matrix objects")
+
+WINDOW = (800, 700)
+BUFFER = 100
+
+
+@pytest.fixture
+def count_allocations(monkeypatch):
+    """
+    Counts every Vector2, Vector3, and Matrix built while the test runs
+    :return: A dict with the running count under "objects"
+    """
+    counter = {"objects": 0}
+    new_vector = v.Vector.__new__
+    new_vector2 = v._new_vector2
+
+    def counted_vector(cls, *args):
+        counter["objects"] += 1
+        return new_vector(cls, *args)
+
+    def counted_vector2(x, y):
+        counter["objects"] += 1
+        return new_vector2(x, y)
+
+    # Matrices are built either by the constructor or by _from_data. Replacing Matrix.__new__ instead would leave
+    # object.__new__ rejecting the constructor's arguments after the test.
+    init_matrix = matrix.Matrix.__init__
+    from_data = matrix._from_data
+
+    def counted_init(self, *args):
+        counter["objects"] += 1
+        init_matrix(self, *args)
+
+    def counted_from_data(num_rows, num_cols, data):
+        counter["objects"] += 1
+        return from_data(num_rows, num_cols, data)
+
+    monkeypatch.setattr(v.Vector, "__new__", staticmethod(counted_vector))
+    monkeypatch.setattr(v, "_new_vector2", counted_vector2)
+    monkeypatch.setattr(matrix.Matrix, "__init__", counted_init)
+    monkeypatch.setattr(matrix, "_from_data", counted_from_data)
+    return counter
+
+
+def build_entities(count):
+    """
+    :param count: How many shots and how many enemies to make
+    :return: A player, a list of shots, and a list of enemies, all moving
+    """
+    random.seed(count)
+    surf = pygame.Surface(WINDOW)
+    image = pygame.Surface((10, 10))
+    player = classes.Player(v.Vector2(400, 400), surf, image)
+    player.movement = v.Vector2(1, -1)
+    shots = [classes.Shot(v.Vector2(random.uniform(100, 700), random.uniform(100, 600)),
+                          v.Vector2(random.uniform(-1, 1), 1), surf, image) for i in range(count)]
+    enemies = [classes.Enemy(v.Vector2(random.uniform(100, 700), random.uniform(100, 600))) for i in range(count)]
+    for enemy in enemies:
+        enemy.movement = v.Vector2(random.uniform(-50, 50), random.uniform(-50, 50))
+    return player, shots, enemies
+
+
+def frame(player, shots, enemies, dt):
+    """
+    Moves everything the way level_manager.update does each frame
+    """
+    player.update(dt, BUFFER, WINDOW)
+    for shot in shots:
+        shot.update(dt)
+    for enemy in enemies:
+        enemy.move(dt, BUFFER, WINDOW)
+
+
+@pytest.mark.parametrize("count", [10, 100])
+def test_frame_allocates_no_vectors_or_matrices(count, count_allocations):
+    entities = build_entities(count)
+    frame(*entities, 1 / 60)     # Anything built lazily on the first frame doesn't count
+    count_allocations["objects"] = 0
+    for i in range(30):
+        frame(*entities, 1 / 60)
+    assert count_allocations["objects"] == 0
+
+
+def test_in_place_operators_keep_the_object(count_allocations):
+    a = v.Vector2(1, 2)
+    b = v.Vector2(3, 4)
+    m = matrix.Matrix(v.Vector2(1, 2), v.Vector2(3, 4))
+    n = matrix.Matrix(v.Vector2(5, 6), v.Vector2(7, 8))
+    expected = matrix.Matrix(v.Vector2(2, 4), v.Vector2(6, 8))
+    count_allocations["objects"] = 0
+    same = a
+    a += b
+    a -= b
+    a *= 2
+    a.add_scaled(b, 0.5)
+    assert a is same and (a.x, a.y) == (3.5, 6.0)
+    same = m
+    m += n
+    m -= n
+    m *= 2
+    assert m is same and m == expected
+    assert count_allocations["objects"] == 0
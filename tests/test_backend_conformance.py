@@ -0,0 +1,199 @@
+import math
+import pytest
+import matrix
+import vector as v
+
+# The same tests run against the pure Python and the NumPy classes. Both sets can be used side by side whichever
+# backend is selected, so every run checks both.
+
+
+@pytest.fixture(params=["python", "numpy"])
+def impl(request):
+    """
+    :return: An object with the Vector2, Vector3, and Matrix classes of one backend
+    """
+    class Classes:
+        pass
+    classes = Classes()
+    if request.param == "python":
+        classes.Vector2 = v.PythonVector2
+        classes.Vector3 = v.PythonVector3
+        classes.Matrix = matrix.PythonMatrix
+    else:
+        pytest.importorskip("numpy")
+        import numpy_vector
+        import numpy_matrix
+        classes.Vector2 = numpy_vector.Vector2
+        classes.Vector3 = numpy_vector.Vector3
+        classes.Matrix = numpy_matrix.Matrix
+    return classes
+
+
+def square(impl, *rows):
+    """
+    :param impl: The backend's classes
+    :param rows: Each row as a tuple of numbers
+    :return: A Matrix of the backend built from the rows
+    """
+    vector_class = impl.Vector2 if len(rows[0]) == 2 else impl.Vector3
+    return impl.Matrix(*[vector_class(*row) for row in rows])
+
+
+def test_vector2_arithmetic(impl):
+    a = impl.Vector2(1, 2)
+    b = impl.Vector2(3, -4)
+    assert list(a + b) == [4.0, -2.0]
+    assert list(a - b) == [-2.0, 6.0]
+    assert list(a * 3) == [3.0, 6.0]
+    assert list(3 * a) == [3.0, 6.0]
+    assert list(a / 2) == [0.5, 1.0]
+    assert list(-a) == [-1.0, -2.0]
+    assert a == impl.Vector2(1, 2)
+    assert isinstance(a + b, v.PythonVector2)
+
+
+def test_vector2_components(impl):
+    a = impl.Vector2(3, 4)
+    assert (a.x, a.y, a[0], a[1], len(a)) == (3.0, 4.0, 3.0, 4.0, 2)
+    assert a.mag == 5.0
+    a.x = 6
+    a[1] = 8
+    assert list(a) == [6.0, 8.0]
+    assert a.mag == 10.0    # Changing a component throws away the cached magnitude
+    with pytest.raises(TypeError):
+        a.x = "6"
+
+
+def test_vector2_lengths(impl):
+    a = impl.Vector2(3, 4)
+    assert a.mag_squared == 25.0
+    assert list(a.normalize) == pytest.approx([0.6, 0.8])
+    assert list(a.perpendicular) == [-4.0, 3.0]
+    assert v.dot(a, impl.Vector2(2, 1)) == 10.0
+    assert v.distance_squared(a, impl.Vector2(0, 0)) == 25.0
+    assert v.within_distance(a, impl.Vector2(0, 0), 5)
+    assert not v.within_distance(a, impl.Vector2(0, 0), 4.9)
+    with pytest.raises(ValueError):
+        impl.Vector2(0, 0).normalize
+
+
+def test_vector2_in_place(impl):
+    a = impl.Vector2(1, 2)
+    same = a
+    a += impl.Vector2(1, 1)
+    a -= impl.Vector2(0, 2)
+    a *= 3
+    a.add_scaled(impl.Vector2(1, -1), 0.5)
+    assert a is same
+    assert list(a) == [6.5, 2.5]
+    assert a.mag == pytest.approx(math.hypot(6.5, 2.5))
+
+
+def test_vector2_directions(impl):
+    direction = v.direction_to_Vector2(10, impl.Vector2(3, 4))
+    assert list(direction) == pytest.approx([6.0, 8.0])
+    assert impl.Vector2(0, 5).degrees == pytest.approx(90.0)
+
+
+def test_vector3(impl):
+    a = impl.Vector3(2, 3, 6)
+    assert a.mag == 7.0
+    assert a.mag_squared == 49.0
+    assert list(a.normalize) == pytest.approx([2 / 7, 3 / 7, 6 / 7])
+    assert v.dot(a, impl.Vector3(1, 1, 1)) == 11.0
+    assert list(a + impl.Vector3(1, 1, 1)) == [3.0, 4.0, 7.0]
+    assert list(a * 2) == [4.0, 6.0, 12.0]
+
+
+def test_matrix_entries(impl):
+    m = square(impl, (1, 2), (3, 4))
+    assert (m.num_rows, m.num_cols) == (2, 2)
+    assert m.data == [1.0, 2.0, 3.0, 4.0]
+    assert m[0, 1] == 2.0
+    assert list(m.get_row(1)) == [3.0, 4.0]
+    assert list(m.get_column(0)) == [1.0, 3.0]
+    m[1, 0] = 7
+    assert m.data == [1.0, 2.0, 7.0, 4.0]
+    copy = m.copy()
+    copy[0, 0] = 9
+    assert m[0, 0] == 1.0
+    assert m.transpose().data == [1.0, 7.0, 2.0, 4.0]
+
+
+def test_matrix_arithmetic(impl):
+    a = square(impl, (1, 2), (3, 4))
+    b = square(impl, (5, 6), (7, 8))
+    assert (a + b).data == [6.0, 8.0, 10.0, 12.0]
+    assert (a - b).data == [-4.0, -4.0, -4.0, -4.0]
+    assert (a * 2).data == [2.0, 4.0, 6.0, 8.0]
+    assert (a * b).data == [19.0, 22.0, 43.0, 50.0]
+    assert (a * impl.Vector2(1, 1)).data == [3.0, 7.0]     # A vector on the right is a column
+    assert (impl.Vector2(1, 1) * a).data == [4.0, 6.0]     # and on the left a row
+    assert a * b == square(impl, (19, 22), (43, 50))
+
+
+def test_matrix_in_place(impl):
+    a = square(impl, (1, 2), (3, 4))
+    same = a
+    a += square(impl, (1, 1), (1, 1))
+    a -= square(impl, (0, 1), (0, 1))
+    a *= 2
+    a *= square(impl, (0, 1), (1, 0))
+    assert a is same
+    assert a.data == [4.0, 4.0, 8.0, 8.0]
+    a.add_scaled(impl.Vector2(1, -1), 0.5)
+    assert a.data == [4.5, 3.5, 8.5, 7.5]
+
+
+def test_matrix_solving(impl):
+    a = square(impl, (4, 7, 2), (3, 6, 1), (2, 5, 3))
+    assert a.det() == pytest.approx(9.0)
+    assert (a * matrix.inverse(a)).data == pytest.approx(matrix.identity(3).data)
+    assert square(impl, (1, 2), (3, 4)).det() == -2.0
+    with pytest.raises(ValueError):
+        matrix.inverse(square(impl, (1, 2), (2, 4)))
+
+
+def test_transforms(impl):
+    points = square(impl, (1, 0), (0, 2))
+    rotated = points * matrix.rotate(90)
+    assert rotated.data == pytest.approx([0.0, -1.0, 2.0, 0.0])
+    moved = points * matrix.affine_translate(3, 4)
+    assert moved.data == [4.0, 4.0, 3.0, 6.0]
+    chain = matrix.TransformChain(matrix.rotate(90), matrix.affine_translate(3, 4))
+    assert (points * chain).data == pytest.approx([3.0, 3.0, 5.0, 4.0])
+
+
+def test_mixed_backends_multiply():
+    pytest.importorskip("numpy")
+    import numpy_matrix
+    python_matrix = matrix.PythonMatrix(v.PythonVector2(1, 2), v.PythonVector2(3, 4))
+    numpy_matrix_ = numpy_matrix.Matrix(v.Vector2(1, 2), v.Vector2(3, 4))
+    assert (python_matrix * python_matrix).data == [7.0, 10.0, 15.0, 22.0]
+    assert (python_matrix * numpy_matrix_).data == [7.0, 10.0, 15.0, 22.0]
+    assert (numpy_matrix_ * python_matrix).data == [7.0, 10.0, 15.0, 22.0]
+    assert (python_matrix + python_matrix).data == [2.0, 4.0, 6.0, 8.0]
+
+
+@pytest.mark.parametrize("left, right", [("python", "numpy"), ("numpy", "python")])
+def test_mixed_backends_arithmetic(left, right):
+    pytest.importorskip("numpy")
+    import numpy_matrix
+    classes = {"python": matrix.PythonMatrix, "numpy": numpy_matrix.Matrix}
+
+    def make():
+        return classes[left](v.PythonVector2(1, 2), v.PythonVector2(3, 4))
+    other = classes[right](v.PythonVector2(5, 6), v.PythonVector2(7, 8))
+    assert (make() + other).data == [6.0, 8.0, 10.0, 12.0]
+    assert (make() - other).data == [-4.0, -4.0, -4.0, -4.0]
+    total = make()
+    total += other
+    assert type(total) is classes[left] and total.data == [6.0, 8.0, 10.0, 12.0]
+    difference = make()
+    difference -= other
+    assert type(difference) is classes[left] and difference.data == [-4.0, -4.0, -4.0, -4.0]
+    product = make()
+    product *= other
+    assert type(product) is classes[left] and product.data == [19.0, 22.0, 43.0, 50.0]
+    with pytest.raises(ValueError):
+        make().__iadd__(classes[right](v.PythonVector2(1, 2)))
@@ -0,0 +1,34 @@
+import random
+import pytest
+import classes
+import entity_store
+import vector as v
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def enemy():
+    random.seed(3)
+    return classes.Enemy(v.Vector2(100, 200))
+
+
+def test_stored_entities_keep_their_class(enemy):
+    store = entity_store.EntityStore(1)
+    store.add(enemy)
+    assert type(enemy) is classes.Enemy
+    assert getattr(classes, type(enemy).__qualname__) is type(enemy)     # What pickle looks the class up by
+    other = classes.Enemy(v.Vector2(5, 5))
+    store.add(other)    # Grows the arrays
+    enemy.center = v.Vector2(300, 400)
+    enemy.radius = 9
+    assert tuple(store.centers[0]) == (300, 400) and store.radii[0] == 9
+    store.remove(enemy)
+    assert type(enemy) is classes.Enemy
+    assert type(enemy.center) is not entity_store.RowVector2 or enemy.center._array is not store.centers
+    enemy.center = v.Vector2(1, 2)
+    enemy.radius = 4
+    assert list(enemy.center) == [1, 2] and enemy.radius == 4
+    assert store.entities == [other]    # The other enemy filled the gap, and nothing of this one is mirrored
+    assert tuple(store.centers[0]) == tuple(other.center) and store.radii[0] == other.radius
+
@@ -0,0 +1,43 @@
+import pytest
+import matrix
+import vector as v
+
+
+def points():
+    """
+    :return: Three 2D points, one per row
+    """
+    return matrix.Matrix(v.Vector2(1, 2), v.Vector2(3, 4), v.Vector2(-5, 0.5))
+
+
+def step_by_step(points, steps):
+    """
+    Applies transforms one at a time
+    :param points: A Matrix with one point per row
+    :param steps: Affine2Ds and 2x2 matrices, in the order they are applied
+    :return: The transformed points
+    """
+    for step in steps:
+        points = points * step
+    return points
+
+
+@pytest.mark.parametrize("steps", [
+    (matrix.rotate(90), matrix.affine_translate(5, 5)),
+    (matrix.affine_translate(5, 5), matrix.rotate(90)),
+    (matrix.rotate(30), matrix.affine_rotate(45), matrix.affine_translate(1, -2), matrix.rotate(-10)),
+    (matrix.affine_translate(2, 3), matrix.Affine2D(2, 0, 0, 0.5), matrix.rotate(60), matrix.rotate(15)),
+    (matrix.rotate(20), matrix.rotate(25)),
+])
+def test_folded_chain_matches_step_by_step(steps):
+    chain = matrix.TransformChain(*steps)
+    expected = step_by_step(points(), steps)
+    assert (points() * chain).data == pytest.approx(expected.data)
+    assert chain.apply(points()).data == pytest.approx(expected.data)
+
+
+def test_affine_times_linear_matrix_composes():
+    composed = matrix.affine_translate(5, 5) * matrix.rotate(90)
+    expected = matrix.affine_translate(5, 5) * matrix.to_affine(matrix.rotate(90))
+    assert isinstance(composed, matrix.Affine2D)
+    assert composed == expected
@@ -0,0 +1,117 @@
+import random
+import pytest
+import scheduler
+
+
+class OftenTrimmed(scheduler.Scheduler):
+    trim_size = 16
+
+
+def countdown_firings(delays, frame_times, skipped):
+    """
+    Runs timers the way the game used to, with "timer -= dt; if timer <= 0" every frame
+    :param delays: The delay of each timer. A timer that runs out starts again from its delay.
+    :param frame_times: The dt of each frame
+    :param skipped: A set of (frame, timer index) pairs whose countdown is skipped on that frame
+    :return: The (frame, timer index) pairs of every timer that ran out, in order
+    """
+    values = list(delays)
+    fired = []
+    for frame, dt in enumerate(frame_times, 1):
+        for i in range(len(values)):
+            if (frame, i) in skipped:
+                continue
+            values[i] -= dt
+            if values[i] <= 0:
+                fired.append((frame, i))
+                values[i] = delays[i]
+    return fired
+
+
+def scheduler_firings(delays, frame_times, skipped, timers):
+    """
+    Runs the same timers as countdown_firings with a Scheduler
+    :param timers: An empty Scheduler
+    :return: The (frame, timer index) pairs of every timer that ran out, in order
+    """
+    indices = {}
+    for i in range(len(delays)):
+        indices[timers.schedule(delays[i], None, i)] = i
+    fired = []
+    for frame, dt in enumerate(frame_times, 1):
+        due = timers.advance(dt)
+        for timer in indices:
+            if (frame, indices[timer]) in skipped:
+                timers.hold(timer)
+        for timer in due:
+            if timer.due:
+                fired.append((frame, indices[timer]))
+                timers.restart(timer, delays[indices[timer]])
+    return fired
+
+
+@pytest.mark.parametrize("frame_time", [1 / 60, 1 / 1000, 1 / 64, None])
+def test_timers_fire_on_the_countdown_frames(frame_time):
+    rng = random.Random(21)
+    # Whole seconds run out exactly on a frame boundary, where the estimate alone can't tell which frame it is
+    delays = [1, 2, 10, 0.5, 0.25] + [rng.uniform(0.01, 3) for _ in range(15)]
+    frames = 9000
+    if frame_time is None:
+        frame_times = [rng.uniform(0.001, 0.05) for _ in range(frames)]
+    else:
+        frame_times = [frame_time] * frames
+    skipped = {(rng.randrange(1, frames), rng.randrange(len(delays))) for _ in range(300)}
+    expected = countdown_firings(delays, frame_times, skipped)
+    assert scheduler_firings(delays, frame_times, skipped, scheduler.Scheduler()) == expected
+    assert scheduler_firings(delays, frame_times, skipped, OftenTrimmed()) == expected
+
+
+def test_remaining_matches_the_countdown():
+    timers = OftenTrimmed()
+    timer = timers.schedule(30, None)
+    value = 30
+    for _ in range(1000):
+        timers.advance(1 / 60)
+        value -= 1 / 60
+    assert timers.remaining(timer) == value
+
+
+def test_trim_keeps_only_what_timers_need():
+    timers = OftenTrimmed()
+    long_timer = timers.schedule(100, None)
+    for i in range(50):
+        timers.cancel(timers.schedule(50, None))
+    for _ in range(1000):
+        timers.advance(1 / 1000)
+    assert len(timers.steps) <= 2 * 1000     # Every frame since the long timer started, trimmed in chunks
+    assert len(timers.heap) == 1             # Cancelled timers are dropped
+    timers.restart(long_timer, 0.5)     # Runs out and isn't restarted, so it stops holding on to frame times
+    for _ in range(3000):
+        timers.advance(1 / 1000)
+    assert len(timers.steps) <= 2 * 16
+
+
+@pytest.mark.parametrize("frame_time", [1.1, 10.1])
+def test_long_games_fire_on_the_countdown_frames(frame_time):
+    # Delays of whole frames run out on a frame boundary, and the rounding there grows with the running totals
+    rng = random.Random(5)
+    delays = [round(frame_time * frames, 6) for frames in (7, 10, 33, 100, 333, 1000)]
+    frame_times = [frame_time] * 30000
+    skipped = {(rng.randrange(1, 30000), rng.randrange(len(delays))) for _ in range(100)}
+    expected = countdown_firings(delays, frame_times, skipped)
+    assert scheduler_firings(delays, frame_times, skipped, OftenTrimmed()) == expected
+
+
+def test_len_counts_waiting_timers():
+    timers = OftenTrimmed()
+    kept = [timers.schedule(1, None) for _ in range(5)]
+    timers.cancel(timers.schedule(1, None))
+    timers.schedule(0.5, None)
+    assert len(timers) == 6
+    timers.advance(0.75)    # The 0.5 timer runs out and isn't restarted
+    assert len(timers) == 5
+    timers.cancel(kept[0])
+    timers.cancel(kept[0])
+    for _ in range(40):
+        timers.advance(0.001)   # Trims along the way
+    assert len(timers) == 4 == sum(1 for entry in timers.heap if entry[3] is not None)
@@ -0,0 +1,49 @@
+import random
+import pygame
+import pytest
+import classes
+import vector as v
+
+
+@pytest.fixture
+def enemies(monkeypatch):
+    """
+    :return: A function that makes n random enemies, with an empty enemy_sprites for the test
+    """
+    monkeypatch.setattr(classes, "enemy_sprites", classes.SpriteCache(1024))
+    random.seed(17)
+    return lambda n: [classes.Enemy(v.Vector2(400, 300)) for _ in range(n)]
+
+
+def test_cache_holds_one_mask_per_shape_and_size(enemies):
+    crowd = enemies(3000)   # Far more enemies (and colors) than the cache can hold
+    for enemy in crowd:
+        enemy.sprite()
+    for enemy in crowd:
+        enemy.sprite()
+    sizes = {(enemy.shape, getattr(enemy, "num_points", 0), enemy.radius) for enemy in crowd}
+    assert len(classes.enemy_sprites) == len(sizes)
+    assert classes.enemy_sprites.misses == len(sizes)
+    assert classes.enemy_sprites.evictions == 0
+
+
+def test_sprite_matches_drawing_in_color(enemies):
+    for enemy in enemies(20):
+        sprite, left, top = enemy.sprite()
+        drawn = pygame.Surface(sprite.get_size())
+        if enemy.shape == "Circle":
+            pygame.draw.circle(drawn, enemy.color, (-left, -top), enemy.radius)
+        else:
+            points = [(int(x - left), int(y - top)) for x, y in enemy.template.local_matrix.row_tuples()]
+            pygame.draw.polygon(drawn, enemy.color, points)
+        assert pygame.image.tostring(sprite, "RGB") == pygame.image.tostring(drawn, "RGB")
+
+
+def test_sprite_follows_color_changes(enemies):
+    enemy = enemies(1)[0]
+    first = enemy.sprite()[0]
+    assert enemy.sprite()[0] is first
+    enemy.color = (100, 200, 255)
+    recolored = enemy.sprite()[0]
+    assert recolored is not first
+    assert recolored.get_at((-enemy.sprite()[1], -enemy.sprite()[2]))[:3] == (100, 200, 255)
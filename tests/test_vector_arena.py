@@ -0,0 +1,52 @@
+import pytest
+import vector as v
+
+
+def make_temporaries():
+    """
+    :return: The vectors built by a little vector math, through the constructor and the internal factories
+    """
+    a = v.Vector2(3, 4)
+    b = v.Vector(1, 2)
+    c = v.Vector3(1, 2, 3)
+    return [a, b, a + b, a - b, a * 2, -a, a.perpendicular, c + c]
+
+
+def test_arena_recycles_vectors():
+    arena = v.VectorArena()
+    with arena:
+        first = make_temporaries()
+    built = arena.misses
+    assert arena.hits == 0
+    assert built >= len(first)
+    with arena:
+        second = make_temporaries()
+    assert (arena.hits, arena.misses) == (built, built)
+    assert list(second[2]) == [4.0, 6.0]
+    assert list(second[7]) == [2.0, 4.0, 6.0]
+
+
+def test_nested_blocks_reclaim_at_the_outermost():
+    arena = v.VectorArena()
+    with arena:
+        with arena:
+            kept = v.Vector2(1, 1) + v.Vector2(2, 2)
+        assert arena.used[-1] is kept
+        assert arena.free[type(kept)] == []
+    assert arena.used == []
+    assert arena.free[type(kept)]
+
+
+def test_inactive_arena_changes_nothing():
+    new = v.Vector.__dict__["__new__"]
+    new_vector2 = v._new_vector2
+    arena = v.VectorArena()
+    with pytest.raises(RuntimeError):
+        with arena:
+            v.Vector2(1, 1) + v.Vector2(1, 1)
+            raise RuntimeError
+    assert v.Vector.__dict__["__new__"] is new
+    assert v._new_vector2 is new_vector2
+    misses = arena.misses
+    v.Vector2(1, 2) + v.Vector2(1, 2)
+    assert (arena.hits, arena.misses) == (0, misses)
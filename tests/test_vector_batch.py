@@ -0,0 +1,99 @@
+import random
+from array import array
+import pytest
+import vector as v
+
+
+@pytest.fixture(params=["numpy", "python"])
+def packing(request, monkeypatch):
+    """
+    Runs the batch functions with NumPy, or as they run when NumPy is not installed
+    :return: A function that packs a list of Vector2s into that path's own batch type
+    """
+    if request.param == "numpy":
+        np = pytest.importorskip("numpy")
+        return lambda points: np.array([list(p) for p in points], dtype=float).reshape(len(points), 2)
+    monkeypatch.setattr(v, "np", None)
+    return lambda points: array("d", [c for p in points for c in p])
+
+
+def random_points(n, seed):
+    rng = random.Random(seed)
+    return [v.Vector2(rng.uniform(-50, 50), rng.uniform(-50, 50)) for _ in range(n)]
+
+
+# Zero vectors and repeated points, where the scalar functions take their special cases
+ZEROS = [v.Vector2(0, 0), v.Vector2(0, 0), v.Vector2(3, 4)]
+
+
+def batches(packing, points):
+    """
+    :return: The same batch as a list of Vector2s and as the path's own batch type
+    """
+    return [points, packing(points)]
+
+
+@pytest.mark.parametrize("n", [0, 1, 40])
+def test_dot_many(packing, n):
+    a, b = random_points(n, 1), random_points(n, 2)
+    for a_batch in batches(packing, a):
+        for b_batch in batches(packing, b):
+            assert list(v.dot_many(a_batch, b_batch)) == [v.dot(p, q) for p, q in zip(a, b)]
+    assert list(v.dot_many(ZEROS, v.Vector2(0, 0))) == [0, 0, 0]
+    assert list(v.dot_many(ZEROS, ZEROS[::-1])) == [v.dot(p, q) for p, q in zip(ZEROS, ZEROS[::-1])]
+
+
+@pytest.mark.parametrize("n", [0, 1, 40])
+def test_mag_many(packing, n):
+    points = random_points(n, 3) + ZEROS
+    for batch in batches(packing, points):
+        assert list(v.mag_many(batch)) == [p.mag for p in points]
+
+
+@pytest.mark.parametrize("n", [0, 1, 40])
+def test_distance_many(packing, n):
+    a, b = random_points(n, 4) + ZEROS, random_points(n, 5) + ZEROS
+    for a_batch in batches(packing, a):
+        assert list(v.distance_many(a_batch, packing(b))) == [(p - q).mag for p, q in zip(a, b)]
+        assert list(v.distance_many(a_batch, b[0])) == [(p - b[0]).mag for p in a]     # One point for every row
+
+
+@pytest.mark.parametrize("n", [0, 1, 40])
+def test_point_segment_distance_many(packing, n):
+    points, starts, ends = random_points(n, 6), random_points(n, 7), random_points(n, 8)
+    # Segments of zero length, and points that sit on a segment's ends
+    points += [v.Vector2(1, 1), v.Vector2(3, 4), v.Vector2(0, 0)]
+    starts += [v.Vector2(3, 4), v.Vector2(3, 4), v.Vector2(0, 0)]
+    ends += [v.Vector2(3, 4), v.Vector2(6, 8), v.Vector2(0, 0)]
+    expected = [v.point_segment_distance(p, a, b) for p, a, b in zip(points, starts, ends)]
+    found = v.point_segment_distance_many(packing(points), packing(starts), packing(ends))
+    assert list(found) == pytest.approx(expected, rel=1e-12, abs=1e-12)
+    found = v.point_segment_distance_many(points, starts[0], ends[0])    # One segment for every point
+    assert list(found) == pytest.approx([v.point_segment_distance(p, starts[0], ends[0]) for p in points],
+                                        rel=1e-12, abs=1e-12)
+
+
+@pytest.mark.parametrize("inv", [True, False])
+@pytest.mark.parametrize("n", [0, 1, 40])
+def test_polar_to_Vector2_many(packing, n, inv):
+    rng = random.Random(9)
+    thetas = [rng.uniform(-720, 720) for _ in range(n)] + [0, 90, 180, 270, 360]
+    lengths = [rng.uniform(0, 30) for _ in range(n)] + [0, 1, 2, 0, 5]
+    expected = [list(v.polar_to_Vector2(r, theta, inv)) for r, theta in zip(lengths, thetas)]
+    found = list(v.polar_to_Vector2_many(lengths, thetas, inv))
+    if v.np is None:
+        found = [found[i:i + 2] for i in range(0, len(found), 2)]
+    assert [list(point) for point in found] == expected
+    found = list(v.polar_to_Vector2_many(2, thetas, inv))   # One length for every angle
+    if v.np is None:
+        found = [found[i:i + 2] for i in range(0, len(found), 2)]
+    assert [list(point) for point in found] == [list(v.polar_to_Vector2(2, theta, inv)) for theta in thetas]
+
+
+def test_empty_batches(packing):
+    for function in (v.dot_many, v.distance_many):
+        assert len(function([], [])) == 0
+        assert len(function(packing([]), packing([]))) == 0
+    assert len(v.mag_many([])) == 0
+    assert len(v.point_segment_distance_many([], [], [])) == 0
+    assert len(v.polar_to_Vector2_many([], [])) == 0
@@ -9,9 +9,31 @@
 # 3D Math Primer for Graphics and Game Development, 2nd Edition
 
 import math
+import sys
+from array import array
+import backend
+
+try:
+    import numpy as np
+except ImportError:     # The batch functions fall back to array module buffers without NumPy
+    np = None
 
 
 class Vector:
+    __slots__ = ("data", "dim")
+
+    def __new__(cls, *args):
+        """
+        Picks the dimension specific class before the vector is initialized
+        :param args: Accepts a variable amount of components for the vector
+        :return: An uninitialized Vector, Vector2, or Vector3 instance
+        """
+        if cls is Vector:
+            if len(args) == 2:
+                cls = Vector2
+            elif len(args) == 3:
+                cls = Vector3
+        return object.__new__(cls)
 
     def __init__(self, *args):
         """
@@ -24,10 +46,6 @@ class Vector:
             else:
                 raise TypeError("Only integer or float values are accepted.")
         self.dim = len(self.data)
-        if self.dim == 2:
-            self.__class__ = Vector2
-        if self.dim == 3:
-            self.__class__ = Vector3
 
     def __str__(self):
         """
@@ -182,6 +200,61 @@ class Vector:
         else:
             raise TypeError("Vectors are only divisible by scalar values")
 
+    def __iadd__(self, other):
+        """
+        Adds another vector to this one without creating a new vector
+        :param other: Another vector
+        :return: This vector, now holding the sum
+        """
+        if isinstance(other, Vector):
+            for i in range(len(self.data)):
+                self.data[i] += other[i]
+            return self
+        else:
+            raise TypeError(
+                f"You can only add another {self.__class__.__name__} to this {self.__class__.__name__} (You passed '{other}'.)")
+
+    def __isub__(self, other):
+        """
+        Subtracts another vector from this one without creating a new vector
+        :param other: Another vector
+        :return: This vector, now holding the difference
+        """
+        if isinstance(other, Vector):
+            for i in range(len(self.data)):
+                self.data[i] -= other[i]
+            return self
+        else:
+            raise TypeError(
+                f"You can only subtract another {self.__class__.__name__} from this {self.__class__.__name__} (You passed '{other}'.)")
+
+    def __imul__(self, other):
+        """
+        Multiplies this vector by a scalar without creating a new vector
+        :param other: A scalar
+        :return: This vector, now holding the product
+        """
+        if isinstance(other, (int, float)):
+            for i in range(len(self.data)):
+                self.data[i] *= other
+            return self
+        else:
+            return NotImplemented
+
+    def add_scaled(self, other, scale):
+        """
+        Adds a scaled vector to this one in place. Same result as self += other * scale, without the temporary vector
+        :param other: Another vector
+        :param scale: A scalar to multiply other by
+        :return: This vector, now holding the sum
+        """
+        if isinstance(other, Vector) and isinstance(scale, (int, float)):
+            for i in range(len(self.data)):
+                self.data[i] += other[i] * scale
+            return self
+        else:
+            raise TypeError("add_scaled takes a vector and a scalar.")
+
     def norm(self, p):
         """
         Finds the p-norm of the vector.
@@ -262,13 +335,280 @@ class Vector:
 
 
 class Vector2(Vector):
+    # Vector2 is used for every position and velocity in the game, so it skips the generic data list and stores
+    # its two components directly in slots. Type checks only happen at the public boundary (the constructor and
+    # setters); results of arithmetic between vectors are built through _new_vector2 without any validation.
+    # The magnitude is cached in _mag, and every method that changes a component sets it back to None.
+    __slots__ = ("_x", "_y", "_mag")
+    dim = 2
+
     def __init__(self, a, b):
         """
         :param a: x component of the vector
         :param b: y component of the vector
         :return: A vector instance that is both Vector and Vector2
         """
-        super().__init__(a, b)
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+            self._x = float(a)
+            self._y = float(b)
+            self._mag = None
+        else:
+            raise TypeError("Only integer or float values are accepted.")
+
+    @property
+    def data(self):
+        """
+        :return: A list of the vector's components (changing the list does not change the vector)
+        """
+        return [self._x, self._y]
+
+    def __str__(self):
+        """
+        :return: A string that provides the type of Vector and it's components
+        """
+        return "<Vector2: " + str(self._x) + ", " + str(self._y) + ">"
+
+    def __len__(self):
+        """
+        :return: Returns the number of components that the Vector has
+        """
+        return 2
+
+    def __iter__(self):
+        """
+        :return: An iterator over the x and y components
+        """
+        return iter((self._x, self._y))
+
+    def __getitem__(self, index):
+        """
+        :param index: An integer index
+        :return: The float value located at the index
+        """
+        if isinstance(index, int):
+            if index == 0 or index == -2:
+                return self._x
+            elif index == 1 or index == -1:
+                return self._y
+            else:
+                raise IndexError("Vector2 index out of range.")
+        else:
+            raise TypeError("Values are only located at integer indices.")
+
+    def __setitem__(self, index, value):
+        """
+        :param index: An integer index
+        :param value: A new value.
+        :return: No return. Changes the value at the index to the given value.
+        """
+        if isinstance(value, (int, float)):
+            if index == 0 or index == -2:
+                self._x = float(value)
+            elif index == 1 or index == -1:
+                self._y = float(value)
+            else:
+                raise IndexError("Vector2 index out of range.")
+            self._mag = None
+        else:
+            raise TypeError("Only integer or float values are accepted.")
+
+    def __eq__(self, other):
+        """
+        Determines whether two vectors are equivalent.
+        :param other: Another Vector.
+        :return: Whether or not the vectors are equivalent.
+        """
+        if isinstance(other, PythonVector2):
+            return self._x == other._x and self._y == other._y
+        return Vector.__eq__(self, other)
+
+    def copy(self):
+        """
+        Creates a new Vector2 with the same components
+        :return: A deep copy of the Vector.
+        """
+        return _new_vector2(self._x, self._y)
+
+    def __mul__(self, other):
+        """
+        Multiplication between a vector on the left and a scalar on the right
+        :param other: A scalar
+        :return: A vector with the newly multiplied values
+        """
+        if isinstance(other, (int, float)):
+            return _new_vector2(self._x * other, self._y * other)
+        else:
+            return NotImplemented
+
+    def __rmul__(self, other):
+        """
+        Multiplication between a scalar on the left and a vector on the right
+        :param other: A scalar
+        :return: A vector with the newly multiplied values
+        """
+        return self.__mul__(other)
+
+    def __add__(self, other):
+        """
+        Adds two vectors
+        :param other: Another vector
+        :return: A vector that is the sum of both
+        """
+        if isinstance(other, PythonVector2):
+            return _new_vector2(self._x + other._x, self._y + other._y)
+        elif isinstance(other, Vector):
+            return _new_vector2(self._x + other[0], self._y + other[1])
+        else:
+            raise TypeError(
+                f"You can only add another {self.__class__.__name__} to this {self.__class__.__name__} (You passed '{other}'.)")
+
+    def __sub__(self, other):
+        """
+        Subtracts two vectors
+        :param other: Another vector
+        :return: A vector that is the difference of both
+        """
+        if isinstance(other, PythonVector2):
+            return _new_vector2(self._x - other._x, self._y - other._y)
+        elif isinstance(other, Vector):
+            return _new_vector2(self._x - other[0], self._y - other[1])
+        else:
+            raise TypeError(
+                f"You can only subtract another {self.__class__.__name__} from this {self.__class__.__name__} (You passed '{other}'.)")
+
+    def __neg__(self):
+        """
+        Negates the vector
+        :return: The opposite vector of this instance
+        """
+        return _new_vector2(-self._x, -self._y)
+
+    def __truediv__(self, other):
+        """
+        Divides a vector by a scalar
+        :param other: A scalar
+        :return: A vector that is the quotient of itself divided by other
+        """
+        if isinstance(other, (int, float)) and other != 0:
+            return _new_vector2(self._x / other, self._y / other)
+        elif other == 0:
+            raise ValueError("Can't divide by 0.")
+        else:
+            raise TypeError("Vectors are only divisible by scalar values")
+
+    def __iadd__(self, other):
+        """
+        Adds another vector to this one without creating a new vector
+        :param other: Another vector
+        :return: This vector, now holding the sum
+        """
+        if isinstance(other, PythonVector2):
+            self._x += other._x
+            self._y += other._y
+        elif isinstance(other, Vector):
+            self._x += other[0]
+            self._y += other[1]
+        else:
+            raise TypeError(
+                f"You can only add another {self.__class__.__name__} to this {self.__class__.__name__} (You passed '{other}'.)")
+        self._mag = None
+        return self
+
+    def __isub__(self, other):
+        """
+        Subtracts another vector from this one without creating a new vector
+        :param other: Another vector
+        :return: This vector, now holding the difference
+        """
+        if isinstance(other, PythonVector2):
+            self._x -= other._x
+            self._y -= other._y
+        elif isinstance(other, Vector):
+            self._x -= other[0]
+            self._y -= other[1]
+        else:
+            raise TypeError(
+                f"You can only subtract another {self.__class__.__name__} from this {self.__class__.__name__} (You passed '{other}'.)")
+        self._mag = None
+        return self
+
+    def __imul__(self, other):
+        """
+        Multiplies this vector by a scalar without creating a new vector
+        :param other: A scalar
+        :return: This vector, now holding the product
+        """
+        if isinstance(other, (int, float)):
+            self._x *= other
+            self._y *= other
+            self._mag = None
+            return self
+        else:
+            return NotImplemented
+
+    def add_scaled(self, other, scale):
+        """
+        Adds a scaled vector to this one in place. Same result as self += other * scale, without the temporary vector
+        :param other: Another vector
+        :param scale: A scalar to multiply other by
+        :return: This vector, now holding the sum
+        """
+        if isinstance(scale, (int, float)):
+            if isinstance(other, PythonVector2):
+                self._x += other._x * scale
+                self._y += other._y * scale
+                self._mag = None
+                return self
+            elif isinstance(other, Vector):
+                self._x += other[0] * scale
+                self._y += other[1] * scale
+                self._mag = None
+                return self
+        raise TypeError("add_scaled takes a vector and a scalar.")
+
+    @property
+    def mag(self):
+        """
+        Finds the length of the vector. The result is cached until a component changes.
+        :return: The 2-norm of the vector.
+        """
+        length = self._mag
+        if length is None:
+            length = self._mag = math.sqrt(self._x * self._x + self._y * self._y)
+        return length
+
+    @property
+    def mag_squared(self):
+        """
+        Finds the length of the vector squared.
+        :return: The square of the 2-norm
+        """
+        return self._x * self._x + self._y * self._y
+
+    @property
+    def normalize(self):
+        """
+        Returns a unit vector in the direction of this Vector.
+        """
+        length = self.mag
+        if length == 0:
+            raise ValueError("Can't divide by 0.")
+        return _new_vector2(self._x / length, self._y / length)
+
+    @property
+    def is_zero(self):
+        """
+        Determine if the Vector is the zero Vector of it's dimension
+        :return: True if the Vector is the zero Vector of the appropriate dimension, False, otherwise
+        """
+        return self._x == 0 and self._y == 0
+
+    @property
+    def i(self):
+        """
+        Returns a tuple of the coordinates of the Vector, converted to integers.
+        """
+        return int(self._x), int(self._y)
 
     @property
     def x(self):
@@ -276,7 +616,7 @@ class Vector2(Vector):
         self: A Vector2 instance
         :return: The x component
         """
-        return self[0]
+        return self._x
 
     @x.setter
     def x(self, a):
@@ -285,7 +625,8 @@ class Vector2(Vector):
         :return: No return. Changes x component to the new value
         """
         if isinstance(a, (int, float)):
-            self[0] = float(a)
+            self._x = float(a)
+            self._mag = None
         else:
             raise TypeError("Only integer or float values are accepted.")
 
@@ -295,7 +636,7 @@ class Vector2(Vector):
         self: A Vector2 instance
         :return: The y component
         """
-        return self[1]
+        return self._y
 
     @y.setter
     def y(self, a):
@@ -304,7 +645,8 @@ class Vector2(Vector):
         :return: No return. Changes y component to the new value.
         """
         if isinstance(a, (int, float)):
-            self[1] = float(a)
+            self._y = float(a)
+            self._mag = None
         else:
             raise TypeError("Only integer or float values are accepted.")
 
@@ -330,7 +672,7 @@ class Vector2(Vector):
         Find the radian measure of the vector
         :return: The vector's angle in terms of radians
         """
-        return math.atan2(self.y, self.x)
+        return math.atan2(self._y, self._x)
 
     @property
     def radians_inv(self):
@@ -338,7 +680,7 @@ class Vector2(Vector):
         Negate the radian measure of the vector
         :return: The vector's radian measure using an inverted y-axis
         """
-        return math.atan2(-self.y, self.x)
+        return math.atan2(-self._y, self._x)
 
     @property
     def perpendicular(self):
@@ -346,10 +688,26 @@ class Vector2(Vector):
         Creates a vector that is perpendicular to this vector
         :return: A Vector2 perpendicular to the original vector
         """
-        return Vector(-self.y, self.x)
+        return _new_vector2(-self._y, self._x)
+
+
+def _new_vector2(x, y):
+    """
+    Builds a Vector2 from components that are already known to be floats, skipping validation
+    :param x: x component of the vector
+    :param y: y component of the vector
+    :return: A new Vector2
+    """
+    new_vector = object.__new__(Vector2)
+    new_vector._x = x
+    new_vector._y = y
+    new_vector._mag = None
+    return new_vector
 
 
 class Vector3(Vector):
+    __slots__ = ()
+
     def __init__(self, a, b, c):
         """
         :param a: x component of the vector
@@ -359,6 +717,35 @@ class Vector3(Vector):
         """
         super().__init__(a, b, c)
 
+    @property
+    def mag(self):
+        """
+        Finds the length of the vector.
+        :return: The 2-norm of the vector.
+        """
+        d = self.data
+        return math.sqrt(d[0] * d[0] + d[1] * d[1] + d[2] * d[2])
+
+    @property
+    def mag_squared(self):
+        """
+        Finds the length of the vector squared.
+        :return: The square of the 2-norm
+        """
+        d = self.data
+        return d[0] * d[0] + d[1] * d[1] + d[2] * d[2]
+
+    @property
+    def normalize(self):
+        """
+        Returns a unit vector in the direction of this Vector.
+        """
+        length = self.mag
+        if length == 0:
+            raise ValueError("Can't divide by 0.")
+        d = self.data
+        return Vector(d[0] / length, d[1] / length, d[2] / length)
+
     @property
     def x(self):
         """
@@ -417,6 +804,98 @@ class Vector3(Vector):
             raise TypeError("Only integer or float values are accepted.")
 
 
+class VectorArena:
+    """
+    A scoped pool of recycled vectors. While an arena is active (inside a with block), new Vector2 and Vector3
+    objects are taken from its free lists, and when the outermost with block ends every vector handed out is
+    returned to the free lists. Only use it around math whose vectors are all thrown away by the end of the block.
+    Entering swaps the arena's factories in for Vector.__new__ and the functions that build vectors without the
+    constructor, and leaving puts the originals back, so nothing checks for an arena while none is active.
+    """
+    def __init__(self):
+        self.free = {}
+        self.used = []
+        self.depth = 0
+        self.saved = []     # The (namespace, name, factory) of every factory replaced while the arena is active
+        self.hits = 0   # Vectors that were recycled
+        self.misses = 0     # Vectors that had to be allocated because the free list was empty
+
+    def __enter__(self):
+        if self.depth == 0:
+            if not self.free:
+                for cls in (PythonVector2, PythonVector3, Vector2, Vector3):
+                    self.free[cls] = []
+            for namespace, name, factory in self.factories():
+                self.saved.append((namespace, name, namespace.__dict__[name]))
+                setattr(namespace, name, factory)
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.depth -= 1
+        if self.depth == 0:
+            for namespace, name, factory in reversed(self.saved):
+                setattr(namespace, name, factory)
+            self.saved.clear()
+            self.reclaim()
+
+    def factories(self):
+        """
+        :return: The (namespace, name, replacement) of every factory the selected backend builds vectors with
+        """
+        arena = self
+
+        def new(cls, *args):
+            if cls is Vector:
+                if len(args) == 2:
+                    cls = Vector2
+                elif len(args) == 3:
+                    cls = Vector3
+            if cls in arena.free:
+                return arena.take(cls)
+            return object.__new__(cls)
+
+        replaced = [(Vector, "__new__", staticmethod(new))]
+        if backend.name == "numpy":
+            import numpy_vector
+            for name, factory in numpy_vector.arena_factories(self).items():
+                replaced.append((numpy_vector, name, factory))
+        else:
+            def new_vector2(x, y):
+                new_vector = arena.take(Vector2)
+                new_vector._x = x
+                new_vector._y = y
+                new_vector._mag = None
+                return new_vector
+
+            replaced.append((sys.modules[__name__], "_new_vector2", new_vector2))
+        return replaced
+
+    def take(self, cls):
+        """
+        Hands out an uninitialized vector
+        :param cls: Vector2 or Vector3
+        :return: A recycled vector if one is free, otherwise a new one
+        """
+        free = self.free[cls]
+        if free:
+            self.hits += 1
+            new_vector = free.pop()
+        else:
+            self.misses += 1
+            new_vector = object.__new__(cls)
+        self.used.append(new_vector)
+        return new_vector
+
+    def reclaim(self):
+        """
+        Puts every vector handed out since the last reclaim back on the free lists
+        """
+        for used_vector in self.used:
+            self.free[used_vector.__class__].append(used_vector)
+        self.used.clear()
+
+
 def dot(a, b):
     """
     Finds the dot product of two vectors
@@ -424,6 +903,8 @@ def dot(a, b):
     :param b: Another vector
     :return: The dot product
     """
+    if a.__class__ is Vector2 and b.__class__ is Vector2:
+        return a._x * b._x + a._y * b._y
     if isinstance(a, Vector):
         if isinstance(b, Vector):
             if a.dim == b.dim:
@@ -440,6 +921,60 @@ def dot(a, b):
         raise TypeError("Input must both be vectors.")
 
 
+def distance_squared(a, b):
+    """
+    Finds the squared distance between two points, without taking a square root
+    :param a: A vector
+    :param b: Another vector of the same dimension
+    :return: The squared length of a - b
+    """
+    if a.__class__ is Vector2 and b.__class__ is Vector2:
+        dx = a._x - b._x
+        dy = a._y - b._y
+        return dx * dx + dy * dy
+    if isinstance(a, Vector) and isinstance(b, Vector):
+        if a.dim == b.dim:
+            sum = 0
+            for i in range(a.dim):
+                difference = a[i] - b[i]
+                sum += difference * difference
+            return sum
+        else:
+            raise TypeError("The two vectors must have the same dimensions.")
+    else:
+        raise TypeError("Input must both be vectors.")
+
+
+def within_distance(a, b, distance):
+    """
+    Checks whether two points are no further apart than a distance. Compares squared lengths, so no square root is taken.
+    :param a: A vector
+    :param b: Another vector of the same dimension
+    :param distance: The largest distance that counts as within
+    :return: True if the points are within the distance, False otherwise
+    """
+    return distance_squared(a, b) <= distance * distance
+
+
+def point_segment_distance(p, a, b):
+    """
+    Finds the shortest distance from a point to a line segment
+    :param p: The point
+    :param a: One end of the segment
+    :param b: The other end of the segment
+    :return: The distance from p to the closest point on the segment
+    """
+    segment = b - a
+    length_squared = segment.mag_squared
+    if length_squared == 0:
+        return (p - a).mag
+    # How far along the segment the closest point is, clamped to the ends
+    t = dot(p - a, segment) / length_squared
+    t = max(0.0, min(1.0, t))
+    closest = a + segment * t
+    return (p - closest).mag
+
+
 def cross(v, w):
     """
     Finds the cross product of two three-dimensional vectors
@@ -447,8 +982,8 @@ def cross(v, w):
     :param w: Another Vector3
     :return: The cross product of the two vectors
     """
-    if isinstance(v, Vector3):
-        if isinstance(w, Vector3):
+    if isinstance(v, PythonVector3):
+        if isinstance(w, PythonVector3):
             x = (v.y * w.z) - (v.z * w.y)
             y = (v.z * w.x) - (v.x * w.z)
             z = (v.x * w.y) - (v.y * w.x)
@@ -482,5 +1017,230 @@ def polar_to_Vector2(r, theta, inv=True):
             raise TypeError("Second parameter must be an int or float degree value.")
     else:
         raise TypeError("First parameter must be an int or float.")
-    return Vector2(x, y)
+    return _new_vector2(float(x), float(y))
+
+
+def direction_to_Vector2(r, direction):
+    """
+    Scales a direction vector to a length. Gives the same vector as
+    polar_to_Vector2(r, math.degrees(math.atan2(-direction.y, direction.x))) without the trig round trip.
+    :param r: Length of the new vector
+    :param direction: A Vector2 pointing the desired way (does not need to be a unit vector)
+    :return: A Vector2 of length r pointing along direction. Points along the x-axis if direction is the zero vector.
+    """
+    if isinstance(r, (int, float)):
+        if isinstance(direction, PythonVector2):
+            length = direction.mag
+            if length == 0:
+                return _new_vector2(float(r), 0.0)
+            x = r * direction.x / length
+            y = r * direction.y / length
+            if abs(x) <= 0.000000001:     # Floating point zero fix
+                x = 0.0
+            if abs(y) <= 0.000000001:
+                y = 0.0
+        else:
+            raise TypeError("Second parameter must be a Vector2.")
+    else:
+        raise TypeError("First parameter must be an int or float.")
+    return _new_vector2(x, y)
+
+
+def _components(points):
+    """
+    Splits a batch of 2D points into x and y sequences
+    :param points: A list of Vector2s, an (n, 2) NumPy array, or a flat array('d') of x, y pairs
+    :return: Two sequences, the x components and the y components
+    """
+    if np is not None and isinstance(points, np.ndarray):
+        return points[:, 0], points[:, 1]
+    if isinstance(points, array):
+        return points[0::2], points[1::2]
+    if isinstance(points, Vector):  # A single point is used for every row of the batch
+        return [points[0]], [points[1]]
+    return [p[0] for p in points], [p[1] for p in points]
+
+
+def _columns(points):
+    """
+    Packs a batch of 2D points into NumPy columns, or lists when NumPy is not installed
+    :param points: Anything _components accepts
+    :return: Two sequences of floats, the x components and the y components
+    """
+    xs, ys = _components(points)
+    if np is not None:
+        return np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    return list(xs), list(ys)
+
+
+def _broadcast(values, n):
+    """
+    Repeats a one row batch so it lines up with an n row batch (lists only, NumPy broadcasts by itself)
+    :param values: A list of floats
+    :param n: The number of rows needed
+    :return: A list with n values
+    """
+    if len(values) == 1 and n != 1:
+        return values * n
+    return values
+
+
+def _packed(values):
+    """
+    Turns a list of floats into the buffer type returned by the batch functions
+    :param values: A list of floats, or a NumPy array
+    :return: The NumPy array, or an array('d') when NumPy is not installed
+    """
+    if np is not None:
+        return values
+    return array("d", values)
+
+
+def dot_many(a, b):
+    """
+    Finds the dot product of each pair of rows in two batches of 2D vectors
+    :param a: A batch of vectors (list of Vector2s, (n, 2) NumPy array, or flat array('d'))
+    :param b: A batch of the same length, or a single Vector2 used for every row
+    :return: A buffer of n dot products
+    """
+    ax, ay = _columns(a)
+    bx, by = _columns(b)
+    if np is not None:
+        return ax * bx + ay * by
+    n = max(len(ax), len(bx))
+    ax, ay, bx, by = _broadcast(ax, n), _broadcast(ay, n), _broadcast(bx, n), _broadcast(by, n)
+    return _packed([ax[i] * bx[i] + ay[i] * by[i] for i in range(n)])
+
+
+def mag_many(points):
+    """
+    Finds the length of every vector in a batch
+    :param points: A batch of vectors (list of Vector2s, (n, 2) NumPy array, or flat array('d'))
+    :return: A buffer of n lengths
+    """
+    xs, ys = _columns(points)
+    if np is not None:
+        return np.sqrt(xs * xs + ys * ys)
+    return _packed([math.sqrt(xs[i] * xs[i] + ys[i] * ys[i]) for i in range(len(xs))])
+
+
+def distance_many(a, b):
+    """
+    Finds the distance between each pair of rows in two batches of points
+    :param a: A batch of points (list of Vector2s, (n, 2) NumPy array, or flat array('d'))
+    :param b: A batch of the same length, or a single Vector2 measured against every row
+    :return: A buffer of n distances
+    """
+    ax, ay = _columns(a)
+    bx, by = _columns(b)
+    if np is not None:
+        dx = ax - bx
+        dy = ay - by
+        return np.sqrt(dx * dx + dy * dy)
+    n = max(len(ax), len(bx))
+    ax, ay, bx, by = _broadcast(ax, n), _broadcast(ay, n), _broadcast(bx, n), _broadcast(by, n)
+    return _packed([math.sqrt((ax[i] - bx[i]) ** 2 + (ay[i] - by[i]) ** 2) for i in range(n)])
+
+
+def point_segment_distance_many(points, starts, ends):
+    """
+    Finds the shortest distance from each point to its line segment
+    :param points: A batch of points (list of Vector2s, (n, 2) NumPy array, or flat array('d'))
+    :param starts: A batch of segment start points, or a single Vector2 shared by every segment
+    :param ends: A batch of segment end points, or a single Vector2 shared by every segment
+    :return: A buffer of n distances
+    """
+    px, py = _columns(points)
+    ax, ay = _columns(starts)
+    bx, by = _columns(ends)
+    if np is not None:
+        sx = bx - ax
+        sy = by - ay
+        length_squared = sx * sx + sy * sy
+        # Degenerate segments use t = 0, which measures the distance to the start point
+        safe_length = np.where(length_squared == 0, 1.0, length_squared)
+        t = np.clip(((px - ax) * sx + (py - ay) * sy) / safe_length, 0.0, 1.0)
+        t = np.where(length_squared == 0, 0.0, t)
+        dx = px - (ax + sx * t)
+        dy = py - (ay + sy * t)
+        return np.sqrt(dx * dx + dy * dy)
+    n = max(len(px), len(ax), len(bx))
+    px, py = _broadcast(px, n), _broadcast(py, n)
+    ax, ay, bx, by = _broadcast(ax, n), _broadcast(ay, n), _broadcast(bx, n), _broadcast(by, n)
+    distances = []
+    for i in range(n):
+        sx = bx[i] - ax[i]
+        sy = by[i] - ay[i]
+        length_squared = sx * sx + sy * sy
+        t = 0.0
+        if length_squared != 0:
+            t = max(0.0, min(1.0, ((px[i] - ax[i]) * sx + (py[i] - ay[i]) * sy) / length_squared))
+        dx = px[i] - (ax[i] + sx * t)
+        dy = py[i] - (ay[i] + sy * t)
+        distances.append(math.sqrt(dx * dx + dy * dy))
+    return _packed(distances)
+
+
+def polar_to_Vector2_many(r, thetas, inv=True):
+    """
+    Converts a batch of polar coordinates into 2D points
+    :param r: Distance from the origin, either one number for every point or a sequence with one per point
+    :param thetas: A sequence of degree angles
+    :param inv: Whether or not to invert the y-axis
+    :return: An (n, 2) NumPy array, or a flat array('d') of x, y pairs when NumPy is not installed
+    """
+    if np is not None:
+        radians = np.radians(np.asarray(thetas, dtype=float))
+        lengths = np.asarray(r, dtype=float)
+        xs = lengths * np.cos(radians)
+        ys = lengths * np.sin(radians)
+        if inv:
+            ys = -ys
+        xs[np.abs(xs) <= 0.000000001] = 0     # Floating point zero fix
+        ys[np.abs(ys) <= 0.000000001] = 0
+        return np.column_stack((xs, ys))
+    if isinstance(r, (int, float)):
+        r = [r] * len(thetas)
+    points = array("d")
+    for i in range(len(thetas)):
+        point = polar_to_Vector2(r[i], thetas[i], inv)
+        points.append(point.x)
+        points.append(point.y)
+    return points
+
+
+_polygon_directions = {}    # Unit (x, y) offsets of the vertices of a regular polygon, by number of vertices
+
+
+def polygon_directions(num_points):
+    """
+    Finds the unit offsets from the center of a regular polygon to each of its vertices, in the same order and
+    orientation as polar_to_Vector2(1, (360 / num_points) * index). Results are stored in a lookup table.
+    :param num_points: The number of vertices
+    :return: A tuple of (x, y) tuples
+    """
+    if num_points not in _polygon_directions:
+        if isinstance(num_points, int) and num_points > 0:
+            directions = []
+            for point_index in range(num_points):
+                unit = polar_to_Vector2(1, (360 / num_points) * point_index)
+                directions.append((unit.x, unit.y))
+            _polygon_directions[num_points] = tuple(directions)
+        else:
+            raise ValueError("A polygon needs a positive integer number of points.")
+    return _polygon_directions[num_points]
+
+
+for _num_points in range(3, 11):    # Every shape the game spawns
+    polygon_directions(_num_points)
+
+
+# The pure Python classes keep these names whichever backend is selected, for code that builds on how they store
+# their components (such as entity_store.RowVector2). The NumPy classes are subclasses of them, so the type checks in
+# this module test against these names: Vector2 and Vector3 are rebound to the NumPy classes below, which would turn
+# away pure Python vectors.
+PythonVector2 = Vector2
+PythonVector3 = Vector3
 
+if backend.name == "numpy":
+    from numpy_vector import Vector2, Vector3, _new_vector2